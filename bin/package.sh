@@ -15,6 +15,7 @@ cmd /C python setup.py build_sphinx
 
 
 rm -rf build/* dist/*
+python -m co2mpas.io.metadata  ## Precompute model metadata.
 python setup.py build bdist_wheel sdist
 
 ## Build docs
@@ -20,6 +20,7 @@ USAGE:
                       [--overwrite-cache] [--out-template=<xlsx-file>]
                       [--plot-workflow] [-O=<output-folder>]
                       [--only-summary] [--soft-validation]
+                      [--performance] [--metrics=<file>]
                       [<input-path>]...
   co2mpas demo        [-v | --logconf=<conf-file>] [--gui] [-f]
                       [<output-folder>]
@@ -52,6 +53,8 @@ OPTIONS:
                               By default, results are appended into an empty excel-file.
                               Use `--out-template=-` to use input-file as template.
   --plot-workflow             Open workflow-plot in browser, after run finished.
+  --performance               Report the processing performance of vehicles.
+  --metrics=<file>            Export the run metrics (Prometheus text format).
   -l, --list                  List available models.
   --graph-depth=<levels>      An integer to Limit the levels of sub-models plotted.
   -f, --force                 Overwrite output/template/demo excel-file(s).
@@ -345,6 +348,7 @@ def _prompt_options(opts):
         'overwrite-cache': 'y/[n]',
         'soft-validation': 'y/[n]',
         'plot-workflow': 'y/[n]',
+        'performance': 'y/[n]',
         'only-summary': 'y/[n]',
         'out-template': 'y/[n]/<xlsx-file>',
         'force': 'y/[n]'
@@ -438,7 +442,9 @@ def _run_batch(opts):
                          plot_workflow=opts['--plot-workflow'],
                          output_template=opts['--out-template'],
                          overwrite_cache=opts['--overwrite-cache'],
-                         soft_validation=opts['--soft-validation'])
+                         soft_validation=opts['--soft-validation'],
+                         with_performance=opts['--performance'],
+                         metrics_file=opts['--metrics'])
 
 
 def _main(*args):
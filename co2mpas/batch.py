@@ -12,12 +12,14 @@ from datetime import datetime
 import logging
 import os.path as osp
 import re
-import pandas as pd
+import tracemalloc
+from collections import OrderedDict
 from tqdm import tqdm
 from functools import partial
 import co2mpas.dispatcher.utils as dsp_utl
 from co2mpas.dispatcher import Dispatcher
 import co2mpas.utils as co2_utl
+from co2mpas.telemetry import metrics
 
 log = logging.getLogger(__name__)
 
@@ -55,7 +57,121 @@ def parse_dsp_model(model):
     return res
 
 
-def process_folder_files(input_files, output_folder, **kwds):
+def _iter_node_durations(workflow, base=()):
+    for k, attr in workflow.nodes(data=True):
+        node_id = base + (k,)
+        if 'workflow' in attr:  # Sub-model: only its nodes are reported.
+            yield from _iter_node_durations(attr['workflow'][0], node_id)
+        elif 'duration' in attr:
+            yield node_id, attr['duration'].total_seconds()
+
+
+def _peak_memory():
+    if not tracemalloc.is_tracing():
+        return None
+    return tracemalloc.get_traced_memory()[1] / 1024 ** 2
+
+
+def _model_stages(start_time, dsp_model):
+    nodes = sorted(((attr['started'], k, attr['duration'])
+                    for k, attr in dsp_model.workflow.nodes(data=True)
+                    if 'duration' in attr), key=lambda x: x[0])
+
+    stages, end = OrderedDict(), start_time
+    if nodes:
+        stages['load'] = (nodes[0][0] - start_time).total_seconds()
+        for started, k, duration in nodes:
+            stages[k] = duration.total_seconds()
+            end = max(end, started + duration)
+    return stages, end
+
+
+def _vehicle_stages(model, res):
+    stages = OrderedDict()
+    if 'dsp_model' in res:
+        stages.update(_model_stages(res['start_time'], res['dsp_model'])[0])
+    for k, node_id in (('report', 'make_report'), ('write', 'write_outputs')):
+        duration = model.workflow.node.get(node_id, {}).get('duration')
+        if duration is not None:
+            stages[k] = duration.total_seconds()
+    return stages
+
+
+def calculate_performance(start_time, dsp_model, top_nodes=None):
+    """
+    Calculates the processing performance of a vehicle.
+
+    The stage durations are taken from the nodes of the CO2MPAS model (i.e.,
+    each calibration, the model selector, and each prediction), while the
+    `load` and `report` stages are the times before and after the model run.
+
+    :param start_time:
+        Vehicle processing start time.
+    :type start_time: datetime.datetime
+
+    :param dsp_model:
+        Co2mpas model after dispatching.
+    :type dsp_model: co2mpas.dispatcher.Dispatcher
+
+    :param top_nodes:
+        Number of the slowest model nodes to report.
+    :type top_nodes: int, optional
+
+    :return:
+        Durations of the processing stages [s], the slowest model nodes [s],
+        and the peak memory allocated while processing the vehicle [MB] (see
+        :func:`_process_vehicle`).
+    :rtype: dict
+    """
+
+    from .model.physical.defaults import dfl
+    if top_nodes is None:
+        top_nodes = dfl.functions.calculate_performance.TOP_NODES
+
+    stages, end = _model_stages(start_time, dsp_model)
+    stages['report'] = (datetime.today() - end).total_seconds()
+
+    it = _iter_node_durations(dsp_model.workflow)
+    slowest = sorted(it, key=lambda x: x[1], reverse=True)[:top_nodes]
+
+    return {
+        'stages': stages,
+        'nodes': [('/'.join(map(str, k)), v) for k, v in slowest],
+        'peak_memory': _peak_memory()
+    }
+
+
+def add_performance(report, performance):
+    """
+    Adds the processing performance to the report.
+
+    :param report:
+        Vehicle report.
+    :type report: dict
+
+    :param performance:
+        Processing performance of the vehicle.
+    :type performance: dict
+
+    :return:
+        Vehicle report with the processing performance.
+    :rtype: dict
+    """
+    return dsp_utl.combine_dicts(report, {'performance': performance})
+
+
+def _performance2summary(vehicle_name, performance):
+    r = OrderedDict([('vehicle_name', vehicle_name)])
+    r.update(('%s [s]' % k, v) for k, v in performance['stages'].items())
+    r['total [s]'] = sum(performance['stages'].values())
+    if performance['nodes']:
+        r['slowest node'], r['slowest node [s]'] = performance['nodes'][0]
+    r['peak memory [MB]'] = performance['peak_memory']
+    return r
+
+
+def process_folder_files(input_files, output_folder, metrics_file=None,
+                         **kwds):
     """
     Process all xls-files in a folder with CO2MPAS-model and produces summary.
 
@@ -66,17 +182,32 @@ def process_folder_files(input_files, output_folder, **kwds):
         Where to store the results; the exact output-filenames will be::
 
             <timestamp>-<input_filename>.xlsx
+
+        The installed packages are listed once in
+        ``environment-<environment hash>.txt``.
+
+    :param str metrics_file:
+        Where to export the run metrics (Prometheus text format), if any.
     """
 
-    summary, start_time = _process_folder_files(
-        input_files, output_folder, **kwds
+    start_time = datetime.today()
+    metrics.reset()
+    metrics.fpath = metrics_file
+
+    from co2mpas.io.provenance import save_environment
+    save_environment(output_folder)
+
+    summaries = _process_folder_files(
+        input_files, output_folder, start_time, **kwds
     )
 
     timestamp = start_time.strftime('%Y%m%d_%H%M%S')
 
     summary_xl_file = osp.join(output_folder, '%s-summary.xlsx' % timestamp)
 
-    _save_summary(summary_xl_file, start_time, summary)
+    _save_summary(summary_xl_file, start_time, summaries)
+
+    metrics.flush(force=True)
 
     time_elapsed = (datetime.today() - start_time).total_seconds()
     log.info('Done! [%s sec]', time_elapsed)
@@ -93,8 +224,9 @@ class _custom_tqdm(tqdm):
 
 
 def _process_folder_files(
-        input_files, output_folder, plot_workflow=False, with_output_file=True,
-        output_template=None, overwrite_cache=False, soft_validation=False):
+        input_files, output_folder, start_time, plot_workflow=False,
+        with_output_file=True, output_template=None, overwrite_cache=False,
+        soft_validation=False, with_performance=False):
     """
     Process all xls-files in a folder with CO2MPAS-model.
 
@@ -105,6 +237,10 @@ def _process_folder_files(
         Output folder.
     :type output_folder: str
 
+    :param start_time:
+        Batch start time.
+    :type start_time: datetime.datetime
+
     :param plot_workflow:
         If to show the CO2MPAS model workflow.
     :type plot_workflow: bool, optional
@@ -118,13 +254,19 @@ def _process_folder_files(
           xlsx-file is created.
     :type output_folder: None,False,str
 
+    :param with_performance:
+        If to report the processing performance of each vehicle. The memory
+        allocations are traced with :mod:`tracemalloc`, which slows down the
+        processing.
+    :type with_performance: bool, optional
+
+    :return:
+        The summary of each vehicle, yielded as soon as it is processed.
+    :rtype: collections.Iterable[dict]
     """
 
     model = vehicle_processing_model()
 
-    summary = {}
-
-    start_time = datetime.today()
     timestamp = start_time.strftime('%Y%m%d_%H%M%S')
     kw = {
         'output_folder': output_folder,
@@ -133,13 +275,22 @@ def _process_folder_files(
         'with_output_file': with_output_file,
         'output_template': output_template,
         'overwrite_cache': overwrite_cache,
-        'soft_validation': soft_validation
+        'soft_validation': soft_validation,
+        'with_performance': with_performance
     }
-    for fpath in _custom_tqdm(input_files, bar_format='{l_bar}{bar}{r_bar}'):
+    it = _custom_tqdm(input_files, bar_format='{l_bar}{bar}{r_bar}')
+    for i, fpath in enumerate(it, 1):
+        metrics.set('co2mpas_queue_depth', len(input_files) - i, queue='batch')
         res = _process_vehicle(model, input_file_name=fpath, **kw)
-        _add2summary(summary, res.get('summary', {}))
-
-    return summary, start_time
+        summary = res.get('summary', {})
+        if 'performance' in res:
+            p = _performance2summary(res['vehicle_name'], res['performance'])
+            p = {'performance': p}
+            if isinstance(summary, SummaryTable):  # Plan summary.
+                yield p
+            else:
+                summary = dsp_utl.combine_dicts(summary, p)
+        yield summary
 
 
 def _process_vehicle(
@@ -149,10 +300,34 @@ def _process_vehicle(
         'plot_workflow': plot_workflow
     }
 
-    res = model.dispatch(inputs=dsp_utl.combine_dicts(inputs, kw))
+    # The memory allocations are traced from scratch for each vehicle.
+    trace = kw.get('with_performance') and not tracemalloc.is_tracing()
+    if trace:
+        tracemalloc.start()
+    try:
+        # The intermediate workflows are kept only when they have to be
+        # plotted.
+        res = model.dispatch(
+            inputs=dsp_utl.combine_dicts(inputs, kw), lean=not plot_workflow
+        )
+    finally:
+        if trace:
+            tracemalloc.stop()
 
     plot_model_workflow(model, **res)
 
+    stages = _vehicle_stages(model, res)
+    for k, v in stages.items():
+        metrics.observe('co2mpas_stage_duration_seconds', v, stage=k)
+
+    if 'performance' in res and 'write' in stages:
+        res['performance']['stages']['write'] = stages['write']
+
+    ok = 'dsp_model' in res or res.get('plan')
+    metrics.inc('co2mpas_vehicles_processed_total',
+                status='ok' if ok else 'failed')
+    metrics.flush()
+
     return res
 
 
@@ -191,15 +366,121 @@ def default_output_file_name(output_folder, fname, timestamp):
     return '%s.xlsx' % ofname
 
 
-def _add2summary(total_summary, summary, base_keys=None):
-    base_keys = base_keys or {}
-    for k, v in co2_utl.stack_nested_keys(summary, depth=3):
-        d = co2_utl.get_nested_dicts(total_summary, *k, default=list)
-        if isinstance(v, list):
-            for j in v:
-                d.append(dsp_utl.combine_dicts(j, base_keys))
-        else:
-            d.append(dsp_utl.combine_dicts(v, base_keys))
+class SummaryTable(object):
+    """
+    Columnar accumulator of vehicle summaries.
+
+    The summary records are appended into column buffers, one per summary
+    parameter, and they are converted into the summary data-frame in one step.
+
+    Example::
+
+        >>> table = SummaryTable()
+        >>> table.add({'nedc_h': {'prediction': {'output': {
+        ...     'vehicle_name': 'v1', 'co2_emission_value': 130.0}}}})
+        >>> table.add({'nedc_h': {'prediction': {'output': [
+        ...     {'vehicle_name': 'v1', 'co2_emission_value': 140.0},
+        ...     {'vehicle_name': 'v2', 'co2_emission_value': 150.0}]}}})
+        >>> df = table.to_frame()
+        >>> df.shape
+        (2, 1)
+        >>> df[('nedc_h', 'prediction', 'output', 'co2_emission_value')].tolist()
+        [130.0, 150.0]
+    """
+
+    def __init__(self, index='vehicle_name', depth=3):
+        self.index, self.depth = index, depth
+        self._rows = OrderedDict()  # Row label --> row position.
+        self._columns = OrderedDict()  # Column --> (row positions, values).
+        self._records = set()  # Appended (group, row label).
+
+    def __bool__(self):
+        return bool(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, summary, base_keys=None):
+        """
+        Adds a (vehicle or plan) summary.
+
+        :param summary:
+            Nested summary, with records (or list of records) as leaves.
+        :type summary: dict
+
+        :param base_keys:
+            Values that override the ones of each record.
+        :type base_keys: dict, optional
+        """
+        base_keys = base_keys or {}
+        for k, v in co2_utl.stack_nested_keys(summary, depth=self.depth):
+            for record in (v if isinstance(v, list) else (v,)):
+                self.append(k, dsp_utl.combine_dicts(record, base_keys))
+
+    def append(self, group, record):
+        """
+        Appends a summary record into the column buffers.
+
+        Only the first record of a row label is kept for each group.
+
+        :param group:
+            Summary keys of the record (e.g., `cycle`, `stage`, and `usage`).
+        :type group: tuple
+
+        :param record:
+            Parameters of the record, including the row label.
+        :type record: dict
+        """
+        label = record[self.index]
+        if (group, label) in self._records:
+            return
+        self._records.add((group, label))
+
+        i = self._rows.setdefault(label, len(self._rows))
+        for k, v in record.items():
+            if k != self.index:
+                rows, values = self._columns.setdefault(group + (k,), ([], []))
+                rows.append(i)
+                values.append(v)
+
+    def update(self, other):
+        """
+        Appends the records of another summary table.
+
+        :param other:
+            Summary table to append.
+        :type other: SummaryTable
+        """
+        new, labels = other._records - self._records, list(other._rows)
+        new_labels = {label for group, label in new}
+        for label in labels:
+            if label in new_labels:
+                self._rows.setdefault(label, len(self._rows))
+        for k, (rows, values) in other._columns.items():
+            for i, v in zip(rows, values):
+                if (k[:-1], labels[i]) in new:
+                    r, vs = self._columns.setdefault(k, ([], []))
+                    r.append(self._rows[labels[i]])
+                    vs.append(v)
+        self._records.update(new)
+
+    def to_frame(self):
+        """
+        Returns the summary data-frame.
+
+        :return:
+            Summary data-frame, with a column per summary parameter.
+        :rtype: pandas.DataFrame
+        """
+        import pandas as pd
+        index = pd.Index(list(self._rows), name=self.index, tupleize_cols=False)
+        rows = pd.RangeIndex(len(index))
+        columns = [pd.Series(v, index=i).reindex(rows).values
+                   for i, v in self._columns.values()]
+        df = pd.DataFrame(OrderedDict(enumerate(columns)), copy=False)
+        df.index = index
+        df.columns = pd.MultiIndex.from_tuples(list(self._columns))
+        return df
 
 
 def _get_contain(d, *keys, default=None):
@@ -216,17 +497,52 @@ def _get_contain(d, *keys, default=None):
 
 
 def _save_summary(fpath, start_time, summary):
-    if summary:
-        from co2mpas.io.excel import _df2excel
-        from co2mpas.io import _make_summarydf, _co2mpas_info2df
-        summary = _make_summarydf(summary, index='vehicle_name', depth=3,
-                                  parts=('cycle', 'stage', 'usage'))
+    """
+    Saves the batch summary into an excel file.
+
+    :param fpath:
+        Output file path.
+    :type fpath: str
 
-        writer = pd.ExcelWriter(fpath, engine='xlsxwriter')
+    :param start_time:
+        Batch start time.
+    :type start_time: datetime.datetime
+
+    :param summary:
+        The batch summary or an iterable of vehicle summaries.
+    :type summary: dict | SummaryTable | collections.Iterable
+    """
+    if isinstance(summary, (dict, SummaryTable)):
+        summary = (summary,)
+
+    table, performance = SummaryTable(), []
+    for s in summary:
+        if isinstance(s, SummaryTable):
+            table.update(s)
+            continue
+        if 'performance' in s:
+            s = s.copy()
+            performance.append(s.pop('performance'))
+        table.add(s)
+
+    if table:
+        from co2mpas.io.excel import _df2excel, _write_sheets, XlsxStreamWriter
+        from co2mpas.io import _format_summarydf, _co2mpas_info2df
+        summary = _format_summarydf(table.to_frame(),
+                                    parts=('cycle', 'stage', 'usage'))
+
+        writer = XlsxStreamWriter(fpath)
 
         _df2excel(writer, 'summary', summary)
 
-        _df2excel(writer, 'proc_info', _co2mpas_info2df(start_time))
+        if performance:
+            import pandas as pd
+            c = list(OrderedDict.fromkeys(k for r in performance for k in r))
+            df = pd.DataFrame(performance, columns=c).set_index('vehicle_name')
+            _df2excel(writer, 'performance', df)
+
+        proc_info = (_co2mpas_info2df(start_time),)
+        _write_sheets(writer, 'proc_info', proc_info, down=False)
 
         writer.save()
 
@@ -257,7 +573,8 @@ def vehicle_processing_model():
     dsp = Dispatcher(
         name='CO2MPAS vehicle_processing_model',
         description='Processes a vehicle from the file path to the write of its'
-                    ' outputs.'
+                    ' outputs.',
+        compact=True  # Inherited by the sub-models when dispatched.
     )
 
     dsp.add_data(
@@ -275,6 +592,11 @@ def vehicle_processing_model():
         default_value=False
     )
 
+    dsp.add_data(
+        data_id='with_performance',
+        default_value=False
+    )
+
     dsp.add_function(
         function=default_vehicle_name,
         inputs=['input_file_name'],
@@ -332,6 +654,7 @@ def vehicle_processing_model():
 
     from .report import report
     dsp.add_function(
+        function_id='make_report',
         function=report(),
         inputs=['output_data', 'vehicle_name'],
         outputs=['report', 'summary'],
@@ -344,6 +667,26 @@ def vehicle_processing_model():
         weight=1
     )
 
+    dsp.add_function(
+        function=dsp_utl.add_args(calculate_performance, n=2),
+        inputs=['with_performance', 'report', 'start_time', 'dsp_model'],
+        outputs=['performance'],
+        input_domain=check_first_arg
+    )
+
+    dsp.add_function(
+        function=add_performance,
+        inputs=['report', 'performance'],
+        outputs=['output_report']
+    )
+
+    dsp.add_function(
+        function=dsp_utl.bypass,
+        inputs=['report'],
+        outputs=['output_report'],
+        weight=10
+    )
+
     dsp.add_function(
         function=get_template_file_name,
         inputs=['output_template', 'input_file_name'],
@@ -357,7 +700,7 @@ def vehicle_processing_model():
     )
 
     main_flags = ('template_file_name', 'overwrite_cache', 'soft_validation',
-                  'with_output_file', 'plot_workflow')
+                  'with_output_file', 'plot_workflow', 'with_performance')
 
     dsp.add_function(
         function=partial(dsp_utl.map_list, main_flags),
@@ -366,8 +709,9 @@ def vehicle_processing_model():
     )
 
     dsp.add_function(
+        function_id='write_outputs',
         function=write_outputs(),
-        inputs=['output_file_name', 'template_file_name', 'report',
+        inputs=['output_file_name', 'template_file_name', 'output_report',
                 'start_time', 'main_flags'],
         outputs=[dsp_utl.SINK],
         input_domain=check_first_arg
@@ -384,7 +728,7 @@ def vehicle_processing_model():
     dsp.add_function(
         function=dsp_utl.add_args(make_simulation_plan),
         inputs=['plan', 'validated_plan', 'timestamp', 'output_folder',
-                'main_flags'],
+                'main_flags', 'vehicle_name'],
         outputs=['summary'],
         input_domain=check_first_arg
     )
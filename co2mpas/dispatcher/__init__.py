@@ -163,7 +163,7 @@ class Dispatcher(object):
         return isinstance(other, Dispatcher) and id(other) < id(self)
 
     def __init__(self, dmap=None, name='', default_values=None, raises=False,
-                 description=''):
+                 description='', compact=False):
         """
         Initializes the dispatcher.
 
@@ -188,6 +188,11 @@ class Dispatcher(object):
         :param description:
             The dispatcher's description.
         :type description: str, optional
+
+        :param compact:
+            If True the dispatch runs on a precomputed adjacency of the
+            dispatcher map.
+        :type compact: bool, optional
         """
 
         #: The directed graph that stores data & functions parameters.
@@ -234,6 +239,34 @@ class Dispatcher(object):
         #: A set of visited nodes from the dispatch.
         self._visited = set()
 
+        #: If True the intermediate solutions of the SubDispatch functions are
+        #: released as soon as they have returned their outputs.
+        self._lean = False
+
+        #: Data outputs kept in memory-lean mode (None to keep all of them).
+        self._lean_outputs = None
+
+        #: Number of function nodes that have still to use the data node values
+        #: (memory-lean mode).
+        self._lean_pending = {}
+
+        #: If True the dispatch runs on a precomputed adjacency of the
+        #: dispatcher map (i.e., the successors of each node with the edge
+        #: lengths and the sub-dispatcher flag).
+        self.compact = compact
+
+        #: Precomputed adjacency of the dispatcher map. It is reset when a node
+        #: is added to the dispatcher.
+        self._adjacency = None
+
+        #: LRU cache of the sub-dispatchers returned by :func:`shrink_dsp` and
+        #: :func:`get_sub_dsp_from_workflow`. It is cleared when a node, a
+        #: default value, or a remote link is set in the dispatcher.
+        self._sub_dsp_cache = OrderedDict()
+
+        #: Maximum number of cached sub-dispatchers.
+        self.cache_size = 32
+
         #: A set of target nodes.
         self._targets = set()
 
@@ -430,6 +463,8 @@ class Dispatcher(object):
         # Add node to the dispatcher map.
         self.dmap.add_node(data_id, attr_dict=attr_dict)
 
+        self._reset_cache()  # Reset the precomputed adjacency and cache.
+
         # Set default value.
         self.set_default_value(data_id, default_value, initial_dist)
 
@@ -604,6 +639,8 @@ class Dispatcher(object):
         # Add output edges.
         add_func_edges(self, fun_id, outputs, out_weight, False, n_data)
 
+        self._reset_cache()  # Reset the precomputed adjacency and cache.
+
         return fun_id  # Return function node id.
 
     def add_dispatcher(self, dsp, inputs, outputs, dsp_id=None,
@@ -903,6 +940,7 @@ class Dispatcher(object):
                         'value': value,
                         'initial_dist': initial_dist
                     }
+                self._reset_cache()  # Reset the cached sub-dispatchers.
                 return
         except KeyError:
             pass
@@ -954,6 +992,7 @@ class Dispatcher(object):
                     if [remote_link, type] not in rl:  # Add remote link.
                         rl.append([remote_link, type])
 
+                self._reset_cache()  # Reset the cached sub-dispatchers.
                 return
         except KeyError:
             pass
@@ -1022,7 +1061,7 @@ class Dispatcher(object):
 
         # Define an empty dispatcher.
         sub_dsp = self.__class__(dmap=self.dmap.subgraph(nodes_bunch))
-        sub_dsp.weight = self.weight
+        sub_dsp.weight, sub_dsp.compact = self.weight, self.compact
         sub_dsp.__doc__ = self.__doc__
         sub_dsp.name = self.name
         sub_dsp.raises = self.raises
@@ -1061,7 +1100,8 @@ class Dispatcher(object):
         return sub_dsp  # Return the sub-dispatcher.
 
     def get_sub_dsp_from_workflow(self, sources, graph=None, reverse=False,
-                                  add_missing=False, check_inputs=True):
+                                  add_missing=False, check_inputs=True,
+                                  cached=False):
         """
         Returns the sub-dispatcher induced by the workflow from sources.
 
@@ -1090,6 +1130,12 @@ class Dispatcher(object):
             If True the missing function' inputs are not checked.
         :type check_inputs: bool, optional
 
+        :param cached:
+            If True the sub-dispatcher is taken from a LRU cache keyed by the
+            graph identity and the arguments. A copy of its map structure is
+            returned.
+        :type cached: bool, optional
+
         :return:
             A sub-dispatcher.
         :rtype: Dispatcher
@@ -1145,14 +1191,23 @@ class Dispatcher(object):
             >>> sub_dsp.name = 'Sub-Dispatcher (reverse workflow)'
         """
 
+        if not graph:  # Set default graph.
+            graph = self.workflow
+
+        if cached:
+            key = ('get_sub_dsp_from_workflow', tuple(sources), id(graph),
+                   reverse, add_missing, check_inputs)
+            return self._get_cached_sub_dsp(
+                key, graph, self.get_sub_dsp_from_workflow, sources, graph,
+                reverse, add_missing, check_inputs
+            )
+
         # Define an empty dispatcher map.
         sub_dsp, sub_dsp.weight = self.__class__(), self.weight
+        sub_dsp.compact = self.compact
         sub_dsp.__doc__, sub_dsp.name = self.__doc__, self.name
         sub_dsp.raises, sub_dsp._parent = self.raises, self._parent
 
-        if not graph:  # Set default graph.
-            graph = self.workflow
-
         # Visited nodes used as queue.
         family = {}
 
@@ -1409,6 +1464,19 @@ class Dispatcher(object):
 
         return get_full_pipe(self)
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The precomputed adjacency and the cached sub-dispatchers are rebuilt.
+        state['_adjacency'], state['_sub_dsp_cache'] = None, OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        # Defaults of the attributes missing in old pickles.
+        self.compact, self._lean, self._adjacency = False, False, None
+        self._lean_outputs, self._lean_pending = None, {}
+        self._sub_dsp_cache, self.cache_size = OrderedDict(), 32
+        self.__dict__.update(state)
+
     def copy(self):
         """
         Returns a copy of the Dispatcher.
@@ -1619,7 +1687,7 @@ class Dispatcher(object):
 
     def dispatch(self, inputs=None, outputs=None, cutoff=None, inputs_dist=None,
                  wildcard=False, no_call=False, shrink=False,
-                 rm_unused_nds=False):
+                 rm_unused_nds=False, lean=False):
         """
         Evaluates the minimum workflow and data outputs of the dispatcher
         model from given inputs.
@@ -1662,6 +1730,15 @@ class Dispatcher(object):
             workflow.
         :type rm_unused_nds: bool, optional
 
+        :param lean:
+            If True the workflows and the data outputs of the nested
+            SubDispatch functions are released as soon as they have returned
+            their outputs. Only the workflow structure (i.e., the dispatch pipe)
+            is kept. Moreover, the input values of the function nodes and the
+            intermediate data outputs of the sub-dispatchers are released as
+            soon as all their successors have run.
+        :type lean: bool, optional
+
         :return:
             Dictionary of estimated data node outputs.
         :rtype: dict[str, T]
@@ -1742,6 +1819,8 @@ class Dispatcher(object):
         else:
             dsp = self
 
+        dsp._lean = lean  # Memory-lean mode.
+
         # Initialize.
         args = dsp._init_run(inputs, outputs, wildcard, cutoff, inputs_dist,
                              no_call, rm_unused_nds)
@@ -1765,7 +1844,7 @@ class Dispatcher(object):
         return self.data_output
 
     def shrink_dsp(self, inputs=None, outputs=None, cutoff=None,
-                   inputs_dist=None, wildcard=True):
+                   inputs_dist=None, wildcard=True, cached=False):
         """
         Returns a reduced dispatcher.
 
@@ -1791,6 +1870,11 @@ class Dispatcher(object):
             the connected functions, but not as output.
         :type wildcard: bool, optional
 
+        :param cached:
+            If True the sub-dispatcher is taken from a LRU cache keyed by the
+            arguments. A copy of its map structure is returned.
+        :type cached: bool, optional
+
         :return:
             A sub-dispatcher.
         :rtype: Dispatcher
@@ -1852,6 +1936,15 @@ class Dispatcher(object):
             >>> shrink_dsp.name = 'Sub-Dispatcher'
         """
 
+        if cached:
+            dist = tuple(sorted((inputs_dist or {}).items()))
+            key = ('shrink_dsp', tuple(inputs or ()), tuple(outputs or ()),
+                   cutoff, dist, wildcard)
+            return self._get_cached_sub_dsp(
+                key, self.dmap, self.shrink_dsp, inputs, outputs, cutoff,
+                inputs_dist, wildcard
+            )
+
         bfs = None
 
         if inputs:
@@ -2056,6 +2149,119 @@ class Dispatcher(object):
 
         return edge.get(weight, 1) + node_out.get(weight, 0)  # Return length.
 
+    def _reset_cache(self):
+        """
+        Resets the precomputed adjacency and the cached sub-dispatchers.
+        """
+
+        self._adjacency = None
+        self._sub_dsp_cache.clear()
+
+    def _get_cached_sub_dsp(self, key, graph, function, *args):
+        """
+        Returns a sub-dispatcher from the LRU cache, computing it if missing.
+
+        :param key:
+            Cache key.
+        :type key: tuple
+
+        :param graph:
+            Graph where the sub-dispatcher has been evaluated. A cached value
+            is valid only for the same graph object.
+        :type graph: DiGraph
+
+        :param function:
+            Function that evaluates the sub-dispatcher.
+        :type function: callable
+
+        :return:
+            A sub-dispatcher.
+        :rtype: Dispatcher
+        """
+
+        cache = self._sub_dsp_cache
+
+        if key in cache and cache[key][0] is graph:
+            cache.move_to_end(key)  # Mark as recently used.
+            sub_dsp = cache[key][1]
+        else:
+            sub_dsp = function(*args)
+            cache[key] = (graph, sub_dsp)
+
+            while len(cache) > self.cache_size:  # Drop the least recent used.
+                cache.popitem(last=False)
+
+        return sub_dsp._copy_structure()
+
+    def _copy_structure(self):
+        """
+        Returns a copy of the Dispatcher with its own map structure and default
+        values.
+
+        The node and edge attributes point to the original dispatcher, like the
+        ones of :func:`get_sub_dsp`.
+
+        :return:
+            A copy of the Dispatcher.
+        :rtype: Dispatcher
+        """
+
+        dsp, dsp.weight = self.__class__(), self.weight
+        dsp.compact = self.compact
+        dsp.__doc__, dsp.name = self.__doc__, self.name
+        dsp.raises, dsp._parent = self.raises, self._parent
+
+        dmap, nodes = dsp.dmap, self.dmap.node  # Namespace shortcuts.
+        dmap.node.update(nodes)
+        dmap.succ.update((k, v.copy()) for k, v in self.dmap.succ.items())
+        dmap.pred.update((k, v.copy()) for k, v in self.dmap.pred.items())
+
+        dsp.default_values.update(self.default_values)
+
+        return dsp
+
+    def _get_successors(self, node_id):
+        """
+        Returns the successors of a node of the dispatcher map.
+
+        :param node_id:
+            Node id.
+        :type node_id: str
+
+        :return:
+            Successors with the edge length and the sub-dispatcher flag.
+        :rtype: collections.Iterable[(str, float | int, bool)]
+        """
+
+        if self.compact:
+            adj = self._adjacency
+            if adj is None:  # Precompute the adjacency.
+                adj = self._adjacency = {
+                    k: tuple(self._iter_successors(k)) for k in self.dmap.succ
+                }
+            return adj[node_id]
+
+        return self._iter_successors(node_id)
+
+    def _iter_successors(self, node_id):
+        """
+        Yields the successors of a node of the dispatcher map.
+
+        :param node_id:
+            Node id.
+        :type node_id: str
+
+        :return:
+            Successors with the edge length and the sub-dispatcher flag.
+        :rtype: collections.Iterable[(str, float | int, bool)]
+        """
+
+        nodes, edge_length = self.nodes, self._edge_length
+
+        for w, e_data in self.dmap[node_id].items():
+            node = nodes[w]
+            yield w, edge_length(e_data, node), node['type'] == 'dispatcher'
+
     def _get_node_estimations(self, node_attr, node_id):
         """
         Returns the data nodes estimations and `wait_inputs` flag.
@@ -2135,13 +2341,17 @@ class Dispatcher(object):
 
                 # Return true if the node inputs are satisfied.
                 if we(n_id, wait_in):
-                    return bool(set(pred[n_id]) - set(wf_pred[n_id]))
+                    wf = wf_pred[n_id]
+                    return any(k not in wf for k in pred[n_id])
                 return False
 
         else:
             def check_wait_input_flag(wait_in, n_id):
                 # Return true if the node inputs are satisfied.
-                return wait_in and (set(pred[n_id].keys()) - set(wf_pred[n_id]))
+                if wait_in:
+                    wf = wf_pred[n_id]
+                    return any(k not in wf for k in pred[n_id])
+                return False
 
         return check_wait_input_flag  # Return the function.
 
@@ -2302,7 +2512,13 @@ class Dispatcher(object):
             return self._set_data_node_output(node_id, node_attr, no_call)
 
         elif node_type == 'function':  # Set function node.
-            return self._set_function_node_output(node_id, node_attr, no_call)
+            pred = self._wf_pred.get(node_id, {})  # Namespace shortcut.
+            try:
+                return self._set_function_node_output(node_id, node_attr,
+                                                      no_call)
+            finally:
+                if self._lean:  # Release the used input values.
+                    self._release_inputs(pred)
 
     def _set_data_node_output(self, node_id, node_attr, no_call):
         """
@@ -2405,8 +2621,63 @@ class Dispatcher(object):
             for u in succ_fun:  # Set workflow.
                 wf_add_edge(node_id, u, **value)
 
+            if self._lean:
+                self._set_lean_pending(node_id, succ_fun)
+
         return True  # Return that the output have been evaluated correctly.
 
+    def _set_lean_pending(self, node_id, succ_fun):
+        """
+        Sets the number of function nodes that have still to use the data node
+        value, when it can be released in memory-lean mode.
+
+        Only the intermediate data nodes of sub-dispatchers are released, since
+        the data outputs of the dispatch are returned.
+
+        :param node_id:
+            Data node id.
+        :type node_id: str
+
+        :param succ_fun:
+            Successors of the data node.
+        :type succ_fun: list[str]
+        """
+
+        outputs, nodes = self._lean_outputs, self.nodes  # Namespace shortcuts.
+
+        if outputs is None or node_id in outputs:
+            return  # The data output has to be kept.
+
+        for rl, type in nodes[node_id].get('remote_links', ()):
+            if type == 'child':
+                return  # The data output is donated to a remote dispatcher.
+
+        if all(nodes[u]['type'] == 'function' for u in succ_fun):
+            self._lean_pending[node_id] = len(succ_fun)
+
+    def _release_inputs(self, pred):
+        """
+        Releases the input values of a function node that has been run and the
+        data outputs that are no longer used (memory-lean mode).
+
+        :param pred:
+            Workflow predecessors of the function node.
+        :type pred: dict[str, dict]
+        """
+
+        pending = self._lean_pending  # Namespace shortcut.
+
+        for k, attr in pred.items():
+            attr.pop('value', None)  # Remove the value from the edge.
+
+            if k in pending:
+                pending[k] -= 1
+                if not pending[k]:  # All its successors have run.
+                    del pending[k]
+                    self.data_output.pop(k, None)
+                    for v in self._wf_pred[k].values():
+                        v.pop('value', None)
+
     def _set_function_node_output(self, node_id, node_attr, no_call):
         """
         Set the function node output from node inputs.
@@ -2458,7 +2729,17 @@ class Dispatcher(object):
                 return False  # Args are not respecting the domain.
             else:  # Use the estimation function of node.
                 fun = node_attr['function']
-                res = fun(*args)
+                sub = parent_func(fun)  # Get parent function (if nested).
+
+                if self._lean and isinstance(sub, SubDispatch):
+                    # Dispatch also the nested dispatcher in lean mode.
+                    lean, sub.lean = sub.lean, True
+                    try:
+                        res = fun(*args)
+                    finally:
+                        sub.lean = lean  # Restore the lean mode.
+                else:
+                    res = fun(*args)
 
                 # Apply filters to results.
                 for f in node_attr.get('filters', ()):
@@ -2466,9 +2747,10 @@ class Dispatcher(object):
 
                 attr['duration'] = datetime.today() - attr['started']
 
-                fun = parent_func(fun)  # Get parent function (if nested).
-                if isinstance(fun, SubDispatch):  # Save intermediate results.
-                    attr['workflow'] = (fun.workflow, fun.data_output, fun.dist)
+                if isinstance(sub, SubDispatch):  # Save intermediate results.
+                    if self._lean:
+                        sub.release()  # Release the intermediate solutions.
+                    attr['workflow'] = (sub.workflow, sub.data_output, sub.dist)
 
                 # Save node.
                 self.workflow.add_node(node_id, **attr)
@@ -2495,6 +2777,27 @@ class Dispatcher(object):
 
         return True  # Return that the output have been evaluated correctly.
 
+    def _release(self, outputs=()):
+        """
+        Releases the intermediate solutions of the last dispatch, keeping the
+        workflow structure.
+
+        :param outputs:
+            Data outputs to keep. If None all data outputs are kept.
+        :type outputs: iterable, optional
+        """
+
+        for u, v, attr in self.workflow.edges(data=True):
+            attr.pop('value', None)  # Remove the value from the edge.
+
+        if outputs is not None:
+            for k in set(self.data_output).difference(outputs):
+                del self.data_output[k]
+
+        for k, v in self.sub_dsp_nodes.items():  # Release sub-dispatchers.
+            if k in self.workflow.node:
+                v['function']._release()
+
     def _clear(self):
         """
         Clears the dispatcher structure.
@@ -2507,6 +2810,7 @@ class Dispatcher(object):
         self.check_wait_in = self._check_wait_input_flag()
         self.check_targets = self._check_targets()
         self.dist, self.seen, self._errors = {}, {}, OrderedDict()
+        self._lean_outputs, self._lean_pending = None, {}
 
     def _init_workflow(self, inputs, input_value, inputs_dist, no_call):
         """
@@ -2597,7 +2901,7 @@ class Dispatcher(object):
         """
 
         # Namespace shortcuts for speed.
-        nodes, seen, edge_weight = self.nodes, self.seen, self._edge_length
+        nodes, seen = self.nodes, self.seen
         wf_remove_edge, check_wait_in = self._wf_remove_edge, self.check_wait_in
         wf_add_edge, dsp_in = self._wf_add_edge, self._set_sub_dsp_node_input
         update_view = self._update_meeting
@@ -2615,11 +2919,11 @@ class Dispatcher(object):
 
             self.workflow.add_node(data_id)  # Add node to workflow.
 
-            for w, edge_data in self.dmap[data_id].items():  # See func node.
+            # See func node.
+            for w, length, is_dsp in self._get_successors(data_id):
                 wf_add_edge(data_id, w, **value)  # Set workflow.
 
-                # Evaluate distance.
-                vw_dist = initial_dist + edge_weight(edge_data, nodes[w])
+                vw_dist = initial_dist + length  # Evaluate distance.
 
                 update_view(w, vw_dist)  # Update view distance.
 
@@ -2627,7 +2931,7 @@ class Dispatcher(object):
                 if check_cutoff(vw_dist):
                     wf_remove_edge(data_id, w)  # Remove workflow edge.
                     continue  # Pass the node.
-                elif nodes[w]['type'] == 'dispatcher':
+                elif is_dsp:
                     dsp_in(data_id, w, fringe, check_cutoff, no_call, vw_dist)
                 elif check_wait_in(True, w):
                     continue  # Pass the node.
@@ -2839,7 +3143,6 @@ class Dispatcher(object):
 
         # Namespace shortcuts.
         wf_rm_edge, wf_has_edge = self._wf_remove_edge, self.workflow.has_edge
-        edge_weight, nodes = self._edge_length, self.nodes
 
         self.dist[node_id] = dist  # Set minimum dist.
 
@@ -2852,19 +3155,17 @@ class Dispatcher(object):
         if self.check_targets(node_id):  # Check if the targets are satisfied.
             return False  # Stop loop.
 
-        for w, e_data in self.dmap[node_id].items():
+        for w, length, is_dsp in self._get_successors(node_id):
             if not wf_has_edge(node_id, w):  # Check wildcard option.
                 continue
 
-            node = nodes[w]  # Get node attributes.
-
-            vw_d = dist + edge_weight(e_data, node)  # Evaluate dist.
+            vw_d = dist + length  # Evaluate dist.
 
             if check_cutoff(vw_d):  # Check the cutoff limit.
                 wf_rm_edge(node_id, w)  # Remove edge that cannot be see.
                 continue
 
-            if node['type'] == 'dispatcher':
+            if is_dsp:
                 self._set_sub_dsp_node_input(
                     node_id, w, fringe, check_cutoff, no_call, vw_d)
 
@@ -2965,6 +3266,9 @@ class Dispatcher(object):
         dsp_fringe = self._init_run({}, outputs, False, None, None, no_call,
                                     False)[1]
 
+        # Only the outputs of the sub-dispatcher are used by the parent.
+        self._lean_outputs = set(outputs)
+
         for f in dsp_fringe:  # Update the fringe.
             heappush(fringe, (initial_dist + f[0], 2, f[-1]))
 
@@ -3072,6 +3376,9 @@ class Dispatcher(object):
                         dsp._clear()
                     return False  # Some error occurs.
 
+            # Propagate the memory-lean mode and the compact backend.
+            dsp._lean, dsp.compact = self._lean, self.compact
+
             # Initialize the sub-dispatcher.
             dsp._init_as_sub_dsp(fringe, node['outputs'], no_call, initial_dist)
             wf = (dsp.workflow, dsp.data_output, dsp.dist)
@@ -429,7 +429,7 @@ class SubDispatch(object):
 
     def __init__(self, dsp, outputs=None, cutoff=None, inputs_dist=None,
                  wildcard=False, no_call=False, shrink=False,
-                 rm_unused_nds=False, output_type='all'):
+                 rm_unused_nds=False, output_type='all', lean=False):
         """
         Initializes the Sub-dispatch.
 
@@ -476,6 +476,12 @@ class SubDispatch(object):
                 + 'dict': a dictionary with any outputs listed in `outputs`.
                 + 'dsp': the computed dispatcher.
         :type output_type: str, optional
+
+        :param lean:
+            If True the dispatch is performed in memory-lean mode.
+
+            .. seealso:: :func:`~dispatcher.Dispatcher.dispatch`
+        :type lean: bool, optional
         """
 
         self.dsp = dsp
@@ -487,6 +493,7 @@ class SubDispatch(object):
         self.output_type = output_type
         self.inputs_dist = inputs_dist
         self.rm_unused_nds = rm_unused_nds
+        self.lean = lean
         self.data_output = {}
         self.dist = {}
         self.workflow = DiGraph()
@@ -504,7 +511,7 @@ class SubDispatch(object):
         # Dispatch the function calls.
         o = dsp.dispatch(
             i, outs, self.cutoff, self.inputs_dist, self.wildcard,
-            self.no_call, self.shrink, self.rm_unused_nds
+            self.no_call, self.shrink, self.rm_unused_nds, self.lean
         )
 
         # Save outputs.
@@ -527,6 +534,23 @@ class SubDispatch(object):
 
         return o  # Return outputs.
 
+    def release(self):
+        """
+        Releases the intermediate solutions of the last dispatch, keeping the
+        workflow structure (i.e., the dispatch pipe).
+
+        The returned outputs are never released. When the computed dispatcher
+        is returned, only its `outputs` are kept (all if not defined).
+        """
+
+        if self.output_type == 'all':
+            outputs = None  # All data outputs are returned.
+        elif self.output_type == 'dsp':
+            outputs = self.outputs
+        else:  # The outputs have been already selected.
+            outputs = () if self.outputs is not None else None
+        self.dsp._release(outputs)
+
     def plot(self, workflow=False, edge_data=EMPTY, view=True, depth=-1,
              function_module=False, node_output=False, filename=None,
              nested=True, **kw_dot):
@@ -761,6 +785,8 @@ class SubDispatchFunction(SubDispatch):
 
         dsp._set_wildcards(inputs, outputs)  # Set wildcards.
 
+        dsp.compact = True  # Dispatch on the precomputed adjacency.
+
         dsp.name = function_id  # Set dsp name equal to function id.
 
         # Initialize as sub dispatch.
@@ -804,6 +830,8 @@ class SubDispatchFunction(SubDispatch):
 
         dsp._targets = set(self.outputs or {})  # Clear old targets.
 
+        dsp._lean = self.lean  # Memory-lean mode.
+
         # Initialize.
         args = dsp._init_workflow(input_values, i_val, self.inputs_dist, False)
 
@@ -881,10 +909,23 @@ class SubDispatchPipe(SubDispatchFunction):
        :opt: workflow=True, graph_attr={'ratio': '1'}
 
         >>> dsp = fun.dsp
+
+    The pipe can be compiled into a flat sequence of function calls, that
+    skips the workflow updates::
+
+        >>> fun = SubDispatchPipe(dsp, 'myF', ['a', 'b'], ['a'], compiled=True)
+        >>> fun(2, 1)
+        1
+
+    It can be also evaluated over a time series, carrying the output `a` of
+    the previous step as input of the next one::
+
+        >>> fun.map_over({'b': [3, 1, 4]}, constants={'a': 2}, carry={'a': 'a'})
+        [2, 1, 3]
     """
 
     def __init__(self, dsp, function_id, inputs, outputs=None, cutoff=None,
-                 inputs_dist=None):
+                 inputs_dist=None, compiled=False):
         """
         Initializes the Sub-dispatch Function.
 
@@ -911,6 +952,11 @@ class SubDispatchPipe(SubDispatchFunction):
         :param inputs_dist:
             Initial distances of input data nodes.
         :type inputs_dist: dict[str, int | float], optional
+
+        :param compiled:
+            If True, the pipe is evaluated with the function returned by
+            :meth:`compile`.
+        :type compiled: bool, optional
         """
 
         super(SubDispatchPipe, self).__init__(
@@ -987,6 +1033,193 @@ class SubDispatchPipe(SubDispatchFunction):
                 add_to_pipe((i, dsp))
                 dsp.nodes[i]['distance'] = d
 
+        self.compiled_pipe = self.compile() if compiled else None
+
+    def compile(self):
+        """
+        Compiles the pipe into a flat sequence of direct function calls.
+
+        The values are passed between the functions as local variables of the
+        generated function, without updating the workflow and the data
+        outputs of the dispatcher.
+
+        .. note:: The compiled pipe raises the errors of the functions and
+           it does not handle :class:`~dispatcher.utils.cst.NONE` values
+           returned by the functions.
+
+        :return:
+            A function that takes the same arguments of the pipe.
+        :rtype: function
+        """
+
+        main_dsp, inputs, wildcards = self.dsp, self.inputs, self.wildcards
+
+        def _error(msg, *args):
+            msg = 'Cannot compile the pipe: ' + msg % args
+            raise DispatcherError(main_dsp, msg)
+
+        if any(dsp is not main_dsp for _, dsp in self.pipe):
+            _error('it contains sub-dispatchers.')
+
+        nodes, wf, ns, code = main_dsp.nodes, main_dsp.workflow, {}, []
+        args = ['a%d' % i for i in range(len(inputs))]
+
+        # Variables with the current values seen by the node successors.
+        read = {START: {}}
+        for k, a in zip(inputs, args):
+            read[START][k] = read[k] = a
+        # Default values are set to NONE in the pipe (see `__init__`).
+        for k in main_dsp.default_values:
+            if k not in read:
+                read[START][k] = read[k] = NONE
+
+        out = {k: read[k] for k in inputs if k not in wildcards}
+
+        def _filters(var, filters):
+            for j, f in enumerate(filters):
+                ns['%s_f%d' % (var, j)] = f
+                code.append('%s = %s_f%d(%s)' % (var, var, j, var))
+
+        for n, (v, _) in enumerate(self.pipe):
+            attr, var = nodes[v], 'v%d' % n
+            if attr['type'] == 'data':
+                preds = list(wf.pred[v])
+                if len(preds) > 1:
+                    preds = [u for u in preds if u is not START]
+                try:
+                    est = [read[u][v] for u in preds]
+                except KeyError:
+                    _error("'%s' is not reached.", v)
+
+                if 'function' in attr:
+                    ns[var + '_k'], ns[var + '_d'] = preds, attr['function']
+                    est = ', '.join('NONE' if e is NONE else e for e in est)
+                    code.append('%s = %s_d(dict(zip(%s_k, (%s,))))' % (
+                        var, var, var, est))
+                elif est[0] is NONE:
+                    out.pop(v, None)
+                    continue
+                else:
+                    code.append('%s = %s' % (var, est[0]))
+
+                _filters(var, attr.get('filters', ()))
+
+                if 'callback' in attr:
+                    ns[var + '_c'] = attr['callback']
+                    code.append('%s_c(%s)' % (var, var))
+
+                out[v] = var
+                if v not in wildcards:
+                    read[v] = var
+
+            elif attr['type'] == 'function':
+                try:
+                    a = [read[k] for k in attr['inputs']]
+                except KeyError:
+                    _error("'%s' has unreached inputs.", v)
+                a = ', '.join(k for k in a if k is not NONE)
+                ns[var + '_fun'] = attr['function']
+                code.append('%s = %s_fun(%s)' % (var, var, a))
+                _filters(var, attr.get('filters', ()))
+
+                o_nds, succ = attr['outputs'], {}
+                read[v] = succ
+                if len(o_nds) > 1:
+                    ind = {k: i for i, k in enumerate(o_nds)}
+                    for k in wf.succ[v]:
+                        succ[k] = '%s[%d]' % (var, ind[k])
+                else:
+                    for k in wf.succ[v]:
+                        succ[k] = var
+            else:
+                _error("'%s' is not a data or function node.", v)
+
+        outputs = self.outputs
+        if outputs is None:
+            ns['_keys'] = keys = list(out)
+            ret = 'dict(zip(_keys, (%s,)))' % ', '.join(out[k] for k in keys)
+        else:
+            if set(outputs).difference(out):
+                _error('unreached outputs %s.', set(outputs).difference(out))
+            ret = ', '.join(out[k] for k in outputs)
+            ret = '[%s]' % ret if len(outputs) > 1 else ret
+
+        code.append('return %s' % ret)
+
+        src = 'def pipe(%s):\n    %s\n' % (', '.join(args),
+                                             '\n    '.join(code))
+        ns['NONE'] = NONE
+        exec(compile(src, '<%s>' % main_dsp.name, 'exec'), ns)
+
+        return ns['pipe']
+
+    def release(self):
+        """
+        The pipe keeps its workflow values between calls, so nothing is
+        released.
+        """
+        pass
+
+    def map_over(self, arrays, constants=None, carry=None):
+        """
+        Evaluates the pipe over a time series.
+
+        :param arrays:
+            Time series of the input data nodes.
+        :type arrays: dict[str, iterable]
+
+        :param constants:
+            Values of the input data nodes that are constant over the time
+            series or initial values of the carried inputs.
+        :type constants: dict[str, T], optional
+
+        :param carry:
+            Input data nodes that take the value of the given output of the
+            previous step (i.e., {input id: output id}).
+        :type carry: dict[str, str], optional
+
+        :return:
+            Outputs of each step.
+        :rtype: list
+        """
+
+        inputs, outputs = self.inputs, self.outputs
+        values = combine_dicts(constants or {}, arrays)
+        carry = carry or {}
+
+        missed = set(inputs).difference(values)
+        if missed:
+            msg = '%s() missing inputs: %s'
+            raise TypeError(msg % (self.dsp.name, sorted(missed)))
+
+        if outputs is not None and len(outputs) > 1:
+            carry = [(inputs.index(k), outputs.index(v))
+                     for k, v in carry.items()]
+        else:
+            carry = [(inputs.index(k), v) for k, v in carry.items()]
+            if outputs is not None:
+                carry = [(i, None) for i, _ in carry]
+
+        arrays = [(i, iter(values[k])) for i, k in enumerate(inputs)
+                  if k in arrays]
+        args, res = [values[k] for k in inputs], []
+        func = self.compiled_pipe or self
+
+        while True:
+            try:
+                for i, it in arrays:
+                    args[i] = next(it)
+            except StopIteration:
+                break
+
+            o = func(*args)
+            res.append(o)
+
+            for i, j in carry:
+                args[i] = o if j is None else o[j]
+
+        return res
+
     def _set_node_output(self, dsp, node_id):
         """
         Set the node outputs from node inputs.
@@ -1119,6 +1352,9 @@ class SubDispatchPipe(SubDispatchFunction):
         return True  # Return that the output have been evaluated correctly.
 
     def __call__(self, *args):
+        if self.compiled_pipe is not None:
+            return self.compiled_pipe(*args)
+
         out_flow, in_flow = self.out_flow, self.in_flow
         data_output, wildcards = self.data_output, self.wildcards
         set_node = self._set_node_output
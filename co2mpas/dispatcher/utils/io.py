@@ -12,6 +12,9 @@ It provides functions to read and save a dispatcher from/to files.
 
 __author__ = 'Vincenzo Arcidiacono'
 
+import io
+import dill
+import numpy as np
 from networkx.utils import open_file
 from dill import dump, load
 
@@ -21,7 +24,150 @@ except ImportError:
     GetShortPathName = lambda x: x
 
 __all__ = ['save_dispatcher', 'load_dispatcher', 'save_default_values',
-           'load_default_values', 'save_map', 'load_map']
+           'load_default_values', 'save_map', 'load_map', 'dump_pickle',
+           'load_pickle']
+
+#: Signature of the pickle files with out-of-band numpy arrays.
+_MAGIC = b'\x93DSPOOB\x01'
+
+#: Alignment [bytes] of the out-of-band numpy arrays.
+_ALIGNMENT = 64
+
+
+class _Pickler(dill.Pickler):
+    """
+    Pickler that stores the numpy arrays out-of-band.
+    """
+
+    def __init__(self, file, min_size=1024, **kwargs):
+        super(_Pickler, self).__init__(file, **kwargs)
+        self.min_size = min_size
+        self.arrays, self._arrays_ids = [], {}
+
+    def persistent_id(self, obj):
+        if type(obj) is np.ndarray and obj.nbytes >= self.min_size and \
+                obj.ndim and not obj.dtype.hasobject:
+            i = self._arrays_ids.get(id(obj))
+            if i is None:
+                i = self._arrays_ids[id(obj)] = len(self.arrays)
+                self.arrays.append(obj)
+            return i
+        return None
+
+
+class _Unpickler(dill.Unpickler):
+    """
+    Unpickler that resolves the out-of-band numpy arrays.
+    """
+
+    def __init__(self, file, arrays, **kwargs):
+        super(_Unpickler, self).__init__(file, **kwargs)
+        self.arrays = arrays
+
+    def persistent_load(self, pid):
+        return self.arrays[pid]
+
+
+def _align(n):
+    return -(-n // _ALIGNMENT) * _ALIGNMENT
+
+
+def dump_pickle(obj, file, min_size=1024):
+    """
+    Write an object in Python pickle format, storing the numpy arrays
+    out-of-band.
+
+    The file contains the pickle stream and, aligned after it, the raw data of
+    the numpy arrays with at least `min_size` bytes. The arrays are not copied
+    into the pickle stream and they can be memory-mapped on load (see
+    :func:`load_pickle`). Shared objects (e.g., the dispatcher maps) are stored
+    once.
+
+    :param obj:
+        Object to be stored (e.g., a dispatcher or a dispatch solution).
+    :type obj: T
+
+    :param file:
+        Writable binary file.
+    :type file: io.BufferedWriter
+
+    :param min_size:
+        Minimum size [bytes] of the arrays to be stored out-of-band.
+    :type min_size: int, optional
+    """
+
+    stream = io.BytesIO()
+    pickler = _Pickler(stream, min_size=min_size)
+    pickler.dump(obj)
+
+    meta, offset = [], 0
+    for a in pickler.arrays:
+        order = 'F' if a.flags.f_contiguous and not a.flags.c_contiguous else 'C'
+        meta.append((a.dtype.str, a.shape, order, offset))
+        offset = _align(offset + a.nbytes)
+
+    header, stream = dill.dumps(meta), stream.getbuffer()
+    for b in (_MAGIC, len(header).to_bytes(8, 'little'),
+              len(stream).to_bytes(8, 'little'), header, stream):
+        file.write(b)
+
+    position = len(_MAGIC) + 16 + len(header) + len(stream)
+    start = _align(position)
+    for a, (dtype, shape, order, offset) in zip(pickler.arrays, meta):
+        file.write(b'\0' * (start + offset - position))  # Padding.
+        a = a.T if order == 'F' else np.ascontiguousarray(a)
+        file.write(a.data.cast('B'))
+        position = start + offset + a.nbytes
+
+
+def load_pickle(file, mmap_mode=None):
+    """
+    Load an object written by :func:`dump_pickle`.
+
+    Files in plain pickle format are loaded with dill.
+
+    :param file:
+        Readable binary file.
+    :type file: io.BufferedReader
+
+    :param mmap_mode:
+        If not None and `file` is a plain file, the numpy arrays are
+        memory-mapped with the given mode (see :class:`numpy.memmap`), otherwise
+        they are loaded in memory. The memory-mapped arrays can be shared
+        between processes.
+    :type mmap_mode: str, optional
+
+    :return:
+        The stored object.
+    :rtype: T
+    """
+
+    if file.read(len(_MAGIC)) != _MAGIC:  # Plain pickle file.
+        file.seek(0)
+        return load(file)
+
+    n_header = int.from_bytes(file.read(8), 'little')
+    n_stream = int.from_bytes(file.read(8), 'little')
+    meta, stream = dill.loads(file.read(n_header)), file.read(n_stream)
+    start = _align(len(_MAGIC) + 16 + n_header + n_stream)
+
+    arrays = []
+    if meta:
+        if mmap_mode and isinstance(file, io.BufferedReader):
+            buffer = np.memmap(file, dtype=np.uint8, mode=mmap_mode,
+                               offset=start)
+        else:
+            dtype, shape, order, offset = meta[-1]
+            size = offset + int(np.prod(shape)) * np.dtype(dtype).itemsize
+            file.seek(start)
+            buffer = bytearray(size)
+            file.readinto(buffer)
+
+        for dtype, shape, order, offset in meta:
+            arrays.append(np.ndarray(shape, dtype, buffer, offset,
+                                     order=order))
+
+    return _Unpickler(io.BytesIO(stream), arrays).load()
 
 
 @open_file(1, mode='wb')
@@ -56,12 +202,11 @@ def save_dispatcher(dsp, path):
         >>> save_dispatcher(dsp, file_name)
     """
 
-    # noinspection PyArgumentList
-    dump(dsp, path)
+    dump_pickle(dsp, path)
 
 
 @open_file(0, mode='rb')
-def load_dispatcher(path):
+def load_dispatcher(path, mmap_mode=None):
     """
     Load Dispatcher object in Python pickle format.
 
@@ -73,6 +218,12 @@ def load_dispatcher(path):
         File names ending in .gz or .bz2 will be uncompressed.
     :type path: str, file
 
+    :param mmap_mode:
+        If not None, the numpy arrays are memory-mapped with the given mode.
+
+        .. seealso:: :func:`load_pickle`
+    :type mmap_mode: str, optional
+
     :return: dispatcher map that identifies the model adopted.
     :rtype: co2mpas.dispatcher.Dispatcher
 
@@ -95,8 +246,7 @@ def load_dispatcher(path):
         3
     """
 
-    # noinspection PyArgumentList
-    return load(path)
+    return load_pickle(path, mmap_mode=mmap_mode)
 
 
 @open_file(1, mode='wb')
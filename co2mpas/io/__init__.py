@@ -19,7 +19,10 @@ Modules:
 
     dill
     excel
+    metadata
+    provenance
     schema
+    sweep
     validations
     constants
 """
@@ -29,11 +32,13 @@ import logging
 import pathlib
 import regex
 import pandas as pd
-from pip.operations.freeze import freeze
 from .schema import define_data_schema
 import co2mpas.dispatcher.utils as dsp_utl
+from co2mpas.telemetry import count_cache
 from co2mpas._version import version, __input_file_version__
 from .dill import *
+from .metadata import load_metadata
+from .provenance import get_environment_hash, get_environment_fname
 import co2mpas.utils as co2_utl
 from co2mpas.dispatcher import Dispatcher
 from .excel import write_to_excel, parse_excel_file, _sheet_name, \
@@ -72,6 +77,11 @@ def check_cache_fpath_exists(overwrite_cache, fpath, cache_fpath):
     return False
 
 
+def check_input_cache(overwrite_cache, fpath, cache_fpath):
+    hit = check_cache_fpath_exists(overwrite_cache, fpath, cache_fpath)
+    return count_cache('input', hit)
+
+
 # noinspection PyUnusedLocal
 def check_file_format(fpath, *args, extensions=('.xlsx',)):
     return fpath.lower().endswith(extensions)
@@ -96,6 +106,10 @@ def _make_summarydf(
         nested_dict, index=None, depth=0, add_units=True,
         parts=()):
     df = _dd2df(nested_dict, index=index, depth=depth)
+    return _format_summarydf(df, add_units=add_units, parts=parts)
+
+
+def _format_summarydf(df, add_units=True, parts=()):
     p = _param_orders()
     p = dsp_utl.selector(parts + ('param',), p, output_type='list')
     gen = partial(zip_longest, p[:-1], fillvalue=p[-1])
@@ -167,7 +181,7 @@ def _comparison2df(comparison):
 
 
 def _proc_info2df(data, start_time, main_flags):
-    res = (_co2mpas_info2df(start_time, main_flags), _freeze2df())
+    res = (_co2mpas_info2df(start_time, main_flags),)
 
     df, max_l = _pipe2list(data.get('pipe', {}))
 
@@ -176,16 +190,38 @@ def _proc_info2df(data, start_time, main_flags):
         setattr(df, 'name', 'pipe')
         res += (df,)
 
+    if 'performance' in data:
+        res += _performance2df(data['performance'])
+
     return {'proc_info': res}
 
 
+def _performance2df(performance):
+    stages = [('%s [s]' % k, v) for k, v in performance['stages'].items()]
+    stages.append(('peak memory [MB]', performance['peak_memory']))
+    df = pd.DataFrame(stages, columns=['Stage', 'Value'])
+    df.set_index(['Stage'], inplace=True)
+    setattr(df, 'name', 'performance')
+    res = (df,)
+
+    if performance['nodes']:
+        df = pd.DataFrame(performance['nodes'], columns=['Node', 'Duration [s]'])
+        df.set_index(['Node'], inplace=True)
+        setattr(df, 'name', 'slowest_nodes')
+        res += (df,)
+
+    return res
+
+
 def _co2mpas_info2df(start_time, main_flags=None):
 
     time_elapsed = (datetime.datetime.today() - start_time).total_seconds()
     info = [
         ('CO2MPAS version', version),
         ('Simulation started', start_time.strftime('%Y/%m/%d-%H:%M:%S')),
-        ('Time elapsed', '%.3f sec' % time_elapsed)
+        ('Time elapsed', '%.3f sec' % time_elapsed),
+        ('Environment hash', get_environment_hash()),
+        ('Environment packages', get_environment_fname())
     ]
 
     if main_flags:
@@ -197,16 +233,6 @@ def _co2mpas_info2df(start_time, main_flags=None):
     return df
 
 
-def _freeze2df():
-    d = dict(v.split('==') for v in freeze() if '==' in v)
-    d['version'] = 'version'
-    df = pd.DataFrame([d])
-    df.set_index(['version'], inplace=True)
-    df = df.transpose()
-    setattr(df, 'name', 'packages')
-    return df
-
-
 def _pipe2list(pipe, i=0, source=()):
     res = []
     def f(x):
@@ -334,7 +360,7 @@ def _param_orders():
         'stage': ('precondition', 'calibration', 'prediction'),
         'cycle': ('delta', 'all', 'nedc_h', 'nedc_l', 'wltp_h', 'wltp_l',
                   'wltp_p'),
-        'type': ('pa', 'ts', 'pl'),
+        'type': ('pa', 'ts', 'pl', 'sw'),
         'param': param
     }
     _map = {k: {j: str(i).zfill(3) for i, j in enumerate(v)}
@@ -480,6 +506,22 @@ _re_units = regex.compile('(\[.*\])')
 
 @cached({})
 def get_doc_description():
+    """
+    Returns the descriptions of the model data nodes.
+
+    They are read from the precomputed model metadata, if available.
+
+    :return:
+        Descriptions of the model data nodes.
+    :rtype: dict[str, str]
+    """
+    try:
+        return load_metadata()['descriptions']
+    except KeyError:
+        return search_doc_descriptions()
+
+
+def search_doc_descriptions():
     from ..model.physical import physical
     from co2mpas.dispatcher.utils import search_node_description
 
@@ -583,10 +625,12 @@ def load_inputs():
 
     dsp.add_function(
         function_id='load_data_from_cache',
-        function=dsp_utl.add_args(load_from_dill, n=2),
+        function=dsp_utl.add_args(
+            partial(load_from_dill, mmap_mode=CACHE_MMAP_MODE), n=2
+        ),
         inputs=['overwrite_cache', 'input_file_name', 'cache_file_name'],
         outputs=['data'],
-        input_domain=check_cache_fpath_exists
+        input_domain=check_input_cache
     )
 
     dsp.add_function(
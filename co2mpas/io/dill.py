@@ -10,34 +10,73 @@ It contains functions to read/write inputs/outputs from/on a .dill file.
 """
 
 import logging
+import os
 
 log = logging.getLogger(__name__)
 
-import dill
-from networkx.utils.decorators import open_file
+from co2mpas.dispatcher.utils.io import dump_pickle, load_pickle
 
-__all__ = ['load_from_dill', 'save_dill']
+__all__ = ['load_from_dill', 'save_dill', 'CACHE_MMAP_MODE']
 
+#: Mode to memory-map the arrays of the cache files (i.e., copy-on-write).
+#: The arrays are shared between the processes and their changes are private.
+CACHE_MMAP_MODE = 'c'
 
-@open_file(0, mode='rb')
-def load_from_dill(fpath):
+
+def load_from_dill(fpath, mmap_mode=None):
     """
     Load inputs from .dill file.
 
     :param fpath:
-        File path.
-    :type fpath: str
+        File path or readable binary file.
+    :type fpath: str | io.BufferedReader
+
+    :param mmap_mode:
+        If not None, the numpy arrays are memory-mapped with the given mode.
+
+        .. seealso:: :func:`co2mpas.dispatcher.utils.io.load_pickle`
+    :type mmap_mode: str, optional
 
     :return:
         Input data.
     :rtype: dict
     """
     log.debug('Reading dill-file: %s', fpath)
-    return dill.load(fpath)
+    if hasattr(fpath, 'read'):
+        return load_pickle(fpath, mmap_mode=mmap_mode)
+
+    with open(fpath, 'rb') as file:
+        return load_pickle(file, mmap_mode=mmap_mode)
 
 
 # noinspection PyUnusedLocal
-@open_file(1, mode='wb')
 def save_dill(data, fpath, *args, **kwargs):
+    """
+    Save data on .dill file.
+
+    The file is replaced atomically, hence the arrays memory-mapped from the
+    previous file (see :func:`load_from_dill`) remain valid.
+
+    :param data:
+        Data to be saved.
+    :type data: T
+
+    :param fpath:
+        File path or writable binary file.
+    :type fpath: str | io.BufferedWriter
+    """
     log.debug('Writing dill-file: %s', fpath)
-    dill.dump(data, fpath)
+    if hasattr(fpath, 'write'):
+        dump_pickle(data, fpath)
+        return
+
+    tmp = '%s.%d.tmp' % (fpath, os.getpid())
+    try:
+        with open(tmp, 'wb') as file:
+            dump_pickle(data, file)
+        os.replace(tmp, fpath)
+    except PermissionError:  # E.g., the file is memory-mapped on Windows.
+        log.warning('Dill-file (%s) not replaced because it is in use!', fpath)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
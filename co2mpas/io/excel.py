@@ -10,24 +10,29 @@ It contains functions to read/write inputs/outputs from/on excel.
 """
 
 
+import contextlib
 import logging
-from math import isnan
+from math import isnan, isinf
+import heapq
+import numpy as np
 import pandas as pd
 from collections import Iterable
 from pandalone.xleash import lasso
 from pandalone.xleash.io._xlrd import _open_sheet_by_name_or_index
 import shutil
 import openpyxl
+import xlsxwriter
 from xlsxwriter.utility import xl_range_abs, xl_rowcol_to_cell_fast
 import co2mpas.utils as co2_utl
 from inspect import getfullargspec
-from itertools import chain
+from itertools import chain, groupby
 import regex
 import co2mpas.dispatcher.utils as dsp_utl
 from co2mpas.dispatcher.utils.alg import stlp
 import json
 import os.path as osp
 from functools import partial
+from .sweep import SETTINGS as SWEEP_SETTINGS
 
 
 log = logging.getLogger(__name__)
@@ -67,7 +72,7 @@ _re_input_sheet_name = regex.compile(
         ((?P<cycle>WLTP([-_]{1}[HLP]{1})?|
                    NEDC([-_]{1}[HL]{1})?|
                    ALL)(recon)?[. ]?)?
-        ((?P<type>(pa|ts|pl)))?$$
+        ((?P<type>(pa|ts|pl|sw)))?$$
     """, regex.IGNORECASE | regex.X | regex.DOTALL)
 
 
@@ -95,7 +100,7 @@ def parse_excel_file(
     """
 
     excel_file = pd.ExcelFile(file_path)
-    res, plans = {}, []
+    res, plans, sweeps = {}, [], []
 
     defaults = {'scope': 'base'}
 
@@ -113,13 +118,16 @@ def parse_excel_file(
         if match['scope'] == 'base':
             _parse_base_data(res, match, sheet, sheet_name, re_params_name)
         elif match['scope'] == 'plan':
-            _parse_plan_data(plans, match, sheet, sheet_name, re_params_name)
+            p = sweeps if match.get('type') == 'sw' else plans
+            _parse_plan_data(p, match, sheet, sheet_name, re_params_name)
 
     for k, v in co2_utl.stack_nested_keys(res.get('base', {}), depth=3):
         if k[0] != 'target':
             v['cycle_type'] = v.get('cycle_type', k[-1].split('_')[0]).upper()
             v['cycle_name'] = v.get('cycle_name', k[-1]).upper()
 
+    if sweeps:
+        res['sweep'] = _finalize_plan(res, sweeps, file_path)
     res['plan'] = _finalize_plan(res, plans, file_path)
 
     return res
@@ -237,8 +245,11 @@ def _parse_plan_data(
     plan = pd.DataFrame()
     defaults = {'usage': 'input', 'stage': 'calibration'}
     match = dsp_utl.combine_dicts(defaults, match)
+    settings = ('base', 'defaults')
+    if match.get('type') == 'sw':
+        settings += SWEEP_SETTINGS
     for k, v in parse_values(data, match, re_params_name):
-        k = k[-1] if k[-1] in ('base', 'defaults') else '.'.join(k[1:])
+        k = k[-1] if k[-1] in settings else '.'.join(k[1:])
         plan[k] = v
 
     plans.append(plan)
@@ -309,15 +320,18 @@ def _write_sheets(writer, sheet_name, data, down=True, **kw):
         return [_df2excel(writer, sheet_name, data, **kw)]
     else:
         refs = []
-        for d in data:
-            ref = _write_sheets(writer, sheet_name, d, down=not down, **kw)
-            refs.extend(ref)
-            if ref[-1]:
-                corner = ref[-1][0]
-                if down:
-                    kw['startrow'] = d.shape[0] + corner[0] + 2
-                else:
-                    kw['startcol'] = d.shape[1] + corner[1] + 2
+        with contextlib.ExitStack() as stack:
+            if not down and isinstance(writer, XlsxStreamWriter):
+                stack.enter_context(writer.side_by_side())
+            for d in data:
+                ref = _write_sheets(writer, sheet_name, d, down=not down, **kw)
+                refs.extend(ref)
+                if ref[-1]:
+                    corner = ref[-1][0]
+                    if down:
+                        kw['startrow'] = d.shape[0] + corner[0] + 2
+                    else:
+                        kw['startcol'] = d.shape[1] + corner[1] + 2
         return refs
 
 
@@ -330,8 +344,8 @@ def write_to_excel(data, output_file_name, template_file_name):
 
         writer = clone_excel(template_file_name, output_file_name)
     else:
-        log.debug('Writing into xl-file(%s)...', output_file_name)
-        writer = pd.ExcelWriter(output_file_name, engine='xlsxwriter')
+        log.debug('Streaming into xl-file(%s)...', output_file_name)
+        writer = XlsxStreamWriter(output_file_name)
     xlref = []
     for k, v in sorted(data.items(), key=_sort_sheets):
         if not k.startswith('graphs.'):
@@ -368,6 +382,145 @@ def clone_excel(file_name, output_file_name):
     return writer
 
 
+class XlsxStreamWriter(object):
+    """
+    Excel writer that streams the sheet rows on disk.
+
+    It uses the `constant_memory` mode of xlsxwriter, so the written rows are
+    not kept in memory. Since that mode requires to write the rows in order,
+    each data-frame is written as soon as it arrives, the sheets cannot be
+    written again once the next sheet is started, and the data-frames placed
+    side by side have to be written within :meth:`side_by_side`.
+
+    The cell layout is the same of :meth:`pandas.DataFrame.to_excel`, except
+    that the index labels are not merged.
+    """
+
+    def __init__(self, fpath):
+        self.book = xlsxwriter.Workbook(fpath, {'constant_memory': True})
+        self.sheets = {}
+        self._sheet_name, self._row, self._group = None, 0, None
+
+    def _get_sheet(self, shname):
+        if shname != self._sheet_name:
+            if self._group:
+                raise ValueError('Side by side data-frames must be written '
+                                 'on the same sheet (%s).' % self._sheet_name)
+            if shname in self.sheets:
+                raise ValueError('Sheet %r has been already written.' % shname)
+            self.sheets[shname] = self.book.add_worksheet(shname)
+            self._sheet_name, self._row = shname, 0
+        return self.sheets[shname]
+
+    def _write_rows(self, rows):
+        sheet, row = self.sheets[self._sheet_name], None
+        for row, col, values, spans in rows:
+            if row < self._row:
+                raise ValueError('Row %d of sheet %r has been already '
+                                 'written.' % (row, self._sheet_name))
+            self._row = row
+            sheet.write_row(row, col, values)
+            for i, j in spans:
+                sheet.merge_range(row, col + i, row, col + j, values[i])
+        if row is not None:
+            self._row = row + 1
+
+    def write_df(self, shname, df, **kw):
+        self._get_sheet(shname)
+        rows = _df2rows(df, **kw)
+        if self._group is None:
+            self._write_rows(rows)
+        else:
+            self._group.append(rows)
+
+    @contextlib.contextmanager
+    def side_by_side(self):
+        """
+        Merges the rows of the data-frames written within the context.
+        """
+        if self._group is not None:  # Already merging.
+            yield
+            return
+        self._group = []
+        try:
+            yield
+            self._write_rows(heapq.merge(*self._group))
+        finally:
+            self._group = None
+
+    def save(self):
+        self.book.close()
+
+
+def _xl_value(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+
+    if value is None or isinstance(value, (str, bool, int)):
+        return value
+    elif isinstance(value, float):
+        if isnan(value):
+            return None
+        elif isinf(value):
+            return '-inf' if value < 0 else 'inf'
+        return value
+    return str(value)
+
+
+def _header_spans(columns, level):
+    it = groupby(enumerate(columns), key=lambda x: x[1][:level + 1])
+    for k, g in it:
+        g = [i for i, v in g]
+        if len(g) > 1:
+            yield g[0], g[-1]
+
+
+# noinspection PyUnusedLocal
+def _df2rows(df, index=True, header=True, startrow=0, startcol=0, **kw):
+    """
+    Yields the rows of a data-frame with the cell layout of `to_excel`.
+
+    :return:
+        Row, column, values, and spans to merge of each row.
+    :rtype: collections.Iterable[(int, int, list, list)]
+    """
+    row, idx_names = startrow, ()
+    if index:
+        idx_names = [_xl_value(v) for v in df.index.names]
+    col = startcol + len(idx_names)
+
+    if header:
+        if isinstance(df.columns, pd.MultiIndex):
+            columns = list(df.columns)
+            for i, name in enumerate(df.columns.names):
+                values = [_xl_value(c[i]) for c in columns]
+                if idx_names and name is not None:
+                    values.insert(0, _xl_value(name))
+                    spans = [(j + 1, k + 1) for j, k in
+                             _header_spans(columns, i)]
+                    yield row, col - 1, values, spans
+                else:
+                    yield row, col, values, list(_header_spans(columns, i))
+                row += 1
+
+            if idx_names:
+                if any(v is not None for v in idx_names):
+                    yield row, startcol, idx_names, []
+                row += 1
+        else:
+            yield row, startcol, idx_names + list(map(_xl_value, df.columns)), []
+            row += 1
+
+    values = df.itertuples(index=False, name=None)
+    if not idx_names:
+        for row, v in enumerate(values, start=row):
+            yield row, startcol, list(map(_xl_value, v)), []
+    else:
+        labels = df.index if len(idx_names) > 1 else ((k,) for k in df.index)
+        for row, (k, v) in enumerate(zip(labels, values), start=row):
+            yield row, startcol, list(map(_xl_value, k + v)), []
+
+
 def _sort_sheets(x):
     x = x[0]
     imp = ['summary', 'graphs', 'plan', 'nedc_h', 'nedc_l', 'wltp_h', 'wltp_l',
@@ -409,7 +562,10 @@ def _multi_index_df2excel(writer, shname, df, index=True, **kw):
 
 def _df2excel(writer, shname, df, k0=0, named_ranges=('columns', 'rows'), **kw):
     if isinstance(df, pd.DataFrame) and not df.empty:
-        _multi_index_df2excel(writer, shname, df, **kw)
+        if isinstance(writer, XlsxStreamWriter):
+            writer.write_df(shname, df, **kw)
+        else:
+            _multi_index_df2excel(writer, shname, df, **kw)
         defaults = _get_defaults(df.to_excel)
         defaults.update(kw)
         kw = defaults
@@ -500,13 +656,15 @@ def _get_corner(df, startcol=0, startrow=0, index=False, header=True, **kw):
 
 
 def _ranges_by_col(df, startrow, startcol):
-    for col, (k, v) in enumerate(df.items(), start=startcol):
-        yield k, xl_range_abs(startrow, col, startrow + len(v) - 1, col)
+    n = df.shape[0]
+    for col, k in enumerate(df.columns, start=startcol):
+        yield k, xl_range_abs(startrow, col, startrow + n - 1, col)
 
 
 def _ranges_by_row(df, startrow, startcol):
-    for row, (k, v) in enumerate(df.iterrows(), start=startrow):
-        yield k, xl_range_abs(row, startcol, row, startcol + len(v) - 1)
+    n = df.shape[1]
+    for row, k in enumerate(df.index, start=startrow):
+        yield k, xl_range_abs(row, startcol, row, startcol + n - 1)
 
 
 def _chart2excel(writer, shname, charts):
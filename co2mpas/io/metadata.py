@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It contains functions to read/write the precomputed model metadata.
+
+The descriptions and units of the model data nodes are extracted from the
+function docstrings of the physical model. Since this is expensive, they are
+saved at build time in a package data file, versioned with CO2MPAS and stamped
+with the hash of the model (i.e., node ids and docstrings)::
+
+    python -m co2mpas.io.metadata
+
+The file has to be regenerated whenever the model nodes or docstrings change
+(see :func:`model_hash`), otherwise it is skipped at load time and the metadata
+is recomputed.
+"""
+
+import hashlib
+import inspect
+import io
+import json
+import logging
+import os.path as osp
+from co2mpas._version import version
+
+log = logging.getLogger(__name__)
+
+__all__ = ['load_metadata', 'save_metadata', 'model_hash']
+
+#: File path of the precomputed model metadata.
+METADATA_FPATH = osp.join(osp.dirname(__file__), 'model_metadata.json')
+
+
+def load_metadata(fpath=METADATA_FPATH, dsp=None):
+    """
+    Loads the precomputed model metadata.
+
+    :param fpath:
+        File path.
+    :type fpath: str
+
+    :param dsp:
+        Model to check the model hash. If None, it is used the physical model.
+    :type dsp: co2mpas.dispatcher.Dispatcher, optional
+
+    :return:
+        Model metadata (i.e., `descriptions` of the data nodes).
+        It is empty if the file is missing, built for another version, or
+        stale (i.e., the model hash does not match).
+    :rtype: dict
+    """
+    try:
+        with io.open(fpath, encoding='UTF-8') as f:
+            data = json.load(f)
+    except (IOError, ValueError) as ex:
+        log.debug('Cannot read model metadata (%s) due to: %s', fpath, ex)
+        return {}
+
+    if data.get('version') != version:
+        log.debug('Model metadata (%s) of version %s skipped, expected %s.',
+                  fpath, data.get('version'), version)
+        return {}
+
+    h = model_hash(dsp)
+    if data.get('model_hash') != h:
+        log.warning('Model metadata (%s) skipped because it is stale, '
+                    'regenerate it with `python -m co2mpas.io.metadata`.',
+                    fpath)
+        return {}
+
+    return data
+
+
+def _iter_model_docs(dsp, base=()):
+    from co2mpas.dispatcher.utils.des import parent_func
+    for k, node in sorted(dsp.nodes.items(), key=lambda x: str(x[0])):
+        node_id = base + (str(k),)
+        yield '/'.join(node_id), node['type'], node.get('description', '')
+        if node['type'] == 'dispatcher':
+            yield from _iter_model_docs(node['function'], node_id)
+        elif node['type'] == 'function' and 'function' in node:
+            yield '', '', inspect.getdoc(parent_func(node['function'])) or ''
+
+
+def model_hash(dsp=None):
+    """
+    Returns the hash of the model node ids and docstrings.
+
+    :param dsp:
+        Model. If None, it is used the physical model.
+    :type dsp: co2mpas.dispatcher.Dispatcher, optional
+
+    :return:
+        Model hash.
+    :rtype: str
+    """
+    if dsp is None:
+        from ..model.physical import physical
+        dsp = physical()
+    h = hashlib.sha1()
+    for v in _iter_model_docs(dsp):
+        h.update('\x00'.join(v).encode('UTF-8'))
+    return h.hexdigest()
+
+
+def save_metadata(fpath=METADATA_FPATH):
+    """
+    Extracts the model metadata from the physical model and saves it.
+
+    :param fpath:
+        File path.
+    :type fpath: str
+    """
+    from . import search_doc_descriptions
+    data = {
+        'version': version,
+        'model_hash': model_hash(),
+        'descriptions': search_doc_descriptions()
+    }
+    log.debug('Writing model metadata: %s', fpath)
+    with io.open(fpath, 'w', encoding='UTF-8') as f:
+        json.dump(data, f, indent=1, sort_keys=True, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    save_metadata()
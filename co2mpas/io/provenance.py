@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It contains functions to collect the provenance info of CO2MPAS outputs.
+
+The python environment is scanned once per process and it is identified by a
+content hash, that is the same for all outputs produced with identical
+environments. The outputs contain only the hash and the name of the
+environment file (see :func:`save_environment`), that lists the packages.
+"""
+
+import hashlib
+import logging
+import os.path as osp
+from cachetools import cached
+
+log = logging.getLogger(__name__)
+
+__all__ = ['get_environment', 'get_environment_hash',
+           'get_environment_fname', 'save_environment']
+
+
+def _distributions():
+    try:
+        from importlib import metadata
+    except ImportError:  # Python < 3.8.
+        import pkg_resources
+        return {(d.project_name, d.version) for d in pkg_resources.working_set}
+    return {(d.metadata['Name'], d.version) for d in metadata.distributions()
+            if d.metadata['Name']}
+
+
+@cached({})
+def get_environment():
+    """
+    Returns the python packages installed in the running environment.
+
+    :return:
+        Package names and versions, sorted by name.
+    :rtype: tuple[(str, str)]
+    """
+    log.debug('Collecting installed packages...')
+    env = _distributions()
+    return tuple(sorted(env, key=lambda x: (x[0].lower(), x)))
+
+
+def _freeze():
+    return ''.join('%s==%s\n' % v for v in get_environment())
+
+
+@cached({})
+def get_environment_hash():
+    """
+    Returns the content hash of the running python environment.
+
+    :return:
+        SHA1 hex-digest of the installed packages.
+    :rtype: str
+    """
+    return hashlib.sha1(_freeze().encode('UTF-8')).hexdigest()
+
+
+def get_environment_fname():
+    """
+    Returns the file name of the running python environment.
+
+    :return:
+        File name, containing the environment hash.
+    :rtype: str
+    """
+    return 'environment-%s.txt' % get_environment_hash()
+
+
+def save_environment(output_folder):
+    """
+    Saves the installed packages (`pip freeze` format) in the output folder.
+
+    The file is written once, because its name contains the environment hash.
+
+    :param output_folder:
+        Output folder.
+    :type output_folder: str
+
+    :return:
+        File path of the environment.
+    :rtype: str
+    """
+    fpath = osp.join(output_folder, get_environment_fname())
+    if not osp.isfile(fpath):
+        log.debug('Writing environment-file: %s', fpath)
+        with open(fpath, 'w') as f:
+            f.write(_freeze())
+    return fpath
@@ -17,9 +17,11 @@ from lmfit import Parameters, Parameter
 from schema import Schema, Use, And, Or, Optional, SchemaError
 from sklearn.tree import DecisionTreeClassifier
 from pprint import pformat
+from cachetools import cached
 import co2mpas.dispatcher.utils as dsp_utl
 import co2mpas.utils as co2_utl
 from .validations import hard_validation
+from .sweep import parse_sweep_value, Uniform, Sweep, SimulationPlan, SETTINGS
 from co2mpas.model.physical.gear_box.at_gear import CMV, MVL, GSPV
 from co2mpas.model.physical.electrics import Alternator_status_model
 
@@ -29,6 +31,10 @@ log = logging.getLogger(__name__)
 def validate_data(data, soft_validation, read_schema=None):
     plan = validate_plan(data.get('plan', pd.DataFrame([])), read_schema)
 
+    if 'sweep' in data:
+        sweeps = validate_sweeps(data['sweep'], read_schema)
+        plan = SimulationPlan(plan, sweeps) if sweeps else plan
+
     inputs = validate_inputs(data.get('base', {}), soft_validation, read_schema)
     inputs = {'.'.join(k): v
               for k, v in co2_utl.stack_nested_keys(inputs, depth=3)}
@@ -91,6 +97,140 @@ def validate_plan(plan, read_schema=None):
     return validated_plan
 
 
+def _validate_levels(validate, keys, levels, errors):
+    k, res = None, []
+    for v in levels:
+        d = {}
+        _add_validated_input(d, validate, keys, v, errors)
+        if not d:
+            return None, None
+        k, v = d.popitem()
+        res.append(v)
+    return k, res
+
+
+def _sweep_settings(data):
+    kw = {k: data.pop(k) for k in SETTINGS if k in data}
+    kw['sampling'] = str(kw.get('sampling', 'grid')).lower()
+    for k in ('samples', 'seed'):
+        if k in kw:
+            kw[k] = int(kw[k])
+    return kw
+
+
+def validate_sweeps(sweeps, read_schema=None):
+    validated_sweeps, errors, validate = [], {}, read_schema.validate
+    for i, data in sweeps.iterrows():
+        data = data.dropna()
+        sweep_id = 'sweep id:{}'.format(i[0])
+        params = []
+        try:
+            kw = _sweep_settings(data)
+        except ValueError as ex:
+            co2_utl.get_nested_dicts(errors, sweep_id)['settings'] = ex
+            continue
+        for k, v in data.items():
+            k = (sweep_id,) + tuple(k.split('.'))
+            try:
+                levels = parse_sweep_value(v)
+            except ValueError as ex:
+                co2_utl.get_nested_dicts(errors, *k[:-1])[k[-1]] = ex
+                continue
+            key, res = _validate_levels(validate, k, levels, errors)
+            if key is not None:
+                res = Uniform(*res) if isinstance(levels, Uniform) else res
+                params.append((('.'.join(k[1:-1]), key), res))
+        try:
+            validated_sweeps.append(Sweep(i, params, **kw))
+        except ValueError as ex:
+            co2_utl.get_nested_dicts(errors, sweep_id)['settings'] = ex
+
+    if _log_errors_msg(errors):
+        return []
+
+    return validated_sweeps
+
+
+def _dict_key_priority(skey):
+    s = getattr(skey, '_schema', skey)
+    if isinstance(s, type):
+        return 2
+    elif hasattr(s, 'validate'):
+        return 1
+    return 0
+
+
+def _is_numeric_array(value):
+    if isinstance(value, list):
+        return bool(value)
+    elif isinstance(value, np.ndarray) and value.dtype.kind in 'biuf':
+        return bool(value.size) and not np.isnan(value).all()
+    return False
+
+
+class DataSchema(object):
+    """
+    Schema of the CO2MPAS data that validates dicts key by key.
+
+    Each data key is matched just once against the schema keys and the
+    resulting value validator is indexed by the exact data key. Numeric arrays
+    of known parameters are coerced directly with :func:`numpy.asarray`.
+
+    When the validation fails, the error is raised by the underlying
+    :class:`schema.Schema`, thus the error messages are unchanged.
+    """
+
+    def __init__(self, schema, arrays=None):
+        self.schema, self._schema = Schema(schema), schema
+        self._skeys = sorted(schema, key=_dict_key_priority)
+        self._arrays = arrays or {}
+        self._index = {}
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.schema)
+
+    def _match_key(self, key):
+        try:
+            return self._index[key]
+        except KeyError:
+            pass
+
+        for skey in self._skeys:
+            try:
+                nkey = Schema(skey).validate(key)
+            except SchemaError:
+                continue
+            res = self._index[key] = nkey, Schema(self._schema[skey])
+            return res
+
+        self._index[key] = None
+
+    def _validate_value(self, key, value, schema):
+        dtype = self._arrays.get(key, None)
+        if dtype is not None and _is_numeric_array(value):
+            try:
+                return np.asarray(value, dtype=dtype)
+            except (ValueError, TypeError):
+                pass
+        return schema.validate(value)
+
+    def validate(self, data):
+        if not isinstance(data, dict):
+            return self.schema.validate(data)
+
+        res = {}
+        for k, v in data.items():
+            try:
+                nkey, schema = self._match_key(k)
+            except TypeError:  # Key not matched or unhashable.
+                return self.schema.validate(data)
+            try:
+                res[nkey] = self._validate_value(nkey, v, schema)
+            except SchemaError:
+                return self.schema.validate({k: v})  # Raises the schema error.
+        return res
+
+
 class Empty(object):
     def __repr__(self):
         return '%s' % self.__class__.__name__
@@ -301,6 +441,7 @@ def _tyre_dimensions(error=None, **kwargs):
     return And(_dict(format=dict), Use(_format_tyre_dimensions), error=error)
 
 
+@cached({})
 def define_data_schema(read=True):
     cmv = _cmv(read=read)
     dtc = _dtc(read=read)
@@ -527,6 +668,13 @@ def define_data_schema(read=True):
         'wheel_torques': np_array,
     }
 
+    arrays = {}
+    if read:
+        for dtype, s in ((float, np_array), (bool, np_array_bool),
+                         (int, np_array_int)):
+            arrays.update({k: dtype for k, v in schema.items()
+                           if v is s and isinstance(k, str)})
+
     schema = {Optional(k): Or(Empty(), v) for k, v in schema.items()}
     schema[Optional(str)] = Or(_type(type=float, read=read), np_array)
 
@@ -537,4 +685,4 @@ def define_data_schema(read=True):
 
         schema = {k: And(v, Or(f, Use(str))) for k, v in schema.items()}
 
-    return Schema(schema)
+    return DataSchema(schema, arrays=arrays)
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It contains functions and classes to define parameter sweeps.
+
+A sweep is a compact definition of simulation plan variations of a base
+vehicle. Each row of the `plan.sw` sheets defines a sweep, where the parameter
+cells contain the sweep values:
+
+    - `range(start, stop, step)`: levels from :func:`numpy.arange`,
+    - `linspace(start, stop, num)`: levels from :func:`numpy.linspace`,
+    - `[v1, v2, ...]`: explicit levels,
+    - `uniform(low, high)`: continuous range (`lhs` sampling only),
+    - any other value: one level.
+
+The optional columns `sampling` (`grid` or `lhs`), `samples`, and `seed` define
+how the levels are combined, i.e., full-factorial grid or Latin-hypercube
+samples. The variations are generated lazily.
+"""
+
+import ast
+import collections
+import itertools
+import regex
+import numpy as np
+
+__all__ = ['parse_sweep_value', 'Uniform', 'Sweep', 'SimulationPlan']
+
+#: Sweep settings columns.
+SETTINGS = ('sampling', 'samples', 'seed')
+
+_re_sweep = regex.compile(
+    r'^\s*(?P<func>range|linspace|uniform)\s*\((?P<args>.*)\)\s*$',
+    regex.IGNORECASE | regex.DOTALL
+)
+
+#: Continuous range of a Latin-hypercube sweep.
+Uniform = collections.namedtuple('Uniform', ('low', 'high'))
+
+
+def _literal(value):
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+def parse_sweep_value(value):
+    """
+    Parses a sweep value.
+
+    :param value:
+        Sweep value (e.g., `'linspace(100, 150, 11)'` or `'[1, 2]'`).
+    :type value: str | float
+
+    :return:
+        Sweep levels or continuous range.
+    :rtype: list | Uniform
+
+    Example::
+
+        >>> parse_sweep_value('range(1, 2, .5)')
+        [1.0, 1.5]
+        >>> parse_sweep_value('linspace(0, 1, 3)')
+        [0.0, 0.5, 1.0]
+        >>> parse_sweep_value('uniform(0, 1)')
+        Uniform(low=0, high=1)
+        >>> parse_sweep_value('[1, 2]'), parse_sweep_value(3.0)
+        ([1, 2], [3.0])
+    """
+    if not isinstance(value, str):
+        return [value]
+
+    match = _re_sweep.match(value)
+    if match:
+        func, args = match.group('func').lower(), _literal(match.group('args'))
+        args = args if isinstance(args, tuple) else (args,)
+        try:
+            if func == 'range':
+                return np.arange(*args).tolist()
+            elif func == 'linspace':
+                return np.linspace(args[0], args[1], int(args[2])).tolist()
+            return Uniform(*args)
+        except (TypeError, IndexError):
+            raise ValueError('Invalid sweep value: %r' % value)
+
+    value = _literal(value)
+    if not isinstance(value, (list, tuple)):
+        return [value]
+    elif not value:
+        raise ValueError('Empty sweep levels.')
+    return list(value)
+
+
+class Sweep(object):
+    """
+    Lazy generator of the simulation plan variations of a sweep.
+
+    :param index:
+        Sweep index (i.e., id, base, and defaults).
+    :type index: tuple
+
+    :param params:
+        Sweep parameters as (data, parameter) keys and levels (or range).
+    :type params: list[((str, str), list | Uniform)]
+
+    :param sampling:
+        Sampling method (`grid` or `lhs`).
+    :type sampling: str, optional
+
+    :param samples:
+        Number of Latin-hypercube samples.
+    :type samples: int, optional
+
+    :param seed:
+        Seed of the Latin-hypercube samples.
+    :type seed: int, optional
+
+    Example::
+
+        >>> sweep = Sweep((1, 'base.xlsx', ''), [
+        ...     (('input.prediction.nedc_h', 'f0'), [100.0, 110.0]),
+        ...     (('input.prediction.nedc_h', 'f1'), [0.1, 0.2, 0.3])])
+        >>> len(sweep)
+        6
+        >>> index, inputs = next(iter(sweep))
+        >>> index, inputs['input.prediction.nedc_h']
+        (('1.1', 'base.xlsx', ''), {'f0': 100.0, 'f1': 0.1})
+    """
+
+    def __init__(self, index, params, sampling='grid', samples=None,
+                 seed=None):
+        self.index, self.params = index, params
+        self.sampling, self.samples, self.seed = sampling, samples, seed
+        if sampling == 'grid':
+            if any(isinstance(v, Uniform) for k, v in params):
+                raise ValueError('Continuous ranges require `lhs` sampling.')
+        elif sampling == 'lhs':
+            if not samples or samples < 1:
+                raise ValueError('`lhs` sampling requires `samples`.')
+        else:
+            raise ValueError('Invalid sampling: %r' % sampling)
+
+    def __len__(self):
+        if self.sampling == 'lhs':
+            return int(self.samples)
+        n = 1
+        for k, v in self.params:
+            n *= len(v)
+        return n
+
+    def _lhs(self):
+        n, rnd = int(self.samples), np.random.RandomState(self.seed)
+        columns = []
+        for k, v in self.params:
+            # One sample per stratum of each parameter.
+            u = (rnd.permutation(n) + rnd.rand(n)) / n
+            if isinstance(v, Uniform):
+                columns.append((v.low + u * (v.high - v.low)).tolist())
+            else:
+                columns.append([v[i] for i in (u * len(v)).astype(int)])
+        return zip(*columns)
+
+    def __iter__(self):
+        if self.sampling == 'lhs':
+            values = self._lhs()
+        else:
+            values = itertools.product(*(v for k, v in self.params))
+
+        (i, base, defaults), keys = self.index, [k for k, v in self.params]
+        for j, value in enumerate(values, 1):
+            inputs = {}
+            for (n, k), v in zip(keys, value):
+                inputs.setdefault(n, {})[k] = v
+            yield ('%s.%d' % (i, j), base, defaults), inputs
+
+
+class SimulationPlan(object):
+    """
+    Simulation plan of explicit variations and sweeps.
+
+    The sweep variations are generated lazily, while iterating the plan.
+
+    :param rows:
+        Explicit variations as index and inputs.
+    :type rows: list[(tuple, dict)]
+
+    :param sweeps:
+        Sweeps of the plan.
+    :type sweeps: list[Sweep]
+    """
+
+    def __init__(self, rows=(), sweeps=()):
+        self.rows, self.sweeps = list(rows), list(sweeps)
+
+    def __len__(self):
+        return len(self.rows) + sum(len(s) for s in self.sweeps)
+
+    def __bool__(self):
+        return bool(self.rows) or any(len(s) for s in self.sweeps)
+
+    def __iter__(self):
+        return itertools.chain(self.rows, *self.sweeps)
@@ -125,7 +125,8 @@ def model():
     dsp = Dispatcher(
         name='CO2MPAS model',
         description='Calibrates the models with WLTP data and predicts NEDC '
-                    'cycle.'
+                    'cycle.',
+        compact=True  # Inherited by the sub-models when dispatched.
     )
 
     ############################################################################
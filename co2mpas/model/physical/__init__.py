@@ -25,6 +25,7 @@ Modules:
     electrics
     engine
     defaults
+    stacked
 """
 
 from co2mpas.dispatcher import Dispatcher
@@ -202,7 +203,8 @@ def physical():
     dsp = Dispatcher(
         name='CO2MPAS physical model',
         description='Wraps all functions needed to calibrate and predict '
-                    'light-vehicles\' CO2 emissions.'
+                    'light-vehicles\' CO2 emissions.',
+        compact=True  # Inherited by the sub-models when dispatched.
     )
 
     from .cycle import cycle
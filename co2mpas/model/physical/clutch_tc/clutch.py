@@ -9,12 +9,12 @@
 It contains functions that model the basic mechanics of the clutch.
 """
 
-from scipy.optimize import brute
 from sklearn.metrics import mean_squared_error
 from sklearn.linear_model import RANSACRegressor, LinearRegression
 from functools import partial
 from ..defaults import dfl
 import co2mpas.dispatcher.utils as dsp_utl
+import co2mpas.utils as co2_utl
 from co2mpas.dispatcher import Dispatcher
 from . import define_k_factor_curve
 import numpy as np
@@ -139,29 +139,32 @@ def identify_clutch_window(
     :rtype: tuple
     """
 
-    model = RANSACRegressor(
-        base_estimator=LinearRegression(fit_intercept=False),
-        random_state=0
-    )
-
     phs = partial(calculate_clutch_phases, times, gear_shifts)
 
     delta = engine_speeds_out - engine_speeds_out_hot - cold_start_speeds_delta
     threshold = np.std(delta) * 2
+    outliers = (-threshold > delta) | (delta > threshold)
 
     def error(v):
-        clutch_phases = phs(v) & ((-threshold > delta) | (delta > threshold))
+        clutch_phases = phs(v) & outliers
         y = delta[clutch_phases]
+        model = RANSACRegressor(
+            base_estimator=LinearRegression(fit_intercept=False),
+            random_state=0
+        )
         # noinspection PyBroadException
         try:
             X = np.array([accelerations[clutch_phases]]).T
-            return -model.fit(X, y).score(X, y)
+            return -model.fit(X, y).score(X, y), tuple(v)
         except:
-            return np.inf
+            return np.inf, tuple(v)
 
     dt = max_clutch_window_width / 2
-    Ns = int(dt / max(times[1] - times[0], 0.5)) + 1
-    return tuple(brute(error, ((0, -dt), (0, dt)), Ns=Ns, finish=None))
+    Ns = complex(int(dt / max(times[1] - times[0], 0.5)) + 1)
+    # Same grid of `scipy.optimize.brute`.
+    grid = np.mgrid[0:-dt:Ns, 0:dt:Ns].reshape(2, -1).T
+
+    return co2_utl.calibrate_multi_start(error, grid, tol=-1)[-1]
 
 
 def _calibrate_clutch_prediction_model(
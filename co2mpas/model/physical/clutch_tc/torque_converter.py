@@ -14,6 +14,7 @@ from sklearn.ensemble import GradientBoostingRegressor
 from . import define_k_factor_curve
 from ..defaults import dfl
 from co2mpas.dispatcher import Dispatcher
+import co2mpas.utils as co2_utl
 import numpy as np
 
 
@@ -79,11 +80,12 @@ class TorqueConverter(object):
         X = np.array([accelerations, velocities, gear_box_speeds_in, gears]).T
         y = torque_converter_speeds_delta
 
-        models = enumerate(models)
         a = lock_up_tc_limits, X
-        m = min([(mean_absolute_error(y, m(*a)), i, m) for i, m in models])[-1]
 
-        self.predict = m
+        def _calibrate(m):
+            return mean_absolute_error(y, m(*a)), m
+
+        self.predict = co2_utl.calibrate_multi_start(_calibrate, models)[-1]
 
         return self
 
@@ -14,6 +14,7 @@ from scipy.interpolate import interp1d
 import co2mpas.dispatcher.utils as dsp_utl
 from co2mpas.dispatcher import Dispatcher
 from ..defaults import dfl
+from . import cached_profile
 import numpy as np
 
 
@@ -55,6 +56,7 @@ def nedc_velocities_domain(cycle_type, *args):
     return cycle_type == 'NEDC'
 
 
+@cached_profile
 def nedc_velocities(times, gear_box_type):
     """
     Returns the velocity profile according to NEDC and gear box type [km/h].
@@ -123,6 +125,7 @@ def nedc_velocities(times, gear_box_type):
     return v
 
 
+@cached_profile
 def nedc_gears(times, max_gear, k1=1, k2=2, k5=2):
     """
     Returns the gear shifting profile according to NEDC [-].
@@ -17,10 +17,17 @@ from co2mpas.dispatcher import Dispatcher
 import co2mpas.dispatcher.utils as dsp_utl
 import logging
 from ..defaults import dfl
+from . import cached_profile
 from copy import deepcopy
 import numpy as np
 logging.getLogger('wltp.experiment').setLevel(logging.WARNING)
 
+#: Base model params used by `run_cycle`.
+_RUN_CYCLE_PARAMS = (
+    'f_n_max', 'f_n_min', 'f_n_min_gear2', 'f_n_clutch_gear2',
+    'f_safety_margin', 'v_stopped_threshold'
+)
+
 
 def wltp_time_length(frequency):
     """
@@ -208,6 +215,7 @@ def get_downscale_phases(class_data):
     return class_data['downscale']['phases']
 
 
+@cached_profile
 def wltp_velocities(
         downscale_factor, class_velocities, downscale_phases, times):
     """
@@ -294,16 +302,31 @@ def wltp_gears(
     :rtype: numpy.array
     """
 
-    n_min_drive = None
     svr = [v for k, v in sorted(speed_velocity_ratios.items()) if k]
 
     n_norm = np.arange(0.0, 1.21, 0.01)
     load_curve = {'n_norm': n_norm, 'p_norm': full_load_curve(n_norm)}
 
+    # The result is memoised on the values of the full load curve and of the
+    # base model params used by `run_cycle`.
+    params = {k: wltp_base_model[k] for k in _RUN_CYCLE_PARAMS
+              if k in wltp_base_model}
+    return _wltp_gears(
+        load_curve, velocities, accelerations, motive_powers, svr,
+        idle_engine_speed[0], engine_max_speed_at_max_power, engine_max_power,
+        params, initial_gears)
+
+
+@cached_profile
+def _wltp_gears(
+        load_curve, velocities, accelerations, motive_powers, svr,
+        idle_engine_speed, engine_max_speed_at_max_power, engine_max_power,
+        params, initial_gears):
+    n_min_drive = None
     res = run_cycle(
-        velocities, accelerations, motive_powers, svr, idle_engine_speed[0],
+        velocities, accelerations, motive_powers, svr, idle_engine_speed,
         n_min_drive, engine_max_speed_at_max_power, engine_max_power,
-        load_curve, wltp_base_model)
+        load_curve, params)
 
     if initial_gears:
         gears = initial_gears.copy()
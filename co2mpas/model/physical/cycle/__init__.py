@@ -22,9 +22,68 @@ Sub-Modules:
 
 """
 
+import functools
+from collections import OrderedDict
 from co2mpas.dispatcher import Dispatcher
 import co2mpas.dispatcher.utils as dsp_utl
 import numpy as np
+from co2mpas.telemetry import count_cache
+from ..defaults import dfl
+
+#: Cache of the theoretical cycle profiles.
+_profiles = OrderedDict()
+
+
+def _profile_key(value):
+    if isinstance(value, np.ndarray):
+        return value.dtype.str, value.shape, value.tobytes()
+    elif isinstance(value, (list, tuple)):
+        return tuple(map(_profile_key, value))
+    elif isinstance(value, dict):
+        return dict, tuple((k, _profile_key(v)) for k, v in sorted(
+            value.items()))
+    hash(value)  # Raises a TypeError for unhashable values.
+    return value
+
+
+def cached_profile(func):
+    """
+    Decorates a function that returns a theoretical cycle profile to memoise it.
+
+    The profile has to depend only on the function arguments (e.g., cycle
+    times, gear box type, class velocities). Arrays are keyed by their bytes
+    and dicts by their items. The last
+    `dfl.functions.cached_profile.CACHE_SIZE` profiles are cached in-process
+    and a copy is returned.
+
+    :param func:
+        Function that returns a profile [numpy.array].
+    :type func: function
+
+    :return:
+        Memoised function.
+    :rtype: function
+    """
+
+    @functools.wraps(func)
+    def _func(*args, **kwargs):
+        try:
+            key = func, _profile_key(args), _profile_key(sorted(kwargs.items()))
+        except TypeError:  # Not cacheable.
+            return func(*args, **kwargs)
+
+        try:
+            _profiles.move_to_end(key)
+            profile = _profiles[key]
+            count_cache('cycle_profiles', True)
+        except KeyError:
+            count_cache('cycle_profiles', False)
+            profile = _profiles[key] = func(*args, **kwargs)
+            while len(_profiles) > dfl.functions.cached_profile.CACHE_SIZE:
+                _profiles.popitem(last=False)
+        return profile.copy()
+
+    return _func
 
 
 def is_nedc(kwargs):
@@ -237,6 +237,31 @@ class Functions(co2_utl.Constants):
     class identify_charging_statuses(co2_utl.Constants):
         time_window = 4
 
+    class define_co2_params_cache_key(co2_utl.Constants):
+        #: Engine capacity resolution of the CO2 params cache keys [cm3].
+        CAPACITY_STEP = 100
+
+    class calibrate_co2_params(co2_utl.Constants):
+        #: File of the calibrated CO2 params cache, used to warm-start the
+        #: calibration of the same engine family (disabled if empty) [-].
+        CACHE_FPATH = ''
+
+    class calibrate_model_params(co2_utl.Constants):
+        #: Solvers to calibrate from a warm start (the last is the fallback).
+        #: The lbfgsb is faster than nelder, but less stable [-].
+        WARM_METHODS = ('lbfgsb', 'nelder')
+
+        #: Solvers to calibrate from the default initial guess [-].
+        COLD_METHODS = ('nelder',)
+
+        #: Minimum success ratio of a solver, in the calibrated CO2 params
+        #: cache, to be tried before the fallback [-].
+        MIN_SUCCESS_RATIO = 0.5
+
+        #: Number of attempts of a solver before checking its success ratio
+        #: [-].
+        MIN_ATTEMPTS = 10
+
     class restrict_bounds(co2_utl.Constants):
         #: Multipliers applied into the `restrict_bounds` function.
         CO2_PARAMS_LIMIT_MULTIPLIERS = {
@@ -257,6 +282,10 @@ class Functions(co2_utl.Constants):
         #: WLTP cycle time [s].
         TIME = 1800.0
 
+    class cached_profile(co2_utl.Constants):
+        #: Maximum number of theoretical cycle profiles cached in-process [-].
+        CACHE_SIZE = 64
+
     class default_clutch_k_factor_curve(co2_utl.Constants):
         #: Torque ratio when speed ratio==0 for clutch model.
         STAND_STILL_TORQUE_RATIO = 1.0
@@ -411,6 +440,19 @@ class Functions(co2_utl.Constants):
         #: Maximum cold start speed delta percentage of idle [-].
         MAX_COLD_START_SPEED_DELTA_PERCENTAGE = 1.0
 
+    class make_simulation_plan(co2_utl.Constants):
+        #: Number of plan variations saved in each summary file (if the plan
+        #: is larger), to keep the plan summary out of memory [-].
+        CHUNK_SIZE = 1000
+
+    class flush_metrics(co2_utl.Constants):
+        #: Minimum time between two exports of the run metrics [s].
+        INTERVAL = 5.0
+
+    class calculate_performance(co2_utl.Constants):
+        #: Number of the slowest model nodes reported in the performance [-].
+        TOP_NODES = 10
+
     class _yield_on_start(co2_utl.Constants):
         #: Minimum velocity that allow to switch off stop the engine after an
         #: off [km/h].
@@ -143,6 +143,14 @@ def identify_charging_statuses(
     b1 = -1
 
     n = len(on_engine) - 1
+    index = np.arange(n + 1)
+
+    # Next sample where the alternator is off and the engine is on.
+    nxt = np.where((status == 0) & ~off, index, n)
+    nxt = np.minimum.accumulate(nxt[::-1])[::-1]
+
+    # Last sample with positive power or engine off (i.e., end of the rollback).
+    prv = np.maximum.accumulate(np.where((gb_p <= 0) & ~off, -1, index))
 
     def _rollback(i):
         i -= 1
@@ -152,16 +160,14 @@ def identify_charging_statuses(
             i -= 1
         return i
 
-    for b0, (s, p) in enumerate(zip(status, gb_p)):
-        if s == 2 and p >= 0 and b0 >= b1:
-            b1 = b0
-
-            while b1 < n and (status[b1] or off[b1]):
-                b1 += 1
+    # The samples after the last labelled one keep the initial status, hence
+    # the forward and backward scans of the end are precomputed.
+    for b0 in np.where((status == 2) & (gb_p >= 0))[0]:
+        if status[b0] == 2 and b0 >= b1:
+            b1 = nxt[b0]
 
             if b1 != n:
-                while b1 > b0 and gb_p[b1] <= 0 and not off[b1]:
-                    b1 -= 1
+                b1 = max(b0, prv[b1])
 
             if b1 > b0:
                 while b0 > 1 and status[b0 - 1] == 2:
@@ -23,6 +23,7 @@ Sub-Modules:
 from math import pi
 from .thermal import *
 from ..defaults import *
+from ..stacked import elementwise
 import numpy as np
 from scipy.interpolate import InterpolatedUnivariateSpline as Spline
 import co2mpas.dispatcher.utils as dsp_utl
@@ -248,6 +249,7 @@ def identify_upper_bound_engine_speed(
     return m + sd * 0.674490
 
 
+@elementwise
 def calculate_engine_max_torque(
         engine_max_power, engine_max_speed_at_max_power, ignition_type):
     """
@@ -275,6 +277,7 @@ def calculate_engine_max_torque(
     return engine_max_power / engine_max_speed_at_max_power * 30000.0 / pi * c
 
 
+@elementwise
 def calculate_engine_max_power(
         engine_max_torque, engine_max_speed_at_max_power, ignition_type):
     """
@@ -575,6 +578,7 @@ def calculate_braking_powers(
     return bp
 
 
+@elementwise
 def calculate_friction_powers(
         engine_speeds_out, piston_speeds, engine_loss_parameters,
         engine_capacity):
@@ -609,6 +613,7 @@ def calculate_friction_powers(
     return (loss2 * piston_speeds ** 2 + loss) * es * (cap / 1200000.0)
 
 
+@elementwise
 def calculate_mean_piston_speeds(engine_speeds_out, engine_stroke):
     """
     Calculates mean piston speed [m/sec].
@@ -656,6 +661,7 @@ def calculate_engine_type(ignition_type, engine_is_turbo):
     return engine_type
 
 
+@elementwise
 def calculate_engine_moment_inertia(engine_capacity, ignition_type):
     """
     Calculates engine moment of inertia [kg*m2].
@@ -678,6 +684,7 @@ def calculate_engine_moment_inertia(engine_capacity, ignition_type):
     return (0.05 + 0.1 * engine_capacity / 1000.0) * w
 
 
+@elementwise
 def calculate_auxiliaries_torque_losses(times, auxiliaries_torque_loss):
     """
     Calculates engine torque losses due to engine auxiliaries [N*m].
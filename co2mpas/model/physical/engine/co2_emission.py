@@ -10,6 +10,11 @@ It contains functions to predict the CO2 emissions.
 """
 
 import copy
+import json
+import logging
+import os
+import os.path as osp
+import threading
 from functools import partial
 from itertools import chain
 
@@ -22,8 +27,11 @@ from sklearn.metrics import mean_absolute_error
 import co2mpas.dispatcher.utils as dsp_utl
 from co2mpas.dispatcher import Dispatcher
 import co2mpas.utils as co2_utl
+from co2mpas.telemetry import metrics
 from ..defaults import dfl, EPS
 
+log = logging.getLogger(__name__)
+
 
 def default_fuel_density(fuel_type):
     """
@@ -476,6 +484,37 @@ def select_phases_integration_times(cycle_type):
     return tuple(dsp_utl.pairwise(i_times[cycle_type.upper()]))
 
 
+def _phases_integration(times, phases_integration_times):
+    # Sample indices, trapezoid weights, and starts of the cycle phases.
+    dt = np.diff(times) / 2
+    index, weights, starts, empty = [], [], [], []
+    for p in phases_integration_times:
+        i, j = np.searchsorted(times, p)
+        starts.append(len(index))
+        empty.append(j - i < 2)
+        if empty[-1]:  # Null integral.
+            index.append(0)
+            weights.append(0.0)
+        else:
+            w = np.zeros(j - i)
+            w[:-1] += dt[i:j - 1]
+            w[1:] += dt[i:j - 1]
+            index.extend(range(i, j))
+            weights.extend(w)
+    index, starts = np.array(index, dtype=int), np.array(starts, dtype=int)
+    return index, np.array(weights), starts, np.array(empty, dtype=bool)
+
+
+def _integrate_phases(values, integration):
+    # Trapezoidal integrals of the cycle phases as a single weighted reduction.
+    index, weights, starts, empty = integration
+    if not len(starts) or not len(values):
+        return np.zeros(len(starts))
+    res = np.add.reduceat(values[index] * weights, starts)
+    res[empty] = 0.0
+    return res
+
+
 def calculate_phases_distances(times, phases_integration_times, velocities):
     """
     Calculates cycle phases distances [km].
@@ -532,13 +571,10 @@ def calculate_cumulative_co2(
     :rtype: numpy.array
     """
 
-    co2 = []
-
-    for p in phases_integration_times:
-        i, j = np.searchsorted(times, p)
-        co2.append(trapz(co2_emissions[i:j], times[i:j]))
+    integration = _phases_integration(times, phases_integration_times)
+    co2 = _integrate_phases(co2_emissions, integration)
 
-    return np.array(co2) / phases_distances
+    return co2 / phases_distances
 
 
 def calculate_cumulative_co2_v1(phases_co2_emissions, phases_distances):
@@ -603,16 +639,13 @@ def calculate_extended_integration_times(
     """
 
     lv, pit = velocities <= stop_velocity, phases_integration_times
-    pit = set(chain(*pit))
-    hv = np.logical_not(lv)
-    j, l, phases = np.argmax(hv), len(lv), []
-    while j < l:
-        i = np.argmax(lv[j:]) + j
-        j = np.argmax(hv[i:]) + i
-
-        if i == j:
-            break
-
+    pit, phases = set(chain(*pit)), []
+    # Stops between two moving windows, i.e., from (hv -> lv) to (lv -> hv).
+    starts = np.where(lv[1:] & ~lv[:-1])[0] + 1
+    ends = np.where(~lv[1:] & lv[:-1])[0] + 1
+    if len(starts):
+        ends = ends[ends > starts[0]]
+    for i, j in zip(starts, ends):
         t0, t1 = times[i], times[j]
         if t1 - t0 < 20 or any(t0 <= x <= t1 for x in pit):
             continue
@@ -676,6 +709,8 @@ def calculate_extended_cumulative_co2_emissions(
 
     r = co2_normalization_references.copy()
     r[np.logical_not(on_engine)] = 0
+    # Cumulative integral: trapz(r[i:k], times[i:k]) == ci[k - 1] - ci[i].
+    ci = np.append(0, np.cumsum(np.diff(times) * (r[1:] + r[:-1]) / 2))
     _cco2, phases = [], []
     cco2 = phases_co2_emissions * phases_distances
 
@@ -683,7 +718,7 @@ def calculate_extended_cumulative_co2_emissions(
         i, j = np.searchsorted(times, (t0, t1))
         if i == j:
             continue
-        v = trapz(r[i:j], times[i:j])
+        v = ci[j - 1] - ci[i]
         c = [0.0]
 
         p = [t for t in extended_integration_times if t0 < t < t1]
@@ -691,7 +726,7 @@ def calculate_extended_cumulative_co2_emissions(
         for k, t in zip(np.searchsorted(times, p), p):
             phases.append((t0, t))
             t0 = t
-            c.append(trapz(r[i:k], times[i:k]) / v)
+            c.append((ci[max(k - 1, i)] - ci[i]) / v)
         phases.append((t0, t1))
         c.append(1.0)
 
@@ -820,12 +855,16 @@ def define_co2_error_function_on_phases(
     :rtype: function
     """
 
-    def error_func(params, phases=None):
+    # Built once per cycle, since the function is called at each iteration.
+    integration = _phases_integration(times, phases_integration_times)
+    masks = {}
 
-        if phases:
-            co2 = np.zeros_like(times, dtype=float)
-            b = np.zeros_like(times, dtype=bool)
-            w = []
+    def _phases_mask(phases):
+        key = tuple(sorted(phases))
+        try:
+            return masks[key]
+        except KeyError:
+            b, w = np.zeros_like(times, dtype=bool), []
             for i, p in enumerate(phases_integration_times):
                 if i in phases:
                     m, n = np.searchsorted(times, p)
@@ -833,14 +872,20 @@ def define_co2_error_function_on_phases(
                     w.append(phases_co2_emissions[i])
                 else:
                     w.append(0)
+            masks[key] = b, w
+            return b, w
+
+    def error_func(params, phases=None):
 
+        if phases:
+            b, w = _phases_mask(phases)
+            co2 = np.zeros_like(times, dtype=float)
             co2[b] = co2_emissions_model(params, sub_values=b)
         else:
             co2 = co2_emissions_model(params)
             w = None  # cumulative_co2_emissions
 
-        cco2 = calculate_cumulative_co2(
-            times, phases_integration_times, co2, phases_distances)
+        cco2 = _integrate_phases(co2, integration) / phases_distances
         return mean_absolute_error(phases_co2_emissions, cco2, w)
 
     return error_func
@@ -1076,9 +1121,172 @@ def _set_attr(params, data, default=False, attr='vary'):
     return params
 
 
+def define_co2_params_cache_key(engine_type, fuel_type, engine_capacity):
+    """
+    Defines the key of the calibrated CO2 params cache (i.e., the engine
+    family).
+
+    :param engine_type:
+        Engine type (positive turbo, positive natural aspiration, compression).
+    :type engine_type: str
+
+    :param fuel_type:
+        Fuel type (diesel, gasoline, LPG, NG, ethanol, biodiesel).
+    :type fuel_type: str
+
+    :param engine_capacity:
+        Engine capacity [cm3].
+    :type engine_capacity: float
+
+    :return:
+        Key of the calibrated CO2 params cache.
+    :rtype: str
+    """
+    step = dfl.functions.define_co2_params_cache_key.CAPACITY_STEP
+    capacity = int(round(engine_capacity / step) * step)
+    return '%s|%s|%d' % (engine_type, fuel_type, capacity)
+
+
+#: Calibrated CO2 params caches loaded in-process (file path --> entries).
+_co2_params_caches = {}
+_co2_params_cache_lock = threading.Lock()
+
+#: Cache entry of the solvers statistics (the params keys contain a `|`).
+_SOLVERS_STATS = 'solvers_stats'
+
+
+def _load_co2_params_cache(fpath):
+    try:
+        return _co2_params_caches[fpath]
+    except KeyError:
+        try:
+            with open(fpath) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):  # Missing or corrupted file.
+            cache = {}
+        return _co2_params_caches.setdefault(fpath, cache)
+
+
+def get_cached_co2_params(fpath, key):
+    """
+    Returns the cached CO2 params of an engine family.
+
+    :param fpath:
+        File path of the calibrated CO2 params cache.
+    :type fpath: str
+
+    :param key:
+        Key of the calibrated CO2 params cache.
+    :type key: str
+
+    :return:
+        Cached CO2 params and number of error evaluations of their calibration
+        from the default initial guess (or None if not cached).
+    :rtype: dict
+    """
+    with _co2_params_cache_lock:
+        entry = _load_co2_params_cache(fpath).get(key)
+        return copy.deepcopy(entry)
+
+
+def get_solvers_stats(fpath):
+    """
+    Returns a copy of the solvers statistics of the calibrated CO2 params cache.
+
+    The statistics are scoped to the cache file and they are stored with the
+    cached params (see :func:`cache_co2_params`).
+
+    :param fpath:
+        File path of the calibrated CO2 params cache.
+    :type fpath: str
+
+    :return:
+        Solvers statistics (method --> [successes, attempts]).
+    :rtype: dict
+    """
+    with _co2_params_cache_lock:
+        stats = _load_co2_params_cache(fpath).get(_SOLVERS_STATS, {})
+        return copy.deepcopy(stats)
+
+
+def update_solvers_stats(fpath, solvers_stats, reference=None):
+    """
+    Adds the solvers statistics of a calibration to the calibrated CO2 params
+    cache.
+
+    The statistics are updated in-process and they are stored with the next
+    cached params (see :func:`cache_co2_params`).
+
+    :param fpath:
+        File path of the calibrated CO2 params cache.
+    :type fpath: str
+
+    :param solvers_stats:
+        Solvers statistics (method --> [successes, attempts]).
+    :type solvers_stats: dict
+
+    :param reference:
+        Solvers statistics to be subtracted (e.g., the copy returned by
+        :func:`get_solvers_stats` before the calibration).
+    :type reference: dict, optional
+    """
+    reference = reference or {}
+    with _co2_params_cache_lock:
+        cache = _load_co2_params_cache(fpath)
+        stats = cache.setdefault(_SOLVERS_STATS, {})
+        for method, (n, attempts) in solvers_stats.items():
+            ref = reference.get(method, (0, 0))
+            v = stats.setdefault(method, [0, 0])
+            v[0] += n - ref[0]
+            v[1] += attempts - ref[1]
+
+
+def cache_co2_params(fpath, key, params, nfev):
+    """
+    Stores the calibrated CO2 params of an engine family.
+
+    The file is replaced atomically, to be shared by concurrent processes.
+
+    :param fpath:
+        File path of the calibrated CO2 params cache.
+    :type fpath: str
+
+    :param key:
+        Key of the calibrated CO2 params cache.
+    :type key: str
+
+    :param params:
+        Calibrated CO2 params.
+    :type params: dict
+
+    :param nfev:
+        Number of error evaluations of the calibration from the default initial
+        guess (i.e., the reference to compute the evaluations saved).
+    :type nfev: int
+    """
+    with _co2_params_cache_lock:
+        cache = _load_co2_params_cache(fpath)
+        entry = cache.setdefault(key, {'params': {}, 'nfev': nfev})
+        entry['params'].update(params)
+
+        tmp = '%s.%d.tmp' % (fpath, os.getpid())
+        os.makedirs(osp.dirname(osp.abspath(fpath)), exist_ok=True)
+        with open(tmp, 'w') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(tmp, fpath)
+
+
+def _count_calls(func, counter):
+    def _func(*args, **kwargs):
+        counter[0] += 1
+        return func(*args, **kwargs)
+    return _func
+
+
 def calibrate_co2_params(
         engine_coolant_temperatures, co2_error_function_on_emissions,
-        co2_error_function_on_phases, co2_params_initial_guess, is_cycle_hot):
+        co2_error_function_on_phases, co2_params_initial_guess, is_cycle_hot,
+        co2_params_cache_key=None):
     """
     Calibrates the CO2 emission model parameters (a2, b2, a, b, c, l, l2, t, trg
     ).
@@ -1105,6 +1313,13 @@ def calibrate_co2_params(
         Is an hot cycle?
     :type is_cycle_hot: bool
 
+    :param co2_params_cache_key:
+        Key of the calibrated CO2 params cache. If the cache is enabled (see
+        `dfl.functions.calibrate_co2_params.CACHE_FPATH`), the calibration is
+        warm-started from the cached params of the same key, and the solvers
+        with a low success ratio in the cache are skipped.
+    :type co2_params_cache_key: str, optional
+
     :return:
         Calibrated CO2 emission model parameters (a2, b2, a, b, c, l, l2, t,
         trg) and their calibration statuses.
@@ -1113,6 +1328,26 @@ def calibrate_co2_params(
 
     p = copy.deepcopy(co2_params_initial_guess)
     vary = {k: v.vary for k, v in p.items()}
+
+    fpath = dfl.functions.calibrate_co2_params.CACHE_FPATH
+    key = co2_params_cache_key if fpath else None
+    cached = get_cached_co2_params(fpath, key) if key else None
+    stats = get_solvers_stats(fpath) if key else None
+    stats_ref = copy.deepcopy(stats)
+    if cached:  # Warm start.
+        _set_attr(p, {k: v for k, v in cached['params'].items()
+                      if vary.get(k)}, attr='value')
+    par = dfl.functions.calibrate_model_params
+    methods = par.WARM_METHODS if cached else par.COLD_METHODS
+
+    nfev = [0]
+    co2_error_function_on_emissions = _count_calls(
+        co2_error_function_on_emissions, nfev
+    )
+    co2_error_function_on_phases = _count_calls(
+        co2_error_function_on_phases, nfev
+    )
+
     values = {k: v._val for k, v in p.items()}
 
     cold = np.zeros_like(engine_coolant_temperatures, dtype=bool)
@@ -1125,7 +1360,10 @@ def calibrate_co2_params(
 
     def calibrate(id_p, p, **kws):
         _set_attr(p, id_p, default=False)
-        p, s = calibrate_model_params(co2_error_function_on_emissions, p, **kws)
+        p, s = calibrate_model_params(
+            co2_error_function_on_emissions, p, methods=methods,
+            solvers_stats=stats, **kws
+        )
         _set_attr(p, vary)
         success.append((s, copy.deepcopy(p)))
         return p
@@ -1146,10 +1384,30 @@ def calibrate_co2_params(
 
     p = restrict_bounds(p)
 
-    p, s = calibrate_model_params(co2_error_function_on_phases, p)
+    p, s = calibrate_model_params(
+        co2_error_function_on_phases, p, methods=methods, solvers_stats=stats
+    )
     success.append((s, copy.deepcopy(p)))
     _set_attr(p, vary)
 
+    start = 'warm' if cached else 'cold'
+    metrics.inc('co2mpas_calibration_evaluations_total', nfev[0], start=start)
+    if cached:
+        saved = cached['nfev'] - nfev[0]
+        metrics.inc('co2mpas_calibration_evaluations_saved_total',
+                    max(saved, 0))
+        metrics.inc('co2mpas_calibration_evaluations_extra_total',
+                    max(-saved, 0))
+        log.info('CO2 params warm-started from %r: %d error evaluations '
+                 'saved.', key, saved)
+
+    if key:
+        update_solvers_stats(fpath, stats, stats_ref)
+
+    if key and s and nfev[0]:
+        params = {k: v.value for k, v in p.items() if vary[k]}
+        cache_co2_params(fpath, key, params, nfev[0])
+
     return p, success
 
 
@@ -1186,7 +1444,21 @@ def restrict_bounds(co2_params):
     return p
 
 
-def calibrate_model_params(error_function, params, *args, **kws):
+def _select_methods(methods, solvers_stats=None):
+    if not solvers_stats:
+        return list(methods)
+    par = dfl.functions.calibrate_model_params
+    res = []
+    for m in methods[:-1]:  # The last one is the fallback.
+        n, attempts = solvers_stats.get(m, (0, 0))
+        if attempts < par.MIN_ATTEMPTS or \
+                n >= par.MIN_SUCCESS_RATIO * attempts:
+            res.append(m)
+    return res + list(methods[-1:])
+
+
+def calibrate_model_params(error_function, params, *args, methods=None,
+                           solvers_stats=None, **kws):
     """
     Calibrates the model params minimising the error_function.
 
@@ -1201,6 +1473,17 @@ def calibrate_model_params(error_function, params, *args, **kws):
         guess with in the bounds.
     :type params: dict, optional
 
+    :param methods:
+        Solvers to try in order, until one succeeds. If None,
+        `dfl.functions.calibrate_model_params.COLD_METHODS` is used.
+    :type methods: tuple[str], optional
+
+    :param solvers_stats:
+        Solvers statistics (method --> [successes, attempts]) to be updated. If
+        given, the solvers with a low success ratio are skipped, except the
+        last one (i.e., the fallback).
+    :type solvers_stats: dict, optional
+
     :return:
         Calibrated model params.
     :rtype: dict
@@ -1237,7 +1520,19 @@ def calibrate_model_params(error_function, params, *args, **kws):
     # slsqp is unstable (4 runs, 4 vehicles) [average time 18s/4 vehicles].
     # differential_evolution is unstable (1 runs, 4 vehicles)
     # [average time 270s/4 vehicles].
-    res = _minimize(error_func, params, args=args, kws=kws, method='nelder')
+    methods = methods or dfl.functions.calibrate_model_params.COLD_METHODS
+    for method in _select_methods(methods, solvers_stats):
+        res = _minimize(error_func, params, args=args, kws=kws, method=method)
+
+        if solvers_stats is not None:
+            stats = solvers_stats.setdefault(method, [0, 0])
+            stats[0] += bool(res.success)
+            stats[1] += 1
+
+        if res.success:
+            break
+        log.debug('Calibration with %r failed.', method)
+        params = min_e_and_p[1]  # Fallback from the best params.
 
     # noinspection PyUnresolvedReferences
     return (res.params if res.success else min_e_and_p[1]), res.success
@@ -2001,12 +2296,24 @@ def co2_emission():
         outputs=['co2_error_function_on_phases']
     )
 
+    dsp.add_data(
+        data_id='co2_params_cache_key',
+        default_value=None,
+        initial_dist=10
+    )
+
+    dsp.add_function(
+        function=define_co2_params_cache_key,
+        inputs=['engine_type', 'fuel_type', 'engine_capacity'],
+        outputs=['co2_params_cache_key']
+    )
+
     dsp.add_function(
         function=calibrate_co2_params,
         inputs=['engine_coolant_temperatures',
                 'co2_error_function_on_emissions',
                 'co2_error_function_on_phases', 'co2_params_initial_guess',
-                'is_cycle_hot'],
+                'is_cycle_hot', 'co2_params_cache_key'],
         outputs=['co2_params_calibrated', 'calibration_status']
     )
 
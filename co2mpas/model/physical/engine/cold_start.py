@@ -9,12 +9,12 @@
 It contains functions that model the engine cold start.
 """
 
+import copy
 from functools import partial
 from sklearn.metrics import mean_absolute_error
 from sklearn.tree import DecisionTreeRegressor
 import co2mpas.utils as co2_utl
 import numpy as np
-import co2mpas.dispatcher.utils as dsp_utl
 from co2mpas.dispatcher import Dispatcher
 import lmfit
 from .co2_emission import calibrate_model_params
@@ -75,7 +75,7 @@ def _correct_ds_css(min_t, ds=0, m=np.inf, temp_limit=30):
     return ds
 
 
-def _calibrate_css_model(target, *args, x0=None, ind=0):
+def _calibrate_css_model(target, *args, x0=None):
 
     def _err(x):
         return mean_absolute_error(target, _css_model(*args, **x.valuesdict()))
@@ -84,7 +84,7 @@ def _calibrate_css_model(target, *args, x0=None, ind=0):
 
     p['ds'].set(value=_correct_ds_css(p['temp_limit'].min, **p.valuesdict()))
 
-    return round(_err(p)), ind, partial(_css_model, **p.valuesdict())
+    return round(_err(p)), partial(_css_model, **p.valuesdict())
 
 
 def _identify_temp_limit(delta, temp):
@@ -99,12 +99,7 @@ def _identify_temp_limit(delta, temp):
     return t[i]
 
 
-def _calibrate_models(delta, temp, speeds_hot, on_eng, idle, phases):
-    func = partial(_calibrate_css_model, delta, idle, on_eng, temp, speeds_hot)
-
-    ind = dsp_utl.counter()
-    best = (np.inf, _css_model)
-    delta, temp = delta[phases], temp[phases]
+def _yield_css_params(delta, temp, idle):
     ds = delta / idle
     p = lmfit.Parameters()
     t_min, t_max = temp.min(), temp.max()
@@ -120,7 +115,16 @@ def _calibrate_models(delta, temp, speeds_hot, on_eng, idle, phases):
         ds_max = ds[temp <= t].max()
         if ds_max > 0:
             p['ds'].set(max=ds_max)
-            best = min(func(x0=p, ind=ind()), best)
+            yield copy.deepcopy(p)
+
+
+def _calibrate_models(delta, temp, speeds_hot, on_eng, idle, phases):
+    func = partial(_calibrate_css_model, delta, idle, on_eng, temp, speeds_hot)
+    starts = _yield_css_params(delta[phases], temp[phases], idle)
+
+    best = co2_utl.calibrate_multi_start(
+        lambda x0: func(x0=x0), starts, tol=0, default=(np.inf, _css_model)
+    )
 
     return best[-1]
 
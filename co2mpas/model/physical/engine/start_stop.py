@@ -147,6 +147,53 @@ class DefaultStartStopModel(object):
         return (X[:, 0] > VEL) | (X[:, 1] > ACC)
 
 
+def _sample_predictor(model):
+    """
+    Returns a function to predict one sample with the start/stop model.
+
+    The decision tree of the complex model is walked directly, avoiding the
+    overhead of the `Pipeline.predict` on one row.
+
+    :param model:
+        Start/stop model.
+    :type model: DefaultStartStopModel | sklearn.pipeline.Pipeline
+
+    :return:
+        Function that predicts a sample from its index and features.
+    :rtype: function
+    """
+
+    def _predict(i, X):
+        return model.predict([X])[0]
+
+    try:
+        steps = model.named_steps
+        support = np.where(steps['feature_selection'].get_support())[0]
+        clf = steps['classification']
+        tree = clf.tree_
+    except (AttributeError, KeyError):
+        return _predict
+
+    left, right = tree.children_left.tolist(), tree.children_right.tolist()
+    feature, threshold = tree.feature.tolist(), tree.threshold.tolist()
+    labels = clf.classes_.take(tree.value.argmax(axis=-1)[:, 0])
+
+    def _predict_tree(i, X):
+        # As sklearn, the features are compared in single precision.
+        x = np.asarray(X, dtype=np.float32)[support]
+        if np.isnan(x).any():
+            return _predict(i, X)
+        x, node = x.tolist(), 0
+        while left[node] != -1:
+            if x[feature[node]] <= threshold[node]:
+                node = left[node]
+            else:
+                node = right[node]
+        return labels[node]
+
+    return _predict_tree
+
+
 class StartStopModel(object):
     def __init__(self):
         self.base = self.model = DefaultStartStopModel()
@@ -214,14 +261,24 @@ class StartStopModel(object):
     def _yield_on_start(self, times, to_predict, velocities, accelerations,
                         *args, min_time_engine_on_after_start=0.0,
                         use_basic_start_stop=True):
-        base = DefaultStartStopModel().predict
+        # The decisions that depend only on velocity and acceleration are
+        # computed in bulk.
+        X = np.column_stack((velocities, accelerations))
+        base = DefaultStartStopModel().predict(X)
+        if use_basic_start_stop:
+            predictions = self.base.predict(X)
+
+            def predict(i, X):
+                return predictions[i]
+        else:  # The features are evaluated only when consulted.
+            predict = _sample_predictor(self.model)
+
         on, prev, t_switch_on, can_off = True, True, times[0], False
-        model = self.base if use_basic_start_stop else self.model
-        predict = model.predict
         args = (velocities, accelerations) + args
-        for t, p, X in zip(times, to_predict, zip(*args)):
+        it = zip(times, to_predict, base, zip(*args))
+        for i, (t, p, b, X) in enumerate(it):
             if p and can_off and t >= t_switch_on:
-                on = (prev or base([X])[0]) and predict([X])[0]
+                on = (prev or b) and predict(i, X)
             else:
                 on = True
 
@@ -234,7 +291,7 @@ class StartStopModel(object):
                 can_off = False
 
             if not can_off:
-                can_off = base([X])[0]
+                can_off = b
 
             prev = on
 
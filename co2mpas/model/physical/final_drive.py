@@ -13,10 +13,12 @@ import co2mpas.dispatcher.utils as dsp_utl
 from co2mpas.dispatcher import Dispatcher
 import logging
 from .defaults import dfl
+from .stacked import elementwise
 import numpy as np
 log = logging.getLogger(__name__)
 
 
+@elementwise
 def calculate_final_drive_speeds_in(final_drive_speeds_out, final_drive_ratio):
     """
     Calculates final drive speed [RPM].
@@ -58,6 +60,7 @@ def calculate_final_drive_torque_losses(
     return np.tile((final_drive_torque_loss,), final_drive_torques_out.shape)
 
 
+@elementwise
 def calculate_final_drive_torque_losses_v1(
         n_wheel_drive, final_drive_torques_out, final_drive_ratio,
         final_drive_efficiency):
@@ -115,6 +118,7 @@ def domain_final_drive_torque_losses_v1(n_dyno_axes, n_wheel_drive, *args):
     return True
 
 
+@elementwise
 def calculate_final_drive_torques_in(
         final_drive_torques_out, final_drive_ratio, final_drive_torque_losses):
     """
@@ -174,6 +178,7 @@ def calculate_final_drive_efficiencies(
     return np.nan_to_num(eff)
 
 
+@elementwise
 def calculate_final_drive_powers_in(
         final_drive_powers_out, final_drive_efficiencies):
     """
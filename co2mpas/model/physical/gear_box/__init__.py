@@ -374,7 +374,7 @@ def calculate_gear_box_efficiencies_torques_temperatures(
         gear_box_torques_out, gear_box_efficiency_parameters_cold_hot,
         equivalent_gear_box_heat_capacity, thermostat_temperature,
         gear_box_temperature_references, initial_gear_box_temperature,
-        gears=None, gear_box_ratios=None):
+        gears=None, gear_box_ratios=None, reference=False):
     """
     Calculates gear box efficiency [-], torque in [N*m], and temperature [°C].
 
@@ -425,6 +425,11 @@ def calculate_gear_box_efficiencies_torques_temperatures(
         Gear box ratios [-].
     :type gear_box_ratios: dict, optional
 
+    :param reference:
+        If True, the thermal sub model is evaluated step by step (i.e.,
+        reference mode), otherwise it is integrated with vectorized functions.
+    :type reference: bool, optional
+
     :return:
         Gear box efficiency [-], torque in [N*m], and temperature [°C] vectors.
     :rtype: (np.array, np.array, np.array)
@@ -433,44 +438,21 @@ def calculate_gear_box_efficiencies_torques_temperatures(
        (power mode or from wheels in motoring mode).
     """
 
-    inputs = ['thermostat_temperature', 'equivalent_gear_box_heat_capacity',
-              'gear_box_efficiency_parameters_cold_hot',
-              'gear_box_temperature_references',
-              'gear_box_power_out', 'gear_box_speed_out', 'gear_box_speed_in',
-              'gear_box_torque_out']
-
-    outputs = ['gear_box_temperature', 'gear_box_torque_in',
-               'gear_box_efficiency']
-
-    base = (thermostat_temperature, equivalent_gear_box_heat_capacity,
-            gear_box_efficiency_parameters_cold_hot,
-            gear_box_temperature_references)
-
-    it = (gear_box_powers_out, gear_box_speeds_out, gear_box_speeds_in,
-          gear_box_torques_out)
-
-    if gear_box_ratios and gears is not None:
-        inputs = ['gear_box_ratios'] + inputs
-        inputs.append('gear')
-        base = (gear_box_ratios, ) + base
-        it = it + (gears, )
-
-    inputs.append('gear_box_temperature')
-
-    from .thermal import thermal
+    from .thermal import integrate_gear_box_thermal_model, \
+        pipe_gear_box_thermal_model
 
-    fun = dsp_utl.SubDispatchPipe(thermal(), 'thermal', inputs, outputs)
-    res = []
-    o = [initial_gear_box_temperature]
-    for args in zip(*it):
-        o = fun(*(base + args + (o[0], )))
-        res.append(o)
+    if reference:
+        func = pipe_gear_box_thermal_model
+    else:
+        func = integrate_gear_box_thermal_model
 
-    temp, to_in, eff = zip(*res)
-
-    temp = (initial_gear_box_temperature, ) + temp[:-1]
-
-    return np.array(eff), np.array(to_in), np.array(temp)
+    return func(
+        gear_box_powers_out, gear_box_speeds_in, gear_box_speeds_out,
+        gear_box_torques_out, gear_box_efficiency_parameters_cold_hot,
+        equivalent_gear_box_heat_capacity, thermostat_temperature,
+        gear_box_temperature_references, initial_gear_box_temperature,
+        gears=gears, gear_box_ratios=gear_box_ratios
+    )
 
 
 def calculate_gear_box_powers_in(gear_box_torques_in, gear_box_speeds_in):
@@ -9,12 +9,10 @@
 It contains functions that model the basic mechanics of the gear box.
 """
 
-from functools import partial
 from math import pi
 from scipy.interpolate import InterpolatedUnivariateSpline
 from scipy.optimize import brute
 from scipy.stats import binned_statistic
-from sklearn.metrics import mean_absolute_error
 from co2mpas.dispatcher import Dispatcher
 from . import calculate_gear_shifts
 from ..defaults import *
@@ -23,9 +21,10 @@ import numpy as np
 from sklearn.cluster import MeanShift, estimate_bandwidth
 
 
-def _identify_gear(idle, vsr, stop_vel, plateau_acc, ratio, vel, acc):
+def _identify_gears(
+        idle, vsr, stop_vel, plateau_acc, ratios, velocities, accelerations):
     """
-    Identifies a gear [-].
+    Identifies gear time series [-].
 
     :param idle:
         Engine speed idle median and median + std [RPM].
@@ -43,33 +42,38 @@ def _identify_gear(idle, vsr, stop_vel, plateau_acc, ratio, vel, acc):
         Maximum acceleration to be at constant velocity [m/s2].
     :type plateau_acc: float
 
-    :param ratio:
-        Vehicle velocity speed ratio [km/(h*RPM)].
-    :type ratio: float
+    :param ratios:
+        Vehicle velocity speed ratios [km/(h*RPM)].
+    :type ratios: numpy.array
 
-    :param vel:
+    :param velocities:
         Vehicle velocity [km/h].
-    :type vel: float
+    :type velocities: numpy.array
 
-    :param acc:
+    :param accelerations:
         Vehicle acceleration [m/s2].
-    :type acc: float
+    :type accelerations: numpy.array
 
     :return:
-        A gear [-].
-    :rtype: int
+        Gear vector identified [-].
+    :rtype: numpy.array
     """
 
-    if vel <= stop_vel:
-        return 0
+    # Sorted as the `min` of the tuples (error, (gear, ratio)).
+    gears, vs = np.array(sorted(vsr), dtype=object).T
+    gears, vs = gears.astype(int), vs.astype(float)
+    vel, acc = velocities, accelerations
 
-    m, (gear, vs) = min((abs(v - ratio), (k, v)) for k, v in vsr)
+    err = np.abs(vs[None, :] - ratios[:, None])
+    i = np.argmin(err, axis=1)  # First minimum like `min`.
+    m, gear, vs = err[np.arange(len(i)), i], gears[i], vs[i]
 
-    if acc < 0 and (vel <= idle[0] * vs or abs(vel / idle[1] - ratio) < m):
-        return 0
+    b0 = (vel <= idle[0] * vs) | (np.abs(vel / idle[1] - ratios) < m)
+    b0 = (vel <= stop_vel) | ((acc < 0) & b0)
 
-    if gear == 0 and ((vel > stop_vel and acc > 0) or acc > plateau_acc):
-        return 1
+    b1 = ((vel > stop_vel) & (acc > 0)) | (acc > plateau_acc)
+    gear[(gear == 0) & b1] = 1
+    gear[b0] = 0
 
     return gear
 
@@ -131,10 +135,9 @@ def identify_gears(
 
     ratios[engine_speeds_out < idle_speed[0]] = 0
 
-    id_gear = partial(_identify_gear, idle_speed, vsr, stop_velocity,
-                      plateau_acceleration)
-
-    gear = list(map(id_gear, *(ratios, velocities, accelerations)))
+    gear = _identify_gears(idle_speed, vsr, stop_velocity,
+                           plateau_acceleration, ratios, velocities,
+                           accelerations)
 
     gear = co2_utl.median_filter(times, gear, change_gear_window_width)
 
@@ -147,24 +150,32 @@ def identify_gears(
 
 def _correct_gear_shifts(
         times, ratios, gears, velocity_speed_ratios, shift_window=4.0):
-    shifts = calculate_gear_shifts(gears)
-    vsr = np.vectorize(lambda v: velocity_speed_ratios.get(v, 0))
-    s = len(gears)
-
-    def err(v, r):
-        v = int(v)
-        return mean_absolute_error(ratios[slice(v - 1, v + 1, 1)], r)
+    shifts = np.arange(len(gears))[calculate_gear_shifts(gears)]
+    vsr = np.vectorize(lambda v: velocity_speed_ratios.get(v, 0),
+                       otypes=[float])
+    s, dt = len(gears), shift_window / 2
+    g, t = np.column_stack((gears[shifts - 1], gears[shifts])), times[shifts]
+
+    # Search windows of the shifts.
+    n = shifts - np.searchsorted(times, t, 'right')
+    n += np.searchsorted(times, t - dt, 'left')
+    m = shifts + np.searchsorted(times, t + dt, 'right')
+    m = np.minimum(m - np.searchsorted(times, t, 'left'), s)
+
+    # Mean absolute errors between the ratios and the gear ratios in windows.
+    v = n[:, None] + np.arange(max(m - n, default=0))
+    r = ratios[np.clip(v, 1, s - 1)[:, :, None] + np.array([-1, 0])]
+    err = np.abs(vsr(g)[:, None, :] - r)
+    err = (err[:, :, 0] + err[:, :, 1]) / 2
+    err[(v < 1) | (v >= m[:, None])] = np.inf
 
     k = 0
     new_gears = np.zeros_like(gears)
-    dt = shift_window / 2
-    for i in np.arange(s)[shifts]:
-        g = gears[slice(i - 1, i + 1, 1)]
+    for i, g, n0, e in zip(shifts, g, n, err):
         if g[0] != 0 and g[-1] != 0:
-            t = times[i]
-            n = max(i - sum(((t - dt) <= times) & (times <= t)), k)
-            m = min(i + sum((t <= times) & (times <= (t + dt))), s)
-            j = int(brute(err, (slice(n, m, 1),), args=(vsr(g),), finish=None))
+            # The previous shift may overrun the window or the cycle end.
+            j, e = max(n0, k), e[max(k - n0, 0):]
+            j = min(j + int(np.argmin(e)) if e.size else j, s - 1)
         else:
             j = int(i)
 
@@ -12,6 +12,7 @@ It contains functions to calculate torque losses and the gear box temperature.
 import co2mpas.dispatcher.utils as dsp_utl
 from co2mpas.dispatcher import Dispatcher
 from math import pi
+import numpy as np
 from ..defaults import dfl
 
 
@@ -299,3 +300,318 @@ def thermal():
     )
 
     return dsp
+
+
+def evaluate_gear_box_torques_in(
+        gear_box_torques_out, gear_box_speeds_in, gear_box_speeds_out,
+        gear_box_efficiency_parameters):
+    """
+    Calculates torques required according to the temperature profile [N*m].
+
+    It is the vectorized version of :func:`evaluate_gear_box_torque_in`.
+
+    :param gear_box_torques_out:
+        Torque gear_box vector [N*m].
+    :type gear_box_torques_out: numpy.array
+
+    :param gear_box_speeds_in:
+        Engine speed vector [RPM].
+    :type gear_box_speeds_in: numpy.array
+
+    :param gear_box_speeds_out:
+        Wheel speed vector [RPM].
+    :type gear_box_speeds_out: numpy.array
+
+    :param gear_box_efficiency_parameters:
+        Parameters of gear box efficiency model (`gbp00`, `gbp10`, `gbp01`).
+    :type gear_box_efficiency_parameters: dict
+
+    :return:
+        Torques required vector [N*m].
+    :rtype: numpy.array
+    """
+
+    tgb = np.asarray(gear_box_torques_out, dtype=float)
+    es = np.asarray(gear_box_speeds_in, dtype=float)
+    ws = np.asarray(gear_box_speeds_out, dtype=float)
+    par = gear_box_efficiency_parameters
+
+    t, b = np.zeros_like(tgb), (es > 0) & (ws > 0)
+    m = b & (tgb < 0)
+    tgb_m, es_m, ws_m = tgb[m], es[m], ws[m]
+    t[m] = (par['gbp01'] * tgb_m - par['gbp10'] * ws_m - par['gbp00']) * ws_m
+    t[m] /= es_m
+    b &= ~m
+    t[b] = (tgb[b] - par['gbp10'] * es[b] - par['gbp00']) / par['gbp01']
+
+    return t
+
+
+def calculate_gear_box_efficiencies(
+        gear_box_powers_out, gear_box_speeds_in, gear_box_torques_out,
+        gear_box_torques_in):
+    """
+    Calculates the gear box efficiencies [-].
+
+    It is the vectorized version of :func:`calculate_gear_box_efficiency`.
+
+    :param gear_box_powers_out:
+        Power at wheels vector [kW].
+    :type gear_box_powers_out: numpy.array
+
+    :param gear_box_speeds_in:
+        Engine speed vector [RPM].
+    :type gear_box_speeds_in: numpy.array
+
+    :param gear_box_torques_out:
+        Torque gear_box vector [N*m].
+    :type gear_box_torques_out: numpy.array
+
+    :param gear_box_torques_in:
+        Torque required vector [N*m].
+    :type gear_box_torques_in: numpy.array
+
+    :return:
+        Gear box efficiencies [-].
+    :rtype: numpy.array
+    """
+
+    p = np.asarray(gear_box_powers_out, dtype=float)
+    t_in = np.asarray(gear_box_torques_in, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eff = gear_box_speeds_in * t_in / p * (pi / 30000)
+        eff = np.where(p > 0, 1 / eff, eff)
+
+    # Like `max(0, min(1, eff))`, a nan efficiency is saturated to 1.
+    eff = np.where(np.isnan(eff), 1.0, np.clip(eff, 0, 1))
+    eff[t_in == gear_box_torques_out] = 1.0
+
+    return eff
+
+
+def integrate_gear_box_thermal_model(
+        gear_box_powers_out, gear_box_speeds_in, gear_box_speeds_out,
+        gear_box_torques_out, gear_box_efficiency_parameters_cold_hot,
+        equivalent_gear_box_heat_capacity, thermostat_temperature,
+        gear_box_temperature_references, initial_gear_box_temperature,
+        gears=None, gear_box_ratios=None):
+    """
+    Integrates the gear box thermal model over the whole cycle.
+
+    The hot/cold torques and the steps that do not depend on the temperature
+    are evaluated over the whole arrays. Only the temperature recurrence is
+    evaluated step by step. Results are the same of :func:`thermal`.
+
+    :param gear_box_powers_out:
+        Power at wheels vector [kW].
+    :type gear_box_powers_out: numpy.array
+
+    :param gear_box_speeds_in:
+        Engine speed vector [RPM].
+    :type gear_box_speeds_in: numpy.array
+
+    :param gear_box_speeds_out:
+        Wheel speed vector [RPM].
+    :type gear_box_speeds_out: numpy.array
+
+    :param gear_box_torques_out:
+        Torque gear_box vector [N*m].
+    :type gear_box_torques_out: numpy.array
+
+    :param gear_box_efficiency_parameters_cold_hot:
+        Parameters of gear box efficiency model for cold/hot phases:
+
+            - 'hot': `gbp00`, `gbp10`, `gbp01`
+            - 'cold': `gbp00`, `gbp10`, `gbp01`
+    :type gear_box_efficiency_parameters_cold_hot: dict
+
+    :param equivalent_gear_box_heat_capacity:
+        Equivalent gear box heat capacity [kg*J/K].
+    :type equivalent_gear_box_heat_capacity: float
+
+    :param thermostat_temperature:
+        Engine thermostat temperature [°C].
+    :type thermostat_temperature: float
+
+    :param gear_box_temperature_references:
+        Reference temperature [°C].
+    :type gear_box_temperature_references: (float, float)
+
+    :param initial_gear_box_temperature:
+        initial_gear_box_temperature [°C].
+    :type initial_gear_box_temperature: float
+
+    :param gears:
+        Gear vector [-].
+    :type gears: numpy.array, optional
+
+    :param gear_box_ratios:
+        Gear box ratios [-].
+    :type gear_box_ratios: dict, optional
+
+    :return:
+        Gear box efficiency [-], torque in [N*m], and temperature [°C] vectors.
+    :rtype: (np.array, np.array, np.array)
+    """
+
+    par = gear_box_efficiency_parameters_cold_hot
+    T_cold, T_hot = gear_box_temperature_references
+    p = np.asarray(gear_box_powers_out, dtype=float)
+    s_in = np.asarray(gear_box_speeds_in, dtype=float)
+    t_out = np.asarray(gear_box_torques_out, dtype=float)
+    a = (t_out, s_in, gear_box_speeds_out)
+
+    to_in = evaluate_gear_box_torques_in(*(a + (par['hot'],)))
+    fixed = np.zeros_like(to_in, dtype=bool)
+    if gear_box_ratios and gears is not None:
+        gbr = gear_box_ratios
+        fixed = np.array([gbr.get(g, 0) == 1 for g in gears], dtype=bool)
+        to_in[fixed] = t_out[fixed]
+
+    eff = calculate_gear_box_efficiencies(p, s_in, t_out, to_in)
+    heat = np.where((eff != 0) & (p != 0), np.abs(p) * (1.0 - eff) * 1000.0, 0)
+
+    temp = np.empty_like(to_in)
+    if T_cold == T_hot:
+        fixed[:] = True
+        t_cold = to_in
+    else:
+        t_cold = evaluate_gear_box_torques_in(*(a + (par['cold'],)))
+    dT, cap = T_hot - T_cold, equivalent_gear_box_heat_capacity
+    T_max = thermostat_temperature - 5.0
+
+    T, to_in, heat = initial_gear_box_temperature, to_in.tolist(), heat.tolist()
+    it = zip(fixed.tolist(), p.tolist(), s_in.tolist(), t_out.tolist(),
+             t_cold.tolist())
+    for i, (f, p_i, s_i, t_out_i, t_cold_i) in enumerate(it):
+        temp[i] = T
+        if f or not T <= T_hot:
+            T = min(T + heat[i] / cap, T_max)
+            continue
+
+        t = to_in[i]
+        t += (T_hot - T) / dT * (t_cold_i - t)
+        to_in[i] = t
+
+        # Same of `calculate_gear_box_efficiency` and `calculate_gear_box_heat`.
+        h = 0.0
+        if t == t_out_i:
+            e = 1
+        elif p_i:
+            e = s_i * t / p_i * (pi / 30000)
+            if p_i > 0:
+                e = e and 1 / e
+            e = max(0, min(1, e))
+        else:
+            e = 0
+        if e and p_i:
+            h = abs(p_i) * (1.0 - e) * 1000.0
+        T = min(T + h / cap, T_max)
+
+    to_in = np.array(to_in, dtype=float)
+    eff = calculate_gear_box_efficiencies(p, s_in, t_out, to_in)
+
+    return eff, to_in, temp
+
+
+def pipe_gear_box_thermal_model(
+        gear_box_powers_out, gear_box_speeds_in, gear_box_speeds_out,
+        gear_box_torques_out, gear_box_efficiency_parameters_cold_hot,
+        equivalent_gear_box_heat_capacity, thermostat_temperature,
+        gear_box_temperature_references, initial_gear_box_temperature,
+        gears=None, gear_box_ratios=None):
+    """
+    Evaluates the gear box thermal model step by step with :func:`thermal`.
+
+    It is the reference implementation of
+    :func:`integrate_gear_box_thermal_model`.
+
+    :param gear_box_powers_out:
+        Power at wheels vector [kW].
+    :type gear_box_powers_out: numpy.array
+
+    :param gear_box_speeds_in:
+        Engine speed vector [RPM].
+    :type gear_box_speeds_in: numpy.array
+
+    :param gear_box_speeds_out:
+        Wheel speed vector [RPM].
+    :type gear_box_speeds_out: numpy.array
+
+    :param gear_box_torques_out:
+        Torque gear_box vector [N*m].
+    :type gear_box_torques_out: numpy.array
+
+    :param gear_box_efficiency_parameters_cold_hot:
+        Parameters of gear box efficiency model for cold/hot phases:
+
+            - 'hot': `gbp00`, `gbp10`, `gbp01`
+            - 'cold': `gbp00`, `gbp10`, `gbp01`
+    :type gear_box_efficiency_parameters_cold_hot: dict
+
+    :param equivalent_gear_box_heat_capacity:
+        Equivalent gear box heat capacity [kg*J/K].
+    :type equivalent_gear_box_heat_capacity: float
+
+    :param thermostat_temperature:
+        Engine thermostat temperature [°C].
+    :type thermostat_temperature: float
+
+    :param gear_box_temperature_references:
+        Reference temperature [°C].
+    :type gear_box_temperature_references: (float, float)
+
+    :param initial_gear_box_temperature:
+        initial_gear_box_temperature [°C].
+    :type initial_gear_box_temperature: float
+
+    :param gears:
+        Gear vector [-].
+    :type gears: numpy.array, optional
+
+    :param gear_box_ratios:
+        Gear box ratios [-].
+    :type gear_box_ratios: dict, optional
+
+    :return:
+        Gear box efficiency [-], torque in [N*m], and temperature [°C] vectors.
+    :rtype: (np.array, np.array, np.array)
+    """
+
+    inputs = ['thermostat_temperature', 'equivalent_gear_box_heat_capacity',
+              'gear_box_efficiency_parameters_cold_hot',
+              'gear_box_temperature_references',
+              'gear_box_power_out', 'gear_box_speed_out', 'gear_box_speed_in',
+              'gear_box_torque_out']
+
+    outputs = ['gear_box_temperature', 'gear_box_torque_in',
+               'gear_box_efficiency']
+
+    base = (thermostat_temperature, equivalent_gear_box_heat_capacity,
+            gear_box_efficiency_parameters_cold_hot,
+            gear_box_temperature_references)
+
+    it = (gear_box_powers_out, gear_box_speeds_out, gear_box_speeds_in,
+          gear_box_torques_out)
+
+    if gear_box_ratios and gears is not None:
+        inputs = ['gear_box_ratios'] + inputs
+        inputs.append('gear')
+        base = (gear_box_ratios, ) + base
+        it = it + (gears, )
+
+    inputs.append('gear_box_temperature')
+
+    fun = dsp_utl.SubDispatchPipe(thermal(), 'thermal', inputs, outputs)
+    res = []
+    o = [initial_gear_box_temperature]
+    for args in zip(*it):
+        o = fun(*(base + args + (o[0], )))
+        res.append(o)
+
+    temp, to_in, eff = zip(*res)
+
+    temp = (initial_gear_box_temperature, ) + temp[:-1]
+
+    return np.array(eff), np.array(to_in), np.array(temp)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It contains functions to evaluate the elementwise part of a model for N
+parameter variants at once.
+
+The varied scalar parameters are stacked as column vectors (variants x 1), so
+that the elementwise functions return 2-D arrays (variants x time). The other
+functions (e.g., the sequential models) are not evaluated with stacked inputs.
+
+.. note:: The simulation plan does not use it, because each plan row is
+   processed by the whole batch model (validation, reports, summaries).
+"""
+
+import logging
+import numpy as np
+from co2mpas.dispatcher.utils.des import parent_func
+
+log = logging.getLogger(__name__)
+
+__all__ = ['elementwise', 'stacked_model', 'stack']
+
+
+class Stacked(np.ndarray):
+    """
+    Array of parameter variants stacked along the first axis.
+    """
+
+
+def elementwise(func):
+    """
+    Marks a function that can be evaluated with stacked variants.
+
+    :param func:
+        Function composed only by elementwise NumPy expressions.
+    :type func: callable
+
+    :return:
+        The same function.
+    :rtype: callable
+    """
+    func.elementwise = True
+    return func
+
+
+def _is_stacked(args):
+    return any(isinstance(v, Stacked) for v in args)
+
+
+def stack(values):
+    """
+    Stacks the scalar parameter variants as a column vector.
+
+    :param values:
+        Parameter variants.
+    :type values: list[float]
+
+    :return:
+        Stacked variants (variants x 1).
+    :rtype: Stacked
+    """
+    return _stack([[v] for v in values])
+
+
+def _stack(value):
+    return np.asarray(value).view(Stacked)
+
+
+class _StackedDomain(object):
+    def __init__(self, function, domain=None):
+        self.elementwise = getattr(parent_func(function), 'elementwise', False)
+        self.domain = domain
+
+    def __call__(self, *args):
+        if _is_stacked(args):
+            # The domains are checked per variant.
+            return self.elementwise and self.domain is None
+        return self.domain is None or self.domain(*args)
+
+
+class _StackedFunction(object):
+    def __init__(self, function, n_outputs):
+        self.function = function
+        self.n_outputs = n_outputs
+
+    def __call__(self, *args):
+        res = self.function(*args)
+        if _is_stacked(args):
+            if self.n_outputs > 1:
+                return tuple(_stack(v) for v in res)
+            return _stack(res)
+        return res
+
+
+def _set_stacked(dsp):
+    for node in dsp.nodes.values():
+        if node['type'] == 'dispatcher':
+            _set_stacked(node['function'])
+        elif node['type'] == 'function':
+            func, domain = node['function'], node.get('input_domain')
+            node['input_domain'] = _StackedDomain(func, domain)
+            node['function'] = _StackedFunction(func, len(node['outputs']))
+
+
+def stacked_model(dsp):
+    """
+    Returns a copy of the model that evaluates the stacked variants only with
+    the elementwise functions.
+
+    :param dsp:
+        Model (e.g., the physical model).
+    :type dsp: co2mpas.dispatcher.Dispatcher
+
+    :return:
+        Stacked model.
+    :rtype: co2mpas.dispatcher.Dispatcher
+    """
+    dsp = dsp.copy()
+    _set_stacked(dsp)
+    return dsp
@@ -11,10 +11,10 @@ It contains functions that model the basic mechanics of the vehicle.
 
 import co2mpas.dispatcher.utils as dsp_utl
 from co2mpas.dispatcher import Dispatcher
-from math import cos, sin
 from scipy.interpolate import InterpolatedUnivariateSpline as Spline
 from pykalman import KalmanFilter
 from .defaults import dfl
+from .stacked import elementwise
 import numpy as np
 
 
@@ -67,6 +67,7 @@ def calculate_accelerations(times, velocities):
     return acc
 
 
+@elementwise
 def calculate_aerodynamic_resistances(f2, velocities):
     """
     Calculates the aerodynamic resistances of the vehicle [N].
@@ -87,6 +88,7 @@ def calculate_aerodynamic_resistances(f2, velocities):
     return f2 * velocities**2
 
 
+@elementwise
 def calculate_f2(
         air_density, aerodynamic_drag_coefficient, frontal_area):
     """
@@ -114,6 +116,7 @@ def calculate_f2(
     return 0.5 * c / 3.6**2
 
 
+@elementwise
 def calculate_rolling_resistance(f0, angle_slope):
     """
     Calculates rolling resistance [N].
@@ -131,9 +134,10 @@ def calculate_rolling_resistance(f0, angle_slope):
     :rtype: float
     """
 
-    return f0 * cos(angle_slope)
+    return f0 * np.cos(angle_slope)
 
 
+@elementwise
 def calculate_f0(vehicle_mass, rolling_resistance_coeff):
     """
     Calculates rolling resistance [N].
@@ -154,6 +158,7 @@ def calculate_f0(vehicle_mass, rolling_resistance_coeff):
     return vehicle_mass * 9.81 * rolling_resistance_coeff
 
 
+@elementwise
 def calculate_velocity_resistances(f1, velocities):
     """
     Calculates forces function of velocity [N].
@@ -174,6 +179,7 @@ def calculate_velocity_resistances(f1, velocities):
     return f1 * velocities
 
 
+@elementwise
 def calculate_climbing_force(vehicle_mass, angle_slope):
     """
     Calculates the vehicle climbing resistance [N].
@@ -191,9 +197,10 @@ def calculate_climbing_force(vehicle_mass, angle_slope):
     :rtype: float
     """
 
-    return vehicle_mass * 9.81 * sin(angle_slope)
+    return vehicle_mass * 9.81 * np.sin(angle_slope)
 
 
+@elementwise
 def calculate_rotational_inertia_forces(
         vehicle_mass, inertial_factor, accelerations):
     """
@@ -235,6 +242,7 @@ def select_default_n_dyno_axes(cycle_type):
     return par.DYNO_AXES.get(cycle_type.upper(), 2)
 
 
+@elementwise
 def select_inertial_factor(n_dyno_axes):
     """
     Selects the inertia factor [%] according to the number of dyno axes.
@@ -252,6 +260,7 @@ def select_inertial_factor(n_dyno_axes):
 
 
 # noinspection PyPep8Naming
+@elementwise
 def calculate_motive_forces(
         vehicle_mass, accelerations, climbing_force, aerodynamic_resistances,
         rolling_resistance, velocity_resistances, rotational_inertia_forces):
@@ -301,6 +310,7 @@ def calculate_motive_forces(
     return vehicle_mass * accelerations + Fclimb + Frr + Faero + Fvel + Finertia
 
 
+@elementwise
 def calculate_motive_powers(motive_forces, velocities):
     """
     Calculates motive power [kW].
@@ -321,6 +331,7 @@ def calculate_motive_powers(motive_forces, velocities):
     return motive_forces * velocities / 3600
 
 
+@elementwise
 def apply_f0_correction(f0_uncorrected, correct_f0):
     """
     Corrects the rolling resistance force [N] if a different preconditioning
@@ -17,6 +17,7 @@ import co2mpas.dispatcher.utils as dsp_utl
 from co2mpas.dispatcher import Dispatcher
 import co2mpas.utils as co2_utl
 from .defaults import dfl
+from .stacked import elementwise
 from .gear_box.mechanical import calculate_speed_velocity_ratios, \
     calculate_velocity_speed_ratios, calculate_gear_box_speeds_in, \
     identify_gears
@@ -26,6 +27,7 @@ import schema
 log = logging.getLogger(__name__)
 
 
+@elementwise
 def calculate_wheel_power(velocities, accelerations, road_loads, vehicle_mass):
     """
     Calculates the wheel power [kW].
@@ -60,6 +62,7 @@ def calculate_wheel_power(velocities, accelerations, road_loads, vehicle_mass):
     return (quadratic_term + 1.03 * vehicle_mass * accelerations) * vel
 
 
+@elementwise
 def calculate_wheel_torques(wheel_powers, wheel_speeds):
     """
     Calculates torque at the wheels [N*m].
@@ -82,6 +85,7 @@ def calculate_wheel_torques(wheel_powers, wheel_speeds):
     return wheel_powers / wheel_speeds * (30000.0 / pi) if wheel_speeds else 0.0
 
 
+@elementwise
 def calculate_wheel_powers(wheel_torques, wheel_speeds):
     """
     Calculates power at the wheels [kW].
@@ -102,6 +106,7 @@ def calculate_wheel_powers(wheel_torques, wheel_speeds):
     return wheel_torques * wheel_speeds * (pi / 30000.0)
 
 
+@elementwise
 def calculate_wheel_speeds(velocities, r_dynamic):
     """
     Calculates rotating speed of the wheels [RPM].
@@ -333,6 +338,7 @@ def calculates_brake_powers(
     return -brake_powers
 
 
+@elementwise
 def identify_tyre_dynamic_rolling_coefficient(r_wheels, r_dynamic):
     """
     Identifies the dynamic rolling coefficient [-].
@@ -353,6 +359,7 @@ def identify_tyre_dynamic_rolling_coefficient(r_wheels, r_dynamic):
     return r_dynamic / r_wheels
 
 
+@elementwise
 def calculate_r_dynamic(r_wheels, tyre_dynamic_rolling_coefficient):
     """
     Calculates the dynamic radius of the wheels [m].
@@ -23,6 +23,7 @@ Modules:
 from co2mpas.dispatcher import Dispatcher
 from sklearn.metrics import mean_absolute_error, accuracy_score
 import co2mpas.dispatcher.utils as dsp_utl
+import hashlib
 import logging
 from collections import OrderedDict
 from pprint import pformat
@@ -527,16 +528,25 @@ def selector(*data):
         outputs=['error_settings/%s' % k for k in m]
     )
 
+    selectors = []
     for k, v in setting.items():
         v['dsp'] = v.pop('define_sub_model', define_sub_model)(**v)
         v['metrics'] = dsp_utl.map_list(v['targets'], *v['metrics'])
+        selectors.append(v.pop('model_selector', _selector)(k, data, data, v))
         dsp.add_function(
-            function=v.pop('model_selector', _selector)(k, data, data, v),
+            function=selectors[-1],
             function_id='%s selector' % k,
-            inputs=['CO2MPAS_results', 'error_settings/%s' % k],
+            inputs=['CO2MPAS_results', 'error_settings/%s' % k,
+                    'errors/%s' % k],
             outputs=['models', 'scores']
         )
 
+    dsp.add_function(
+        function=partial(evaluate_errors, selectors),
+        inputs=['CO2MPAS_results'] + ['error_settings/%s' % k for k in m],
+        outputs=['errors/%s' % k for k in m]
+    )
+
     func = dsp_utl.SubDispatchFunction(
         dsp=dsp,
         function_id='models_selector',
@@ -551,6 +561,64 @@ def split_error_settings(models_ids, error_settings):
     return list(error_settings.get(k, {}) for k in models_ids)
 
 
+def _error_jobs(selector, inputs):
+    dsp = selector.dsp
+    for k, v in dsp.nodes.items():
+        if v['type'] == 'function' and len(v['outputs']) == 1:
+            o = v['outputs'][0]
+            if o.startswith('error/') and set(v['inputs']).issubset(inputs):
+                yield o, v['function'], [inputs[i] for i in v['inputs']]
+
+
+def _evaluate_model_errors(selector, inputs):
+    errors = {}
+    for k, func, args in _error_jobs(selector, inputs):
+        # noinspection PyBroadException
+        try:
+            errors[k] = func(*args)
+        except Exception:  # The model selector will handle the error.
+            log.debug('Error evaluation of %s (%s) failed.', selector.name, k,
+                      exc_info=True)
+    return errors
+
+
+def evaluate_errors(selectors, results, *error_settings):
+    """
+    Evaluates the errors of the calibrated models against all cycles.
+
+    The models × cycles evaluations are independent jobs. The errors of the
+    same model against the same cycle are evaluated once when the calibrated
+    models and the error settings are equal (i.e., same fingerprint). The cache
+    is created here and it is given to the selectors as `errors_cache` input.
+
+    :param selectors:
+        Model selectors.
+    :type selectors: list[SubDispatch]
+
+    :param results:
+        CO2MPAS results of the calibration cycles.
+    :type results: dict
+
+    :param error_settings:
+        Error settings of the model selectors.
+    :type error_settings: tuple[dict]
+
+    :return:
+        Model errors of each selector (i.e., `error/<cycle>` items).
+    :rtype: list[dict]
+    """
+
+    errors, cache = [], {'errors_cache': {}}
+    for selector, settings in zip(selectors, error_settings):
+        dfl = selector.dsp.default_values
+        inputs = dsp_utl.combine_dicts(
+            {k: v['value'] for k, v in dfl.items()}, results, settings, cache
+        )
+        errors.append(_evaluate_model_errors(selector, inputs))
+
+    return errors
+
+
 def _selector(name, data_in, data_out, setting):
 
     dsp = Dispatcher(
@@ -575,6 +643,11 @@ def _selector(name, data_in, data_out, setting):
         default_value={}
     )
 
+    dsp.add_data(
+        data_id='errors_cache',
+        default_value=None
+    )
+
     for i in data_in:
         e = 'error/%s' % i
 
@@ -582,7 +655,8 @@ def _selector(name, data_in, data_out, setting):
 
         dsp.add_function(
             function=_errors(name, i, data_out, setting),
-            inputs=['error_settings', i] + [k for k in data_out if k != i],
+            inputs=['error_settings', 'errors_cache', i] +
+                   [k for k in data_out if k != i],
             outputs=[e]
         )
 
@@ -606,7 +680,7 @@ def _selector(name, data_in, data_out, setting):
 
 def _errors(name, data_id, data_out, setting):
 
-    name = ''.join(k[0].upper() for k in name.split('_'))
+    model, name = name, ''.join(k[0].upper() for k in name.split('_'))
 
     dsp = Dispatcher(
         name='%s-%s errors' % (name, data_id),
@@ -639,6 +713,11 @@ def _errors(name, data_id, data_out, setting):
         default_value={}
     )
 
+    dsp.add_data(
+        data_id='errors_cache',
+        default_value=None
+    )
+
     for o in data_out:
 
         dsp.add_function(
@@ -647,13 +726,16 @@ def _errors(name, data_id, data_out, setting):
             outputs=['input/%s' % o]
         )
 
+        func = _error(name, data_id, o, setting)
         dsp.add_function(
-            function=_error(name, data_id, o, setting),
-            inputs=['input/%s' % o, 'error_settings'],
+            function_id=func.name,
+            function=partial(_cached_error, (model, o), func),
+            inputs=['input/%s' % o, 'error_settings', 'errors_cache'],
             outputs=['error/%s' % o]
         )
 
-    i = ['error_settings', data_id] + [k for k in data_out if k != data_id]
+    i = ['error_settings', 'errors_cache', data_id]
+    i += [k for k in data_out if k != data_id]
     func = dsp_utl.SubDispatchFunction(
         dsp=dsp,
         function_id=dsp.name,
@@ -663,6 +745,44 @@ def _errors(name, data_id, data_out, setting):
     return func
 
 
+def _fingerprint(value):
+    """
+    Returns a hashable fingerprint of the value (the arrays by digest).
+
+    The objects that are neither hashable nor containers are identified by
+    their id (they are kept alive by the results during the evaluation).
+    """
+    if isinstance(value, dict):
+        return frozenset((k, _fingerprint(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_fingerprint(v) for v in value)
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            return value.shape, _fingerprint(value.tolist())
+        digest = hashlib.sha1(np.ascontiguousarray(value)).digest()
+        return value.dtype.str, value.shape, digest
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return 'id', id(value)
+
+
+def _cached_error(key, error, inputs, error_settings, errors_cache=None):
+    if errors_cache is None:
+        return error(inputs, error_settings)
+
+    # Errors of the same model vs the same cycle (`key`) are equal if the
+    # calibrated models and the error settings are equal.
+    key += (_fingerprint(inputs['calibrated_models']),
+            _fingerprint(error_settings))
+    try:
+        return errors_cache[key]
+    except KeyError:
+        v = errors_cache[key] = error(inputs, error_settings)
+        return v
+
+
 def _error(name, data_id, data_out, setting):
 
     dsp = Dispatcher(
@@ -8,24 +8,45 @@
 """
 It contains functions to make a simulation plan.
 """
+import logging
+import os.path as osp
+from datetime import datetime
 from tqdm import tqdm
 import co2mpas.dispatcher.utils as dsp_utl
 import co2mpas.utils as co2_utl
 from .io import check_cache_fpath_exists, get_cache_fpath
-from .io.dill import save_dill, load_from_dill
+from .io.dill import save_dill, load_from_dill, CACHE_MMAP_MODE
 from .__main__ import file_finder
-from .batch import _process_vehicle, _add2summary, vehicle_processing_model
+from .batch import _process_vehicle, vehicle_processing_model, \
+    _save_summary, SummaryTable
+from .model.physical.defaults import dfl
+from .telemetry import metrics, count_cache
 from .model.physical.clutch_tc.torque_converter import TorqueConverter
 from cachetools import cached, LRUCache
+from cachetools.keys import hashkey
 from copy import deepcopy
 
+log = logging.getLogger(__name__)
 
-@cached(LRUCache(maxsize=256))
-def get_results(model, fpath, overwrite_cache=False, **kw):
+
+#: In-memory cache of the base results.
+_results = LRUCache(maxsize=256)
+
+
+def get_results(*args, **kwargs):
+    # The in-memory hits are counted here, the file lookups by `_get_results`.
+    if hashkey(*args, **kwargs) in _results:
+        count_cache('results', True)
+    return _get_results(*args, **kwargs)
+
+
+@cached(_results)
+def _get_results(model, fpath, overwrite_cache=False, **kw):
     cache_fpath = get_cache_fpath(fpath, ext=('res', 'base', 'dill',))
 
-    if check_cache_fpath_exists(overwrite_cache, fpath, cache_fpath):
-        res = load_from_dill(cache_fpath)
+    hit = check_cache_fpath_exists(overwrite_cache, fpath, cache_fpath)
+    if count_cache('results', hit):
+        res = load_from_dill(cache_fpath, mmap_mode=CACHE_MMAP_MODE)
     else:
         kw = {k: v for k, v in kw.items() if k != 'plot_workflow'}
         res = deepcopy(_process_vehicle(model,
@@ -56,7 +77,9 @@ def define_new_inputs(data, base, dsp_model):
         if v is dsp_utl.EMPTY:
             remove.append(k)
 
-    dsp = dsp_model.get_sub_dsp_from_workflow(data, check_inputs=False)
+    dsp = dsp_model.get_sub_dsp_from_workflow(
+        data, check_inputs=False, cached=True
+    )
     n = set(base) - set(dsp.data_nodes)
     n.update(data)
 
@@ -69,11 +92,22 @@ def define_new_inputs(data, base, dsp_model):
     return d
 
 
-def make_simulation_plan(plan, timestamp, output_folder, main_flags):
-    model, summary = vehicle_processing_model(), {}
+def _save_plan_summary(summary, output_folder, timestamp, vehicle_name, n):
+    fpath = '%s-%s-plan_summary-%d.xlsx' % (timestamp, vehicle_name, n)
+    fpath = osp.join(output_folder, fpath)
+    start_time = datetime.strptime(timestamp, '%Y%m%d_%H%M%S')
+    log.info('Saving plan summary: %s', fpath)
+    _save_summary(fpath, start_time, summary)
+
+
+def make_simulation_plan(plan, timestamp, output_folder, main_flags,
+                         vehicle_name):
+    model, summary = vehicle_processing_model(), SummaryTable()
+    chunk_size, chunks = dfl.functions.make_simulation_plan.CHUNK_SIZE, 0
 
     run_modes = tuple(model.get_sub_dsp_from_workflow(
-        ('validated_data', 'vehicle_name'), check_inputs=False, graph=model.dmap
+        ('validated_data', 'vehicle_name'), check_inputs=False, graph=model.dmap,
+        cached=True
     ).data_nodes) + ('start_time', 'vehicle_name')
 
     kw = {
@@ -83,11 +117,15 @@ def make_simulation_plan(plan, timestamp, output_folder, main_flags):
     }
 
     kw, bases = dsp_utl.combine_dicts(main_flags, kw), set()
-    for (i, base_fpath, defaults_fpats), p in tqdm(plan, disable=False):
+    # The variations are consumed lazily (e.g., the sweeps) and the summary is
+    # saved in chunks when the plan is larger than the chunk size.
+    for n, ((i, base_fpath, defaults_fpats), p) in \
+            enumerate(tqdm(plan, disable=False), 1):
+        metrics.set('co2mpas_queue_depth', len(plan) - n, queue='plan')
         base = get_results(model, base_fpath, **kw)
         name = base['vehicle_name']
         if name not in bases:
-            _add2summary(summary, base.get('summary', {}))
+            summary.add(base.get('summary', {}))
             bases.add(name)
         name = '{}-{}'.format(name, i)
 
@@ -96,10 +134,10 @@ def make_simulation_plan(plan, timestamp, output_folder, main_flags):
         dsp_model = base['dsp_model']
         outputs = dsp_model.data_output
 
-        dfl = build_default_models(model, defaults_fpats, **kw)
-        if dfl:
-            dfl = {'data.prediction.models': dfl}
-            outputs = co2_utl.combine_nested_dicts(dfl, outputs, depth=2)
+        models = build_default_models(model, defaults_fpats, **kw)
+        if models:
+            models = {'data.prediction.models': models}
+            outputs = co2_utl.combine_nested_dicts(models, outputs, depth=2)
 
         inputs['validated_data'] = define_new_inputs(p, outputs, dsp_model)
         inputs.update(kw)
@@ -109,7 +147,19 @@ def make_simulation_plan(plan, timestamp, output_folder, main_flags):
         base_keys = {
             'vehicle_name': (defaults_fpats, base_fpath, name),
         }
-        _add2summary(summary, s, base_keys)
+        summary.add(s, base_keys)
+
+        if chunk_size and not n % chunk_size and n < len(plan):
+            chunks += 1
+            _save_plan_summary(summary, output_folder, timestamp, vehicle_name,
+                               chunks)
+            summary = SummaryTable()
+
+    if chunks:
+        if summary:
+            _save_plan_summary(summary, output_folder, timestamp, vehicle_name,
+                               chunks + 1)
+        return SummaryTable()
 
     return summary
 
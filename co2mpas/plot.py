@@ -12,8 +12,6 @@ import importlib
 import logging
 import sys
 import os.path as osp
-import matplotlib.pyplot as plt
-from co2mpas.dispatcher.utils.alg import stlp
 
 log = logging.getLogger(__name__)
 
@@ -187,6 +185,8 @@ def plot_time_series(
     :type y_label: dict
     """
 
+    import matplotlib.pyplot as plt
+    from co2mpas.dispatcher.utils.alg import stlp
     x_id = stlp(x_id)
     x, x_id = dsp.get_node(*x_id)
     if x_label is None:
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It contains classes and functions to collect the run telemetry.
+
+The metrics (counters, gauges, and histograms) are collected in-process and
+exported into a local file with the Prometheus text exposition format (v0.0.4),
+e.g., to be read by the textfile collector of the node exporter.
+
+Collected metrics:
+
+    - `co2mpas_vehicles_processed_total`: processed vehicles by status,
+    - `co2mpas_queue_depth`: items waiting in the batch and plan queues,
+    - `co2mpas_stage_duration_seconds`: latency histograms of the vehicle
+      processing stages,
+    - `co2mpas_cache_requests_total`: lookups of the input, results, and
+      memoised nodes caches by result (hit or miss),
+    - `co2mpas_calibration_evaluations_total`: error evaluations of the CO2
+      params calibrations,
+    - `co2mpas_calibration_evaluations_saved_total` and
+      `co2mpas_calibration_evaluations_extra_total`: error evaluations saved
+      and spent in excess by the warm-started calibrations, compared to their
+      cold-start reference.
+
+The ratios (i.e., vehicles per minute and cache hit ratios) are added as gauges
+when the metrics are exported.
+
+The vehicles are processed sequentially in a single process: there is no
+worker pool, hence no worker utilisation is exported.
+"""
+
+import collections
+import logging
+import math
+import os
+import os.path as osp
+import threading
+import time
+
+__all__ = ['Metrics', 'metrics', 'count_cache']
+
+log = logging.getLogger(__name__)
+
+#: Buckets of the latency histograms [s].
+BUCKETS = (.01, .05, .1, .5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+#: Type and help of the collected metrics.
+METRICS = collections.OrderedDict([
+    ('co2mpas_vehicles_processed_total', ('counter', 'Processed vehicles.')),
+    ('co2mpas_queue_depth', ('gauge', 'Items waiting to be processed.')),
+    ('co2mpas_stage_duration_seconds',
+     ('histogram', 'Duration of the vehicle processing stages.')),
+    ('co2mpas_cache_requests_total', ('counter', 'Cache lookups.')),
+    ('co2mpas_calibration_evaluations_total',
+     ('counter', 'Error evaluations of the CO2 params calibrations.')),
+    ('co2mpas_calibration_evaluations_saved_total',
+     ('counter', 'Error evaluations saved by warm-starting the CO2 params '
+                 'calibrations.')),
+    ('co2mpas_calibration_evaluations_extra_total',
+     ('counter', 'Error evaluations spent in excess by warm-starting the CO2 '
+                 'params calibrations.')),
+    ('co2mpas_vehicles_per_minute',
+     ('gauge', 'Processed vehicles per minute since the run start.')),
+    ('co2mpas_cache_hit_ratio', ('gauge', 'Ratio of the cache hits.'))
+])
+
+
+def _format_value(value):
+    if math.isnan(value):
+        return 'NaN'
+    elif math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    esc = str.maketrans({'\\': r'\\', '"': r'\"', '\n': r'\n'})
+    return '{%s}' % ','.join('%s="%s"' % (k, str(v).translate(esc))
+                             for k, v in labels)
+
+
+class Metrics(object):
+    """
+    In-process registry of the run metrics.
+
+    The updates are thread safe and cheap (i.e., a dictionary update), so the
+    metrics are always collected. They are exported only when the export file
+    is defined.
+
+    :param fpath:
+        Export file path.
+    :type fpath: str, optional
+
+    Example::
+
+        >>> m = Metrics()
+        >>> m.inc('co2mpas_vehicles_processed_total', status='ok')
+        >>> m.set('co2mpas_queue_depth', 3, queue='batch')
+        >>> print(m.exposition(derived=False))
+        # HELP co2mpas_vehicles_processed_total Processed vehicles.
+        # TYPE co2mpas_vehicles_processed_total counter
+        co2mpas_vehicles_processed_total{status="ok"} 1.0
+        # HELP co2mpas_queue_depth Items waiting to be processed.
+        # TYPE co2mpas_queue_depth gauge
+        co2mpas_queue_depth{queue="batch"} 3.0
+        <BLANKLINE>
+    """
+
+    def __init__(self, fpath=None):
+        self.fpath = fpath
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Removes the collected metrics and restarts the run time.
+        """
+        with self._lock:
+            self._values = collections.OrderedDict()  # name --> {labels: v}
+            self.start_time = self._flushed = time.time()
+
+    def _series(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            return self._values.setdefault(name, collections.OrderedDict())
+
+    def inc(self, name, value=1, **labels):
+        """
+        Increments a counter (or a gauge).
+
+        :param name:
+            Metric name.
+        :type name: str
+
+        :param value:
+            Increment.
+        :type value: float, optional
+
+        :param labels:
+            Labels of the metric.
+        :type labels: str
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series(name)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """
+        Sets a gauge.
+
+        :param name:
+            Metric name.
+        :type name: str
+
+        :param value:
+            Gauge value.
+        :type value: float
+
+        :param labels:
+            Labels of the metric.
+        :type labels: str
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series(name)[key] = value
+
+    def observe(self, name, value, **labels):
+        """
+        Adds an observation to a histogram.
+
+        :param name:
+            Metric name.
+        :type name: str
+
+        :param value:
+            Observed value.
+        :type value: float
+
+        :param labels:
+            Labels of the metric.
+        :type labels: str
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series(name)
+            try:
+                h = series[key]
+            except KeyError:
+                h = series[key] = [[0] * len(BUCKETS), 0.0, 0]
+            for i, b in enumerate(BUCKETS):
+                if value <= b:
+                    h[0][i] += 1
+            h[1] += value
+            h[2] += 1
+
+    def get(self, name, **labels):
+        """
+        Returns the value of a metric.
+
+        :param name:
+            Metric name.
+        :type name: str
+
+        :param labels:
+            Labels of the metric.
+        :type labels: str
+
+        :return:
+            Metric value (or None if not collected).
+        :rtype: float | list
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            return self._values.get(name, {}).get(key)
+
+    def _derived(self, values):
+        res = collections.OrderedDict()
+        n = sum(values.get('co2mpas_vehicles_processed_total', {}).values())
+        minutes = (time.time() - self.start_time) / 60
+        if minutes > 0:
+            res['co2mpas_vehicles_per_minute'] = {(): n / minutes}
+
+        hits = collections.defaultdict(lambda: [0, 0])
+        for k, n in values.get('co2mpas_cache_requests_total', {}).items():
+            k = dict(k)
+            hits[k['cache']][k['result'] != 'hit'] += n
+        res['co2mpas_cache_hit_ratio'] = collections.OrderedDict(
+            ((('cache', k),), h / (h + m)) for k, (h, m) in hits.items()
+        )
+        return res
+
+    def exposition(self, derived=True):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+
+        :param derived:
+            If to add the ratios (i.e., vehicles per minute and cache hit
+            ratios).
+        :type derived: bool, optional
+
+        :return:
+            Metrics text.
+        :rtype: str
+        """
+        with self._lock:
+            values = collections.OrderedDict(
+                (k, collections.OrderedDict(
+                    (l, [list(v[0])] + v[1:] if isinstance(v, list) else v)
+                    for l, v in s.items()
+                )) for k, s in self._values.items()
+            )
+        if derived:
+            values.update(self._derived(values))
+
+        lines = []
+        for name, series in values.items():
+            if not series:
+                continue
+            kind, doc = METRICS.get(name, ('untyped', name))
+            lines.append('# HELP %s %s' % (name, doc))
+            lines.append('# TYPE %s %s' % (name, kind))
+            for labels, v in series.items():
+                if kind != 'histogram':
+                    lines.append('%s%s %s' % (
+                        name, _format_labels(labels), _format_value(v)
+                    ))
+                    continue
+                for b, n in zip(BUCKETS + (float('inf'),), v[0] + [v[2]]):
+                    l = labels + (('le', _format_value(b)),)
+                    lines.append('%s_bucket%s %d' % (
+                        name, _format_labels(l), n
+                    ))
+                l = _format_labels(labels)
+                lines.append('%s_sum%s %s' % (name, l, _format_value(v[1])))
+                lines.append('%s_count%s %d' % (name, l, v[2]))
+        lines.append('')
+        return '\n'.join(lines)
+
+    def write(self, fpath=None):
+        """
+        Writes the metrics into a file.
+
+        The file is replaced atomically, so that a scraper never reads a
+        partial file.
+
+        :param fpath:
+            Export file path. If None, it is used the one of the registry.
+        :type fpath: str, optional
+        """
+        fpath = fpath or self.fpath
+        tmp = osp.join(osp.dirname(fpath) or '.',
+                       '.%s.%d.tmp' % (osp.basename(fpath), os.getpid()))
+        with open(tmp, 'w', newline='\n') as f:
+            f.write(self.exposition())
+        os.replace(tmp, fpath)
+        self._flushed = time.time()
+
+    def flush(self, force=False):
+        """
+        Writes the metrics into the export file, if defined, at most every
+        `dfl.functions.flush_metrics.INTERVAL` seconds.
+
+        The write errors are logged, so that the run is not interrupted.
+
+        :param force:
+            If to write the metrics regardless of the interval.
+        :type force: bool, optional
+        """
+        if self.fpath:
+            from .model.physical.defaults import dfl
+            interval = dfl.functions.flush_metrics.INTERVAL
+            if force or time.time() - self._flushed >= interval:
+                try:
+                    self.write()
+                except OSError as ex:
+                    self._flushed = time.time()  # Retry after the interval.
+                    log.warning('Metrics not written into %s: %s',
+                                self.fpath, ex)
+
+
+#: Metrics registry of the process.
+metrics = Metrics()
+
+
+def count_cache(cache, hit):
+    """
+    Counts a cache lookup.
+
+    :param cache:
+        Cache name (e.g., `input`, `results`, `cycle_profiles`).
+    :type cache: str
+
+    :param hit:
+        If the lookup was a hit.
+    :type hit: bool
+
+    :return:
+        The lookup result.
+    :rtype: bool
+    """
+    metrics.inc('co2mpas_cache_requests_total', cache=cache,
+                result='hit' if hit else 'miss')
+    return hit
+
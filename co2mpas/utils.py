@@ -21,9 +21,6 @@ import math
 from statistics import median_high
 import sys
 
-from scipy.interpolate import InterpolatedUnivariateSpline
-from scipy.misc import derivative as scipy_derivative
-from sklearn.metrics import mean_absolute_error
 
 import co2mpas.dispatcher.utils as dsp_utl
 import numpy as np
@@ -39,7 +36,7 @@ except AttributeError:
 __all__ = [
     'grouper', 'sliding_window', 'median_filter', 'reject_outliers',
     'bin_split', 'interpolate_cloud', 'clear_fluctuations', 'argmax',
-    'derivative'
+    'derivative', 'calibrate_multi_start'
 ]
 
 
@@ -467,6 +464,7 @@ def interpolate_cloud(x, y):
     else:
         x, y = ([0, 1], [np.mean(y)] * 2)
 
+    from scipy.interpolate import InterpolatedUnivariateSpline
     return InterpolatedUnivariateSpline(x, y, k=1)
 
 
@@ -515,6 +513,7 @@ def clear_fluctuations(times, gears, dt_window):
 
 
 def _err(v, y1, y2, r, l):
+    from sklearn.metrics import mean_absolute_error
     return mean_absolute_error(_ys(y1, v) + _ys(y2, l - v), r)
 
 
@@ -538,6 +537,61 @@ def derivative(x, y, dx=1, order=3, k=1):
     :param k:
     :return:
     """
+    from scipy.interpolate import InterpolatedUnivariateSpline
+    from scipy.misc import derivative as scipy_derivative
     func = InterpolatedUnivariateSpline(x, y, k=k)
 
     return scipy_derivative(func, x, dx=dx, order=order)
+
+
+def calibrate_multi_start(calibrate, starts, tol=None, default=None):
+    """
+    Calibrates a model from multiple starting points and returns the best one.
+
+    The starting points are calibrated sequentially (a plain loop, not
+    concurrently), keeping the result with the minimum error. Ties are
+    resolved by the order of the starting points.
+
+    :param calibrate:
+        Calibration function. It takes a starting point and returns the
+        calibration error and the calibrated model (or None to skip it).
+    :type calibrate: function
+
+    :param starts:
+        Starting points of the calibration.
+    :type starts: iterable
+
+    :param tol:
+        Stops the search when the best error is lower or equal to `tol`.
+    :type tol: float, optional
+
+    :param default:
+        Value returned when no calibration is available.
+    :type default: T, optional
+
+    :return:
+        The calibration error and the calibrated model with the minimum error.
+    :rtype: (float, T)
+
+    Example::
+
+        >>> calibrate = lambda x0: (abs(x0 - 3), x0)
+        >>> calibrate_multi_start(calibrate, [5, 2, 4, 3, 1], tol=0)
+        (0, 3)
+        >>> calibrate_multi_start(calibrate, [5, 2, 4])
+        (1, 2)
+    """
+
+    best, best_key = default, None
+    for i, res in enumerate(map(calibrate, starts)):
+        if res is None:
+            continue
+
+        key = (res[0], i)  # Ties are resolved by the order of the starts.
+        if best_key is None or key < best_key:
+            best, best_key = res, key
+
+        if tol is not None and best_key[0] <= tol:
+            break
+
+    return best
@@ -185,7 +185,7 @@ setup(
         'tqdm',
         'pyyaml',
         'cycler',
-        'pip',
+        'setuptools',
         'boltons',
         'pykalman',
         'wltp',
@@ -197,6 +197,7 @@ setup(
             'ipynbs/*.ipynb',
             'co2mpas_template.xlsx',
             'datasync_template.xlsx',
+            'io/model_metadata.json',
     ]},
     include_package_data=True,
     zip_safe=True,
@@ -12,7 +12,8 @@ import timeit
 import numpy as np
 from co2mpas.dispatcher import Dispatcher
 from co2mpas.dispatcher.utils.cst import START, EMPTY, SINK, NONE
-from co2mpas.dispatcher.utils.dsp import SubDispatchFunction
+from co2mpas.dispatcher.utils.dsp import SubDispatchFunction, SubDispatch, \
+    add_args
 
 def _setup_dsp():
     dsp = Dispatcher()
@@ -417,6 +418,40 @@ class TestSubDMap(unittest.TestCase):
         dfl = {'value': 3, 'initial_dist': 0.0}
         self.assertEqual(sub_dmap.default_values['b'], dfl)
 
+    def test_cached_sub_dsp(self):
+        dsp = self.dsp
+
+        sub_dsp = dsp.get_sub_dsp_from_workflow(['a', 'b'], cached=True)
+        res = dsp.get_sub_dsp_from_workflow(['a', 'b'])
+        self.assertEqual(sub_dsp.dmap.node, res.dmap.node)
+        self.assertEqual(len(dsp._sub_dsp_cache), 1)
+
+        # The cached sub-dispatcher is not modified by the returned copies.
+        sub_dsp.add_data('z', default_value=0)
+        sub_dsp.dmap.remove_node('a')
+        res = dsp.get_sub_dsp_from_workflow(['a', 'b'], cached=True)
+        self.assertIsNot(sub_dsp, res)
+        self.assertEqual(res.dmap.node, dsp.get_sub_dsp_from_workflow(
+            ['a', 'b']).dmap.node)
+        self.assertNotIn('z', res.default_values)
+
+        shrink_dsp = dsp.shrink_dsp(['a', 'b'], ['d'], cached=True)
+        res = dsp.shrink_dsp(['a', 'b'], ['d'])
+        self.assertEqual(shrink_dsp.dmap.node, res.dmap.node)
+        self.assertEqual(shrink_dsp.dmap.edge, res.dmap.edge)
+        self.assertEqual(len(dsp._sub_dsp_cache), 2)
+
+        # The workflow has been changed by the dispatch.
+        dsp.get_sub_dsp_from_workflow(['a', 'b'], cached=True)
+        self.assertEqual(len(dsp._sub_dsp_cache), 3)
+
+        # The cache is cleared when a default value or a node is set.
+        dsp.set_default_value('b', 1)
+        self.assertEqual(len(dsp._sub_dsp_cache), 0)
+        dsp.shrink_dsp(['a', 'b'], ['d'], cached=True)
+        dsp.add_data('f')
+        self.assertEqual(len(dsp._sub_dsp_cache), 0)
+
 
 class TestPerformance(unittest.TestCase):
     def test_stress_tests(self):
@@ -962,6 +997,22 @@ class TestDispatch(unittest.TestCase):
         dsp = self.dsp_raises
         self.assertRaises(ValueError, dsp.dispatch, inputs={'a': 0})
 
+    def test_compact(self):
+        inputs = {'a': 6, 'b': 5, 'd': 0, 'e': 2}
+        for dsp in (self.dsp, self.dsp_wildcard_1, self.dsp_of_dsp_2,
+                    self.dsp_of_dsp_3):
+            res = []
+            for compact in (False, True):
+                dsp.compact = compact
+                o = dsp.dispatch(inputs=inputs)
+                res.append((dict(o), dict(dsp.dist),
+                            sorted(dsp.workflow.edges())))
+            self.assertEqual(res[0], res[1])
+            self.assertIsNotNone(dsp._adjacency)
+
+            dsp.add_data('z')
+            self.assertIsNone(dsp._adjacency)
+
     def test_input_dists(self):
         dsp = self.dsp_cutoff
 
@@ -1537,3 +1588,62 @@ class TestPipe(unittest.TestCase):
         e = 'Failed DISPATCHING \'dict\' due to:\n  ' \
             'TypeError("\'int\' object is not iterable",)'
         self.assertEqual(e, n['sub_pipe']['dict']['error'])
+
+    def test_lean(self):
+        sub_dsp = Dispatcher()
+        sub_dsp.add_function('max', max, ['a', 'b'], ['c'])
+        sub_dsp.add_function('min', min, ['c', 'b'], ['d'])
+        f = SubDispatchFunction(sub_dsp, 'f', ['a', 'b'], ['d'])
+
+        dsp = Dispatcher()
+        dsp.add_function('f', f, ['a', 'b'], ['d'])
+
+        res = dict(dsp.dispatch(inputs={'a': 3, 'b': 2}))
+        pipe = dsp.pipe
+        self.assertEqual(f.data_output, {'a': 3, 'b': 2, 'c': 3, 'd': 2})
+
+        self.assertEqual(res, dsp.dispatch(inputs={'a': 3, 'b': 2}, lean=True))
+        self.assertEqual(list(pipe), list(dsp.pipe))
+        self.assertEqual(list(pipe['f']['sub_pipe']),
+                         list(dsp.pipe['f']['sub_pipe']))
+        self.assertEqual(f.data_output, {})
+        self.assertFalse(any('value' in d for u, v, d in
+                             f.workflow.edges(data=True)))
+
+        dsp = self.dsp
+        pipe = dsp.pipe
+        dsp.dispatch(lean=True)
+        self.assertEqual(list(pipe), list(dsp.pipe))
+
+    def test_lean_dsp_model(self):
+        inner = Dispatcher()
+        inner.add_function('max', max, ['a', 'b'], ['c'])
+        inner.add_function('min', min, ['c', 'b'], ['d'])
+        inner.add_function('snapshot', lambda d: sorted(inner.data_output),
+                           ['d'], ['s'])
+
+        model = Dispatcher(name='model')
+        model.add_dispatcher(inner, {'a': 'a', 'b': 'b'},
+                             {'d': 'd', 's': 's'}, dsp_id='inner')
+        model.add_function('double', lambda x: 2 * x, ['d'], ['e'])
+
+        dsp = Dispatcher()
+        dsp.add_function(
+            'model',
+            add_args(SubDispatch(model, ['e', 's'], output_type='dsp')),
+            ['flag', 'inputs'], ['dsp_model']
+        )
+
+        inputs = {'flag': True, 'inputs': {'a': 3, 'b': 2}}
+        dsp_model = dsp.dispatch(inputs)['dsp_model']
+        self.assertEqual(dsp_model.data_output['s'], ['a', 'b', 'c', 'd'])
+        pipe = list(dsp_model.pipe)
+
+        dsp_model = dsp.dispatch(inputs, lean=True)['dsp_model']
+        self.assertIs(dsp_model, model)
+        # Values released during the dispatch once used.
+        self.assertEqual(dsp_model.data_output, {'e': 4, 's': ['d']})
+        self.assertFalse(any('value' in d for u, v, d in
+                             dsp_model.workflow.edges(data=True)))
+        self.assertEqual(inner.data_output, {})
+        self.assertEqual(list(dsp_model.pipe), pipe)
@@ -157,3 +157,41 @@ class TestSubDispatchFunction(unittest.TestCase):
 
         self.assertRaises(TypeError, fun, 2, 1, a=2, b=2)
         self.assertRaises(TypeError, fun, 2, 1, a=2, b=2, e=0)
+
+
+class TestSubDispatchPipe(unittest.TestCase):
+    def setUp(self):
+        dsp = Dispatcher()
+
+        def f(a, b):
+            return a + b, a - b
+
+        dsp.add_function(function=f, inputs=['a', 'b'], outputs=['c', 'd'])
+        dsp.add_function(function=max, inputs=['c', 'd'], outputs=['e'])
+        dsp.add_data('e', filters=[lambda x: x * 2])
+        dsp.add_function(function=min, inputs=['e', 'b'], outputs=['a'])
+        self.dsp = dsp
+
+    def test_compiled(self):
+        args = ('pipe', ['a', 'b'], ['a', 'c', 'e'])
+        fun = SubDispatchPipe(self.dsp, *args)
+        c_fun = SubDispatchPipe(self.dsp, *args, compiled=True)
+        self.assertIsNotNone(c_fun.compiled_pipe)
+
+        for a, b in ((2, 1), (-3, 5), (1, 1)):
+            self.assertEqual(fun(a, b), c_fun(a, b))
+
+    def test_map_over(self):
+        args = ('pipe', ['a', 'b'], ['a', 'e'])
+        fun = SubDispatchPipe(self.dsp, *args)
+        c_fun = SubDispatchPipe(self.dsp, *args, compiled=True)
+
+        b, res, a = [3, 1, 4, 1, 5], [], 2
+        for v in b:
+            res.append(fun(a, v))
+            a = res[-1][0]
+
+        kw = dict(constants={'a': 2}, carry={'a': 'a'})
+        self.assertEqual(fun.map_over({'b': b}, **kw), res)
+        self.assertEqual(c_fun.map_over({'b': b}, **kw), res)
+        self.assertRaises(TypeError, fun.map_over, {'b': b})
@@ -9,6 +9,8 @@
 import doctest
 import unittest
 import platform
+import dill
+import numpy as np
 
 if platform.python_implementation() != "PyPy":
     from tempfile import mkstemp
@@ -74,4 +76,27 @@ if platform.python_implementation() != "PyPy":
                 dsp.dmap.degree(self.fun_id), self.dsp.dmap.degree(self.fun_id)
             )
             self.assertEqual(dsp.dmap.node[self.fun_id]['function'](1), 2)
-            self.assertEqual(dsp.dispatch()['b'], 6)
\ No newline at end of file
+            self.assertEqual(dsp.dispatch()['b'], 6)
+
+        def test_pickle(self):
+            a = np.arange(1000.0)
+            data = {'a': a, 'b': [a, a[::2]], 'f': np.asfortranarray(
+                np.ones((30, 20))), 'dsp': self.dsp, 'c': np.arange(3)}
+
+            with open(self.tmp, 'wb') as f:
+                dump_pickle(data, f)
+
+            for mmap_mode in (None, 'r', 'c'):
+                with open(self.tmp, 'rb') as f:
+                    res = load_pickle(f, mmap_mode=mmap_mode)
+                self.assertIs(res['a'], res['b'][0])
+                np.testing.assert_array_equal(res['b'][1], a[::2])
+                self.assertTrue(res['f'].flags.f_contiguous)
+                self.assertEqual(res['a'].flags.writeable, mmap_mode != 'r')
+                self.assertEqual(res['dsp'].dispatch()['b'], 6)
+
+            with open(self.tmp, 'wb') as f:
+                dill.dump(data, f)
+
+            with open(self.tmp, 'rb') as f:
+                np.testing.assert_array_equal(load_pickle(f)['a'], a)
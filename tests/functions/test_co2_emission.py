@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import os
+import tempfile
+import unittest
+from itertools import chain
+from unittest.mock import patch
+import ddt
+import lmfit
+import numpy as np
+import numpy.testing as npt
+from scipy.integrate import trapz
+from co2mpas.model.physical.engine import co2_emission as co2
+from co2mpas.telemetry import metrics
+
+
+def _calculate_cumulative_co2(times, phases_integration_times, co2_emissions):
+    # Reference implementation with trapz over the phase slices.
+    res = []
+    for p in phases_integration_times:
+        i, j = np.searchsorted(times, p)
+        res.append(trapz(co2_emissions[i:j], times[i:j]))
+    return np.array(res)
+
+
+def _calculate_extended_integration_times(
+        times, velocities, on_engine, phases_integration_times, stop_velocity):
+    # Reference implementation with rescans.
+    lv, pit = velocities <= stop_velocity, phases_integration_times
+    pit = set(chain(*pit))
+    hv = np.logical_not(lv)
+    j, l, phases = np.argmax(hv), len(lv), []
+    while j < l:
+        i = np.argmax(lv[j:]) + j
+        j = np.argmax(hv[i:]) + i
+
+        if i == j:
+            break
+
+        t0, t1 = times[i], times[j]
+        if t1 - t0 < 20 or any(t0 <= x <= t1 for x in pit):
+            continue
+
+        b = np.logical_not(on_engine[i:j])
+        if b.any() and not b.all():
+            t = np.median(times[i:j][b])
+        else:
+            t = (t0 + t1) / 2
+        phases.append(t)
+    return phases
+
+
+def _calculate_extended_cumulative_co2_emissions(
+        times, on_engine, extended_integration_times,
+        co2_normalization_references, phases_integration_times,
+        phases_co2_emissions, phases_distances):
+    # Reference implementation with trapz over the phase slices.
+    r = co2_normalization_references.copy()
+    r[np.logical_not(on_engine)] = 0
+    _cco2, phases = [], []
+    cco2 = phases_co2_emissions * phases_distances
+
+    for cco2, (t0, t1) in zip(cco2, phases_integration_times):
+        i, j = np.searchsorted(times, (t0, t1))
+        if i == j:
+            continue
+        v = trapz(r[i:j], times[i:j])
+        c = [0.0]
+
+        p = [t for t in extended_integration_times if t0 < t < t1]
+
+        for k, t in zip(np.searchsorted(times, p), p):
+            phases.append((t0, t))
+            t0 = t
+            c.append(trapz(r[i:k], times[i:k]) / v)
+        phases.append((t0, t1))
+        c.append(1.0)
+
+        _cco2.extend(np.diff(c) * cco2)
+
+    return np.array(_cco2), phases
+
+
+def _random_cycle(seed):
+    rnd = np.random.RandomState(seed)
+    n = rnd.randint(2, 1500)
+    times = np.cumsum(rnd.uniform(0.5, 1.5, n))
+    velocities = np.repeat(rnd.choice([0.0, 30.0], n), rnd.randint(1, 60, n))
+    on_engine = rnd.rand(n) > 0.3
+    pit = np.sort(rnd.uniform(times[0] - 10, times[-1] + 10, 6)).reshape(3, 2)
+    pit = tuple(map(tuple, pit)) + ((times[1], times[1]),)
+    return times, velocities[:n], on_engine, pit, rnd.rand(n) * 3
+
+
+@ddt.ddt
+class TestPhasesIntegration(unittest.TestCase):
+    @ddt.data(*range(50))
+    def test_cumulative_co2(self, seed):
+        times, vel, on_engine, pit, co2_emissions = _random_cycle(seed)
+        npt.assert_allclose(
+            co2.calculate_cumulative_co2(times, pit, co2_emissions),
+            _calculate_cumulative_co2(times, pit, co2_emissions),
+            rtol=1e-10
+        )
+
+    @ddt.data(*range(50))
+    def test_extended_integration_times(self, seed):
+        times, vel, on_engine, pit, _ = _random_cycle(seed)
+        args = times, vel, on_engine, pit
+        self.assertEqual(
+            co2.calculate_extended_integration_times(
+                *args, np.zeros_like(times), (0, np.inf), 1.0),
+            sorted(_calculate_extended_integration_times(*args, 1.0))
+        )
+
+    @ddt.data(*range(50))
+    def test_extended_cumulative_co2_emissions(self, seed):
+        times, vel, on_engine, pit, refs = _random_cycle(seed)
+        pit = pit[:-1]
+        ext = co2.calculate_extended_integration_times(
+            times, vel, on_engine, pit, np.zeros_like(times), (0, np.inf), 1.0
+        )
+        args = times, on_engine, ext, refs, pit, np.arange(1.0, 4.0), 2.0
+        res = co2.calculate_extended_cumulative_co2_emissions(*args)
+        ref = _calculate_extended_cumulative_co2_emissions(*args)
+        npt.assert_allclose(res[0], ref[0], rtol=1e-8)
+        self.assertEqual(res[1], ref[1])
+
+
+class _Result(object):
+    def __init__(self, params, success):
+        self.params, self.success = params, success
+
+
+class TestWarmStart(unittest.TestCase):
+    def setUp(self):
+        co2._co2_params_caches.clear()
+        self.params = lmfit.Parameters()
+        self.params.add('a', value=1.0)
+
+    def test_cache_key(self):
+        self.assertEqual(
+            co2.define_co2_params_cache_key('compression', 'diesel', 1598.0),
+            co2.define_co2_params_cache_key('compression', 'diesel', 1620.0)
+        )
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as d:
+            fpath = os.path.join(d, 'cache', 'co2_params.json')
+            self.assertIsNone(co2.get_cached_co2_params(fpath, 'k'))
+            co2.cache_co2_params(fpath, 'k', {'a': 1.0, 'b': 2.0}, 100)
+            co2.cache_co2_params(fpath, 'k', {'a': 3.0}, 10)
+            co2._co2_params_caches.clear()  # Reload from the file.
+            self.assertEqual(co2.get_cached_co2_params(fpath, 'k'),
+                             {'params': {'a': 3.0, 'b': 2.0}, 'nfev': 100})
+
+    def _minimize(self, *success):
+        calls, success = [], list(success)
+
+        def _minimize(fcn, params, method='leastsq', **kw):
+            calls.append(method)
+            return _Result(params, success.pop(0))
+
+        return calls, patch.object(co2, '_minimize', _minimize)
+
+    def test_fallback(self):
+        calls, p = self._minimize(False, True)
+        with p:
+            res = co2.calibrate_model_params(
+                lambda p: 0, self.params, methods=('lbfgsb', 'nelder')
+            )
+        self.assertEqual(calls, ['lbfgsb', 'nelder'])
+        self.assertTrue(res[1])
+
+    def test_adaptive_methods(self):
+        n = co2.dfl.functions.calibrate_model_params.MIN_ATTEMPTS
+        stats = {'lbfgsb': [0, n]}
+        calls, p = self._minimize(True, True)
+        with p:
+            for solvers_stats in (stats, None):  # Skipped only with stats.
+                co2.calibrate_model_params(
+                    lambda p: 0, self.params, methods=('lbfgsb', 'nelder'),
+                    solvers_stats=solvers_stats
+                )
+        self.assertEqual(calls, ['nelder', 'lbfgsb'])
+        self.assertEqual(stats, {'lbfgsb': [0, n], 'nelder': [1, 1]})
+
+    def test_solvers_stats(self):
+        with tempfile.TemporaryDirectory() as d:
+            fpath = os.path.join(d, 'co2_params.json')
+            stats = co2.get_solvers_stats(fpath)
+            stats['lbfgsb'] = [1, 2]  # A copy: the cache is not changed.
+            self.assertEqual(co2.get_solvers_stats(fpath), {})
+
+            co2.update_solvers_stats(fpath, stats)
+            co2.update_solvers_stats(fpath, {'lbfgsb': [2, 4]}, stats)
+            co2.cache_co2_params(fpath, 'k', {'a': 1.0}, 100)
+            co2._co2_params_caches.clear()  # Reload from the file.
+            self.assertEqual(co2.get_solvers_stats(fpath), {'lbfgsb': [2, 4]})
+            other = os.path.join(d, 'other.json')
+            self.assertEqual(co2.get_solvers_stats(other), {})
+
+    def test_evaluations_metrics(self):
+        params = lmfit.Parameters()
+        for k in ('a2', 'b2', 'a', 'b', 'c', 'l', 'l2', 't0', 't1', 'trg'):
+            params.add(k, value=1.0, min=0, max=10)
+        nfev = []
+
+        def calibrate_model_params(error_function, p, methods=None,
+                                   solvers_stats=None, **kws):
+            for i in range(nfev[0]):
+                error_function(p)
+            stats = solvers_stats.setdefault(methods[0], [0, 0])
+            stats[0] += 1
+            stats[1] += 1
+            return p, True
+
+        def calibrate(n):
+            nfev[:] = [n]
+            co2.calibrate_co2_params(
+                np.full(10, 90.0), lambda p, **kw: 0, lambda p, **kw: 0,
+                params, True, co2_params_cache_key='k'
+            )
+            name = 'co2mpas_calibration_evaluations_%s_total'
+            return [metrics.get(name % k) or 0 for k in ('saved', 'extra')]
+
+        par = co2.dfl.functions.calibrate_co2_params
+        metrics.reset()
+        with tempfile.TemporaryDirectory() as d, \
+                patch.object(par, 'CACHE_FPATH', os.path.join(d, 'c.json')), \
+                patch.object(co2, 'restrict_bounds', lambda p: p), \
+                patch.object(co2, 'calibrate_model_params',
+                             calibrate_model_params):
+            self.assertEqual(calibrate(10), [0, 0])  # Cold start: 20 evals.
+            self.assertEqual(calibrate(15), [0, 10])
+            self.assertEqual(calibrate(5), [10, 10])
+            stats = co2.get_solvers_stats(par.CACHE_FPATH)
+            self.assertEqual(sum(v[1] for v in stats.values()), 6)
+
+    @unittest.skipIf(not hasattr(lmfit.minimizer, 'HAS_SCALAR_MIN'),
+                     'The installed lmfit is not supported by `_Minimizer`.')
+    def test_calibrate_model_params(self):
+        params = lmfit.Parameters()
+        params.add('a', value=1.0, min=-10, max=10)
+        params.add('b', value=0.0, min=-10, max=10)
+
+        def error_function(p):
+            return (p['a'].value - 3) ** 2 + (p['b'].value + 1) ** 2
+
+        stats = {}
+        p, success = co2.calibrate_model_params(
+            error_function, params, methods=('lbfgsb', 'nelder'),
+            solvers_stats=stats
+        )
+        self.assertTrue(success)
+        self.assertAlmostEqual(p['a'].value, 3, places=3)
+        self.assertAlmostEqual(p['b'].value, -1, places=3)
+        self.assertEqual(stats, {'lbfgsb': [1, 1]})
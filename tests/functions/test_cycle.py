@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import numpy as np
+import numpy.testing as npt
+from scipy.interpolate import InterpolatedUnivariateSpline as Spline
+import co2mpas.model.physical.cycle as cyl
+import co2mpas.model.physical.cycle.WLTP as wltp
+from co2mpas.model.physical.cycle.NEDC import nedc_gears, nedc_velocities
+from co2mpas.model.physical.defaults import dfl
+
+
+class TestCachedProfile(unittest.TestCase):
+    def setUp(self):
+        cyl._profiles.clear()
+        self.times = np.arange(0, 1181.0)
+
+    def test_cached_profile(self):
+        res = nedc_gears(self.times, 5, k5=1)
+        self.assertEqual(len(cyl._profiles), 1)
+        npt.assert_array_equal(res, nedc_gears.__wrapped__(self.times, 5, k5=1))
+
+        res[:] = -1  # The cached profile is not modified.
+        npt.assert_array_equal(
+            nedc_gears(self.times, 5, k5=1),
+            nedc_gears.__wrapped__(self.times, 5, k5=1)
+        )
+        self.assertEqual(len(cyl._profiles), 1)
+
+        nedc_gears(self.times, 6, k5=1)
+        nedc_gears(self.times[:-1], 5, k5=1)
+        nedc_velocities(self.times, 'manual')
+        self.assertEqual(len(cyl._profiles), 4)
+
+    def test_wltp_gears(self):
+        v = np.concatenate((np.linspace(0, 50, 30), np.linspace(50, 0, 30)))
+        a = np.gradient(v / 3.6)
+        p = 0.5 * v * np.maximum(a, 0) + 0.02 * v
+        x = np.linspace(0, 1.2, 13)
+        base = wltp.define_wltp_base_model(dfl.values.wltp_base_model)
+        svr = {0: 0, 1: 120, 2: 75, 3: 50, 4: 40, 5: 32}
+
+        def gears(full_load_powers):
+            flc = Spline(x, full_load_powers, k=1)
+            args = svr, (800, 50), 6000, 80, base
+            return wltp.wltp_gears(flc, v, a, p, *args)
+
+        res = gears(np.minimum(x + 0.1, 1))
+        self.assertEqual(len(cyl._profiles), 1)
+        npt.assert_array_equal(gears(np.minimum(x + 0.1, 1)), res)
+        self.assertEqual(len(cyl._profiles), 1)
+
+        # The full load curve is keyed by its values.
+        gears(np.minimum(x + 0.05, 1))
+        self.assertEqual(len(cyl._profiles), 2)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import os.path as osp
+import unittest
+import ddt
+import numpy as np
+import numpy.testing as npt
+import pandas as pd
+import co2mpas
+from co2mpas.model.physical import electrics as elc
+
+
+def _identify_charging_statuses(
+        times, alternator_currents, gear_box_powers_in, on_engine,
+        alternator_current_threshold, starts_windows,
+        alternator_initialization_time):
+    # Reference implementation with rescans.
+    gb_p = gear_box_powers_in
+
+    status = np.zeros_like(alternator_currents, dtype=int)
+    status[(alternator_currents < alternator_current_threshold) & on_engine] = 2
+    off = ~on_engine | starts_windows
+
+    b1 = -1
+
+    n = len(on_engine) - 1
+
+    def _rollback(i):
+        i -= 1
+        while i > 0 and status[i] == 0:
+            i -= 1
+        while i > 0 and status[i] == 2:
+            i -= 1
+        return i
+
+    for b0, (s, p) in enumerate(zip(status, gb_p)):
+        if s == 2 and p >= 0 and b0 >= b1:
+            b1 = b0
+
+            while b1 < n and (status[b1] or off[b1]):
+                b1 += 1
+
+            if b1 != n:
+                while b1 > b0 and gb_p[b1] <= 0 and not off[b1]:
+                    b1 -= 1
+
+            if b1 > b0:
+                while b0 > 1 and status[b0 - 1] == 2:
+                    b0 -= 1
+                i = _rollback(b0)
+                if i == 0 or status[i] == 1:
+                    b0 = i
+                status[b0:b1 + 1] = 1
+
+    i = _rollback(n + 1)
+    if status[i] == 1:
+        status[i:n] = 1
+
+    elc._set_alt_init_status(times, alternator_initialization_time, status)
+
+    return status
+
+
+def _random_signals(seed):
+    rnd = np.random.RandomState(seed)
+    n = rnd.randint(2, 400)
+    times = np.arange(n, dtype=float)
+
+    # Run-length encoded signals with frequent alternations.
+    def _runs(values, p):
+        v = rnd.choice(values, size=n, p=p)
+        return np.repeat(v, rnd.randint(1, 6, size=n))[:n]
+
+    currents = _runs([-10.0, -1.0, 0.0], [0.4, 0.3, 0.3])
+    powers = _runs([-5.0, 0.0, 5.0], [0.4, 0.2, 0.4])
+    on_engine = _runs([True, False], [0.8, 0.2])
+    starts_windows = _runs([True, False], [0.1, 0.9])
+    return times, currents, powers, on_engine, -0.5, starts_windows
+
+
+@ddt.ddt
+class TestChargingStatuses(unittest.TestCase):
+    @ddt.data(*range(200))
+    def test_random(self, seed):
+        args = _random_signals(seed)
+        init_time = (0.0, 5.0)[seed % 2]
+        npt.assert_array_equal(
+            elc.identify_charging_statuses(*args, init_time),
+            _identify_charging_statuses(*args, init_time)
+        )
+
+    @ddt.data('WLTP-H', 'WLTP-L', 'NEDC-H', 'NEDC-L')
+    def test_recorded(self, sheet):
+        fpath = osp.join(osp.dirname(co2mpas.__file__), 'demos',
+                         'co2mpas_demo-1.xlsx')
+        df = pd.read_excel(fpath, sheet, header=1)
+        if 'alternator_currents' not in df:
+            self.skipTest('No recorded alternator currents.')
+        times = df['times'].values.astype(float)
+        currents = df['alternator_currents'].values.astype(float)
+        powers = df['target engine_powers_out'].values.astype(float)
+        on_engine = df['engine_speeds_out'].values.astype(float) > 300
+        engine_starts = np.append(~on_engine[:-1] & on_engine[1:], False)
+        for thr in np.percentile(currents, (10, 30, 50)):
+            starts = elc.identify_alternator_starts_windows(
+                times, engine_starts, currents, 4.0, thr
+            )
+            args = times, currents, powers, on_engine, thr, starts, 0.0
+            npt.assert_array_equal(
+                elc.identify_charging_statuses(*args),
+                _identify_charging_statuses(*args)
+            )
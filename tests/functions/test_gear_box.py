@@ -196,3 +196,17 @@ class TestGearBox_v1(unittest.TestCase):
         self.assertTrue(np.allclose(res[0], v + 1, 0, 0.001))
         self.assertTrue(np.allclose(res[1], self.tgb, 0, 0.001))
         self.assertTrue(np.allclose(res[2], v + self.st, 0, 0.001))
+
+    def test_calculate_gear_box_efficiency_reference(self):
+        fun = calculate_gear_box_efficiencies_torques_temperatures
+        n = 100
+        wp, es = np.tile(self.wp, n), np.tile(self.es, n)
+        ws, tgb = np.tile(self.ws, n), np.tile(self.tgb, n)
+        g = np.arange(wp.shape[0]) % 3
+
+        for gbc in (self.gbc, 10.0):
+            a = (wp, es, ws, tgb, self.pa, gbc, self.ts, self.Tr, self.st)
+            for kw in ({}, {'gears': g, 'gear_box_ratios': self.gbr}):
+                res, ref = fun(*a, **kw), fun(*a, reference=True, **kw)
+                for r, v in zip(res, ref):
+                    np.testing.assert_array_equal(r, v)
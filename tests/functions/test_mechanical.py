@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import ddt
+import numpy as np
+import numpy.testing as npt
+from co2mpas.model.physical.gear_box import calculate_gear_shifts
+from co2mpas.model.physical.gear_box import mechanical as mec
+
+
+def _identify_gear(idle, vsr, stop_vel, plateau_acc, ratio, vel, acc):
+    # Reference implementation sample by sample.
+    if vel <= stop_vel:
+        return 0
+
+    m, (gear, vs) = min((abs(v - ratio), (k, v)) for k, v in vsr)
+
+    if acc < 0 and (vel <= idle[0] * vs or abs(vel / idle[1] - ratio) < m):
+        return 0
+
+    if gear == 0 and ((vel > stop_vel and acc > 0) or acc > plateau_acc):
+        return 1
+
+    return gear
+
+
+def _correct_gear_shifts(
+        times, ratios, gears, velocity_speed_ratios, shift_window=4.0):
+    # Reference implementation with a grid search for each shift.
+    shifts = calculate_gear_shifts(gears)
+    s = len(gears)
+
+    def err(v, r):
+        if v < 1:
+            return np.inf
+        return np.mean(np.abs(ratios[slice(v - 1, v + 1, 1)] - r))
+
+    k = 0
+    new_gears = np.zeros_like(gears)
+    dt = shift_window / 2
+    for i in np.arange(s)[shifts]:
+        g = gears[slice(i - 1, i + 1, 1)]
+        if g[0] != 0 and g[-1] != 0:
+            t = times[i]
+            n = max(i - sum(((t - dt) <= times) & (times <= t)), k)
+            m = min(i + sum((t <= times) & (times <= (t + dt))), s)
+            r = [velocity_speed_ratios.get(v, 0) for v in g]
+            j = min(range(n, max(m, n + 1)), key=lambda v: err(v, r))
+            j = min(j, s - 1)
+        else:
+            j = int(i)
+
+        x = slice(j - 1, j + 1, 1)
+        new_gears[x] = g
+        new_gears[k:x.start] = g[0]
+        k = x.stop
+
+    new_gears[k:] = new_gears[k - 1]
+
+    return new_gears
+
+
+def _random_cycle(seed):
+    rnd = np.random.RandomState(seed)
+    n = rnd.randint(3, 300)
+    times = np.cumsum(rnd.choice([0.2, 0.5, 1.0, 3.0, 8.0], size=n))
+    vsr = {0: 0.0}
+    vsr.update((k, v) for k, v in enumerate(
+        np.sort(rnd.uniform(0.005, 0.05, 6)).round(3), 1))
+
+    # Run-length encoded gears with frequent shifts.
+    g = rnd.randint(0, 7, size=n)
+    gears = np.repeat(g, rnd.randint(1, 8, size=n))[:n]
+    ratios = np.array([vsr[v] for v in gears]) + rnd.normal(0, 0.003, n)
+    ratios = ratios.round(3)  # To have ties.
+    velocities = rnd.choice([0.0, 0.5, 10.0, 50.0], size=n)
+    accelerations = rnd.choice([-1.0, 0.0, 0.05, 1.0], size=n)
+    return times, ratios, gears, vsr, velocities, accelerations
+
+
+@ddt.ddt
+class TestGearIdentification(unittest.TestCase):
+    @ddt.data(*range(100))
+    def test_identify_gears(self, seed):
+        times, ratios, gears, vsr, vel, acc = _random_cycle(seed)
+        args = (700.0, 100.0), tuple(vsr.items()), 1.0, 0.1
+        npt.assert_array_equal(
+            mec._identify_gears(*(args + (ratios, vel, acc))),
+            [_identify_gear(*(args + v)) for v in zip(ratios, vel, acc)]
+        )
+
+    @ddt.data(*range(300))
+    def test_correct_gear_shifts(self, seed):
+        times, ratios, gears, vsr = _random_cycle(seed)[:4]
+        shift_window = (0.5, 2.0, 6.0, 10.0)[seed % 4]
+        npt.assert_array_equal(
+            mec._correct_gear_shifts(times, ratios, gears, vsr, shift_window),
+            _correct_gear_shifts(times, ratios, gears, vsr, shift_window)
+        )
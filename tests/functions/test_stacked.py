@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import numpy as np
+import numpy.testing as npt
+from co2mpas.dispatcher import Dispatcher
+from co2mpas.model.physical.vehicle import vehicle
+from co2mpas.model.physical import stacked as stk
+
+
+class TestStackedModel(unittest.TestCase):
+    def setUp(self):
+        self.dsp = vehicle()
+        times = np.arange(0, 1181.0)
+        self.inputs = {
+            'times': times, 'velocities': np.maximum(60 * np.sin(times / 60), 0),
+            'f0_uncorrected': 120.0, 'f1': 0.1, 'f2': 0.04, 'cycle_type': 'WLTP'
+        }
+
+    def test_stacked_model(self):
+        variants = [
+            {'vehicle_mass': m, 'f0_uncorrected': f}
+            for m, f in zip(np.linspace(1000, 2000, 5), range(100, 150, 10))
+        ]
+        par = {k: stk.stack([p[k] for p in variants]) for k in variants[0]}
+        sol = stk.stacked_model(self.dsp).dispatch(dict(self.inputs, **par))
+        stacked = {k: v for k, v in sol.items()
+                   if isinstance(v, stk.Stacked) and k not in par}
+        self.assertIn('motive_powers', stacked)
+
+        for i, p in enumerate(variants):
+            ref = self.dsp.dispatch(dict(self.inputs, **p))
+            for k, v in stacked.items():
+                self.assertEqual(v.shape[0], len(variants))
+                npt.assert_allclose(v[i].ravel(), np.ravel(ref[k]), rtol=1e-12)
+
+    def test_skip_sequential(self):
+        calls = []
+
+        def gradient(x):
+            calls.append(x)
+            return np.gradient(x)
+
+        @stk.elementwise
+        def multiply(x, k):
+            return x * k
+
+        dsp = Dispatcher()
+        dsp.add_function(function=multiply, inputs=['x', 'k'], outputs=['y'])
+        dsp.add_function(function=gradient, inputs=['y'], outputs=['dy'])
+
+        x, k = np.arange(10.0) ** 2, stk.stack(range(5))
+        sol = stk.stacked_model(dsp).dispatch({'x': x, 'k': k})
+        self.assertEqual(calls, [])
+        self.assertNotIn('dy', sol)
+        for k in range(5):
+            npt.assert_array_equal(sol['y'][k], x * k)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import numpy as np
+import numpy.testing as npt
+from co2mpas.model.physical.engine import start_stop as ss
+
+
+def _yield_on_start(model, times, to_predict, velocities, accelerations,
+                    *args, min_time_engine_on_after_start=0.0,
+                    use_basic_start_stop=True):
+    # Per-sample reference implementation.
+    base = ss.DefaultStartStopModel().predict
+    on, prev, t_switch_on, can_off = True, True, times[0], False
+    model = model.base if use_basic_start_stop else model.model
+    predict = model.predict
+    args = (velocities, accelerations) + args
+    for t, p, X in zip(times, to_predict, zip(*args)):
+        if p and can_off and t >= t_switch_on:
+            on = (prev or base([X])[0]) and predict(np.array([X]))[0]
+        else:
+            on = True
+
+        start = prev != on and on
+        yield [on, start]
+        if on and prev != on:
+            t_switch_on = t + min_time_engine_on_after_start
+            can_off = False
+
+        if not can_off:
+            can_off = base([X])[0]
+
+        prev = on
+
+
+class TestStartStop(unittest.TestCase):
+    def setUp(self):
+        rnd = np.random.RandomState(0)
+        self.times = t = np.arange(0, 1800.0)
+        self.velocities = v = np.maximum(60 * np.sin(t / 60.0), 0)
+        self.accelerations = a = np.append(np.diff(v) / 3.6, 0)
+        self.temperatures = temp = 20 + 70 * (1 - np.exp(-t / 300.0))
+        self.socs = soc = 80 + 10 * np.sin(t / 100.0)
+        on = (v > 1) | (a > 0.05) | (temp < 40) | (rnd.rand(len(t)) > 0.9)
+        self.model = ss.calibrate_start_stop_model(on, v, a, temp, soc)
+
+    def test_yield_on_start(self):
+        args = (self.times, self.velocities, self.accelerations,
+                self.temperatures, self.socs)
+        to_predict = self.times > 10
+        for basic in (True, False):
+            res = list(self.model._yield_on_start(
+                self.times, to_predict, *args[1:],
+                min_time_engine_on_after_start=2.0,
+                use_basic_start_stop=basic
+            ))
+            ref = list(_yield_on_start(
+                self.model, self.times, to_predict, *args[1:],
+                min_time_engine_on_after_start=2.0,
+                use_basic_start_stop=basic
+            ))
+            npt.assert_array_equal(np.array(res), np.array(ref))
+            self.assertFalse(np.array(res)[:, 0].all())
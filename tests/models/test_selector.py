@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import numpy as np
+from sklearn.metrics import mean_absolute_error
+from co2mpas.dispatcher import Dispatcher
+import co2mpas.dispatcher.utils as dsp_utl
+import co2mpas.model.selector as sel
+
+
+class TestErrorMatrix(unittest.TestCase):
+    def setUp(self):
+        self.calls = calls = []
+
+        def predict(gain, x):
+            calls.append(gain)
+            return gain * x
+
+        dsp = Dispatcher()
+        dsp.add_function(function=predict, inputs=['gain', 'x'], outputs=['y'])
+
+        def selector():
+            setting = {
+                'dsp': dsp, 'models': ['gain'], 'inputs': ['x'],
+                'outputs': ['y'], 'targets': ['y'],
+                'metrics': [mean_absolute_error], 'up_limit': [1]
+            }
+            setting['dsp'] = sel.define_sub_model(**setting)
+            setting['metrics'] = dsp_utl.map_list(['y'], *setting['metrics'])
+            return sel._selector('gain', ('h', 'l'), ('h', 'l'), setting)
+
+        self.selector = selector
+        x = np.arange(10.0)
+        self.results = {
+            'h': {'gain': 2.0, 'x': x, 'y': 2 * x},
+            'l': {'gain': 2.0, 'x': x, 'y': 2.5 * x}
+        }
+
+    def test_evaluate_errors(self):
+        res = self.selector()(self.results, {})
+        self.assertEqual(len(self.calls), 4)
+
+        del self.calls[:]
+        func = self.selector()
+        errors = sel.evaluate_errors([func], self.results, {})
+        self.assertEqual(set(errors[0]), {'error/h', 'error/l'})
+        # Equal calibrated models are evaluated once against each cycle.
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(func(self.results, {}, errors[0]), res)
+        self.assertEqual(len(self.calls), 2)
+
+        del self.calls[:]
+        self.results['l']['gain'] = 2.5
+        sel.evaluate_errors([func], self.results, {})
+        self.assertEqual(len(self.calls), 4)
+
+    def test_fingerprint(self):
+        x = np.arange(10.0)
+        models = {'a': x, 'b': [1, {'c': 'd'}], 'e': object()}
+        fp = sel._fingerprint(models)
+        self.assertEqual(fp, sel._fingerprint(dict(models, a=x.copy())))
+        self.assertNotEqual(fp, sel._fingerprint(dict(models, a=x + 1)))
+        self.assertNotEqual(fp, sel._fingerprint(dict(models, e=object())))
+        self.assertNotEqual(sel._fingerprint(x), sel._fingerprint(x[:, None]))
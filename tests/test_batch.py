@@ -0,0 +1,129 @@
+#! python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import time
+import tracemalloc
+import unittest
+from datetime import datetime
+import numpy as np
+from co2mpas.dispatcher import Dispatcher
+import co2mpas.dispatcher.utils as dsp_utl
+from co2mpas import batch
+from co2mpas.model.physical import physical
+
+
+def _sleep(x):
+    time.sleep(0.01)
+    return x
+
+
+class Performance(unittest.TestCase):
+    def setUp(self):
+        sub = Dispatcher(name='sub')
+        sub.add_function(function_id='slow', function=_sleep, inputs=['a'],
+                         outputs=['b'])
+        sub.add_function(function_id='fast', function=dsp_utl.bypass,
+                         inputs=['b'], outputs=['c'])
+        self.dsp = dsp = Dispatcher(name='model')
+        dsp.add_function(
+            function_id='calibrate', function=dsp_utl.SubDispatch(sub),
+            inputs=['inputs'], outputs=['outputs']
+        )
+        dsp.add_function(function_id='select', function=_sleep,
+                         inputs=['outputs'], outputs=['models'])
+
+    def test_calculate_performance(self):
+        start_time = datetime.today()
+        self.dsp.dispatch({'inputs': {'a': 1}})
+        res = batch.calculate_performance(start_time, self.dsp, top_nodes=2)
+
+        self.assertEqual(list(res['stages']),
+                         ['load', 'calibrate', 'select', 'report'])
+        self.assertTrue(all(v >= 0 for v in res['stages'].values()))
+        self.assertEqual(len(res['nodes']), 2)
+        self.assertEqual({res['nodes'][0][0], res['nodes'][1][0]},
+                         {'calibrate/slow', 'select'})
+
+        s = batch._performance2summary('v1', res)
+        self.assertEqual(s['vehicle_name'], 'v1')
+        self.assertAlmostEqual(s['total [s]'], sum(res['stages'].values()))
+        self.assertIn(s['slowest node'], ('calibrate/slow', 'select'))
+
+    def test_peak_memory(self):
+        dsp = Dispatcher()
+        dsp.add_function(function=lambda n: np.ones(n).sum(), inputs=['n'],
+                         outputs=['s'])
+        dsp.add_function(function=lambda s: batch._peak_memory(),
+                         inputs=['s'], outputs=['peak_memory'])
+
+        peaks = [batch._process_vehicle(dsp, n=n, with_performance=True)[
+            'peak_memory'] for n in (2 ** 21, 2 ** 17)]
+        # The peak is measured per vehicle.
+        self.assertGreaterEqual(peaks[0], 16)
+        self.assertLess(peaks[1], 8)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertIsNone(batch._process_vehicle(dsp, n=1)['peak_memory'])
+
+
+class CompactModel(unittest.TestCase):
+    def test_compact(self):
+        self.assertTrue(batch.vehicle_processing_model().compact)
+
+        times = np.arange(0, 1181.0)
+        inputs = {
+            'times': times, 'velocities': np.maximum(60 * np.sin(times / 60), 0),
+            'f0_uncorrected': 120.0, 'f1': 0.1, 'f2': 0.04, 'cycle_type': 'WLTP',
+            'vehicle_mass': 1500.0, 'tyre_code': '195/55R16',
+            'final_drive_ratio': 3.5, 'gear_box_type': 'manual'
+        }
+        res = []
+        for compact in (False, True):
+            dsp = physical()
+            dsp.compact = compact
+            sol = dsp.dispatch(inputs)
+            res.append((sol, dict(dsp.dist), sorted(dsp.workflow.edges())))
+        self.assertIsNotNone(dsp._adjacency)
+
+        (sol, dist, wf), (c_sol, c_dist, c_wf) = res
+        self.assertEqual((dist, wf), (c_dist, c_wf))
+        self.assertIn('motive_powers', sol)
+        self.assertEqual(set(sol), set(c_sol))
+        for k, v in sol.items():
+            np.testing.assert_equal(c_sol[k], v, err_msg=k)
+
+
+class Summary(unittest.TestCase):
+    def test_summary_table(self):
+        table = batch.SummaryTable()
+        table.add({'nedc_h': {'prediction': {'output': [
+            {'vehicle_name': 'v1', 'co2': 1.0},
+            {'vehicle_name': 'v2', 'co2': 2.0, 'mass': 3.0}]}}})
+        table.add({'wltp_h': {'calibration': {'output': {
+            'vehicle_name': 'v3', 'mass': 4.0}}},
+            'nedc_h': {'prediction': {'output': {
+                'vehicle_name': 'v1', 'co2': 5.0}}}},
+            base_keys={'vehicle_name': 'v1'})
+
+        other = batch.SummaryTable()
+        other.add({'nedc_h': {'prediction': {'output': [
+            {'vehicle_name': 'v2', 'co2': 6.0},
+            {'vehicle_name': 'v4', 'mass': 7.0}]}}})
+        table.update(other)
+
+        df = table.to_frame()
+        self.assertEqual(list(df.index), ['v1', 'v2', 'v4'])
+        c = ('nedc_h', 'prediction', 'output')
+        self.assertEqual(list(df.columns), [
+            c + ('co2',), c + ('mass',),
+            ('wltp_h', 'calibration', 'output', 'mass')
+        ])
+        self.assertEqual(df[c + ('co2',)].tolist()[:2], [1.0, 2.0])
+        self.assertEqual(df[c + ('mass',)].tolist()[1:], [3.0, 7.0])
+        self.assertEqual(df[('wltp_h', 'calibration', 'output', 'mass')]
+                         .tolist()[0], 4.0)
+        self.assertEqual(df.isnull().values.sum(), 4)
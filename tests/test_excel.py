@@ -0,0 +1,98 @@
+#! python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import os.path as osp
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import openpyxl
+import pandas as pd
+import co2mpas.io.excel as xl
+
+
+def _read_cells(fpath):
+    book = openpyxl.load_workbook(fpath)
+    cells, names = {}, set()
+    for sheet in book.worksheets:
+        for row in sheet.iter_rows():
+            for c in row:
+                if c.value is not None:
+                    cells[(sheet.title, c.row, c.column)] = c.value
+        names.update((sheet.title, k, v.attr_text)
+                     for k, v in sheet.defined_names.items())
+    return cells, names
+
+
+class XlsxStreamWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+        c = pd.MultiIndex.from_tuples([
+            ('nedc_h', 'prediction', 'co2_emission_value', '[g/km]'),
+            ('nedc_h', 'prediction', 'distance', '[km]'),
+            ('wltp_h', 'calibration', 'co2_emission_value', '[g/km]')
+        ])
+        i = pd.Index(['vehicle-1', 'vehicle-2'], name='vehicle_name')
+        summary = pd.DataFrame([[1., 2., np.nan], [3., np.inf, 5.]], i, c)
+
+        ts = pd.DataFrame(np.arange(12.).reshape(4, 3),
+                          columns=pd.MultiIndex.from_tuples([
+                              ('Time [s]', 'times'),
+                              ('Velocity [km/h]', 'velocities'),
+                              ('Gear [-]', 'gears')]))
+
+        info = pd.DataFrame([('a', 'x'), ('b', 1)],
+                            columns=['Parameter', 'Value'])
+        info.set_index(['Parameter'], inplace=True)
+        setattr(info, 'name', 'info')
+
+        pipe = pd.DataFrame([{'nodes L0': 'a'}, {'nodes L0': 'b',
+                                                 'nodes L1': 'c'}])
+        setattr(pipe, 'name', 'pipe')
+
+        self.sheets = [
+            ('summary', summary, {}, True),
+            ('output.ts', ts, {'index': False, 'named_ranges': ('columns',),
+                               'k0': 1}, True),
+            ('proc_info', (info, pipe), {}, False),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _write(self, writer, save):
+        refs = []
+        for sheet_name, data, kw, down in self.sheets:
+            refs.extend(xl._write_sheets(writer, sheet_name, data, down=down,
+                                         **kw))
+        save()
+        return refs
+
+    def test_layout(self):
+        fpath = osp.join(self.tmp, 'pandas.xlsx')
+        writer = pd.ExcelWriter(fpath, engine='xlsxwriter')
+        res = self._write(writer, writer.save), _read_cells(fpath)
+
+        fpath = osp.join(self.tmp, 'stream.xlsx')
+        writer = xl.XlsxStreamWriter(fpath)
+        out = self._write(writer, writer.save), _read_cells(fpath)
+
+        self.assertEqual(res, out)
+
+    def test_write_order(self):
+        writer = xl.XlsxStreamWriter(osp.join(self.tmp, 'order.xlsx'))
+        df = self.sheets[0][1]
+        writer.write_df('summary', df)
+        with self.assertRaises(ValueError):
+            writer.write_df('summary', df, startrow=1)
+        writer.write_df('summary', df, startrow=10)
+        writer.write_df('output.ts', df)
+        with self.assertRaises(ValueError):
+            writer.write_df('summary', df, startrow=20)
+        writer.save()
@@ -8,7 +8,9 @@
 
 import glob
 import io
+import json
 import os
+import subprocess
 import sys
 import tempfile
 import unittest
@@ -120,3 +122,50 @@ class Modelgraph(unittest.TestCase):
     def test_plot_graphs_depth(self, case):
         cmd = "modelgraph %s %s" % (case, self.model)
         cmain._main(*cmd.split())
+
+
+_startup_code = """
+import json, sys, time
+t = time.perf_counter()
+from co2mpas import __main__ as cmain
+cmain._main('--version')
+cmain._main('modelgraph', '--list')
+t = time.perf_counter() - t
+print(json.dumps([t, sorted(m for m in sys.modules if m.split('.')[0] in %r
+                                                     or m in %r)]))
+"""
+
+
+class Startup(unittest.TestCase):
+    #: Cold start budget [s] of `co2mpas --version` and `modelgraph --list`,
+    #: checked only if the `CO2MPAS_TIMING_TESTS` env-var is set.
+    budget = 2.0
+
+    #: Packages that must be imported only by the sub-commands that need them.
+    heavy = ('pandas', 'sklearn', 'scipy', 'lmfit', 'matplotlib', 'sphinx',
+             'pandalone', 'networkx')
+
+    #: Co2mpas modules that must be loaded on demand.
+    lazy = ('co2mpas.batch', 'co2mpas.io', 'co2mpas.model',
+            'co2mpas.dispatcher')
+
+    def _cold_start(self):
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [os.path.join(mydir, '..')] + env.get('PYTHONPATH', '').split(
+                os.pathsep)
+        )
+        code = _startup_code % (self.heavy, self.lazy)
+        out = subprocess.check_output([sys.executable, '-c', code], env=env,
+                                      universal_newlines=True)
+        return json.loads(out.splitlines()[-1])
+
+    def test_cold_start(self):
+        duration, loaded = self._cold_start()
+        self.assertEqual(loaded, [])
+
+    @unittest.skipUnless(os.environ.get('CO2MPAS_TIMING_TESTS'),
+                         'Set `CO2MPAS_TIMING_TESTS` to check the timings.')
+    def test_cold_start_duration(self):
+        duration, loaded = self._cold_start()
+        self.assertLess(duration, self.budget)
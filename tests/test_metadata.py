@@ -0,0 +1,30 @@
+#! python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import json
+import os
+import tempfile
+import unittest
+from co2mpas.io import metadata, search_doc_descriptions
+
+
+class TestModelMetadata(unittest.TestCase):
+    def test_shipped_metadata(self):
+        data = metadata.load_metadata()
+        msg = 'Regenerate it with `python -m co2mpas.io.metadata`.'
+        self.assertEqual(data.get('model_hash'), metadata.model_hash(), msg)
+        self.assertEqual(data['descriptions'], search_doc_descriptions(), msg)
+
+    def test_stale_metadata(self):
+        data = metadata.load_metadata()
+        with tempfile.TemporaryDirectory() as d:
+            fpath = os.path.join(d, 'model_metadata.json')
+            with open(fpath, 'w') as f:
+                json.dump(dict(data, model_hash='stale'), f)
+            with self.assertLogs(metadata.log, 'WARNING'):
+                self.assertEqual(metadata.load_metadata(fpath), {})
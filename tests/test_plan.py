@@ -0,0 +1,134 @@
+#! python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import os.path as osp
+import tempfile
+import unittest
+import numpy as np
+from unittest.mock import patch
+from co2mpas.dispatcher import Dispatcher
+from co2mpas.model.physical.defaults import dfl
+from co2mpas.telemetry import metrics
+from co2mpas import plan as pln
+from co2mpas.io.dill import load_from_dill
+
+
+def _summary(name, co2):
+    return {'nedc_h': {'prediction': {'output': {
+        'vehicle_name': name, 'co2': co2
+    }}}}
+
+
+class _Model(object):
+    data_output = {}
+
+
+class MakeSimulationPlan(unittest.TestCase):
+    def setUp(self):
+        self.model = model = Dispatcher()
+        model.add_data('validated_data')
+        model.add_data('vehicle_name')
+        self.base = {
+            'vehicle_name': 'v', 'dsp_model': _Model(),
+            'summary': _summary('v', 0)
+        }
+        self.saved = []
+
+    def tearDown(self):
+        dfl.functions.make_simulation_plan.CHUNK_SIZE = 1000
+
+    def _save_summary(self, fpath, start_time, summary):
+        self.saved.append((fpath, summary.to_frame()))
+
+    def _make_simulation_plan(self, n):
+        plan = [((i, 'v.xlsx', ''), {'input.prediction.nedc_h': {'f0': i}})
+                for i in range(1, n + 1)]
+
+        def process_vehicle(model, validated_data, vehicle_name, **kw):
+            f0 = validated_data['input.prediction.nedc_h']['f0']
+            return {'summary': _summary(vehicle_name, f0 * 10)}
+
+        with patch.object(pln, 'vehicle_processing_model',
+                          return_value=self.model), \
+                patch.object(pln, 'get_results', return_value=self.base), \
+                patch.object(pln, 'build_default_models', return_value={}), \
+                patch.object(pln, 'define_new_inputs',
+                             side_effect=lambda p, *args: p), \
+                patch.object(pln, '_process_vehicle',
+                             side_effect=process_vehicle), \
+                patch.object(pln, '_save_summary',
+                             side_effect=self._save_summary):
+            return pln.make_simulation_plan(
+                plan, '20170101_000000', 'out', {}, 'plan'
+            )
+
+    def test_chunks(self):
+        dfl.functions.make_simulation_plan.CHUNK_SIZE = 2
+        summary = self._make_simulation_plan(5)
+        self.assertFalse(summary)
+        self.assertEqual(
+            [fpath.split('-', 1)[1] for fpath, df in self.saved],
+            ['plan-plan_summary-%d.xlsx' % i for i in (1, 2, 3)]
+        )
+        co2 = ('nedc_h', 'prediction', 'output', 'co2')
+        self.assertEqual([df[co2].tolist() for fpath, df in self.saved],
+                         [[0, 10, 20], [30, 40], [50]])
+
+    def test_no_chunks(self):
+        summary = self._make_simulation_plan(5)
+        self.assertEqual(self.saved, [])
+        self.assertEqual(len(summary), 6)
+
+
+class GetResults(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        pln._results.clear()
+
+    def tearDown(self):
+        pln._results.clear()
+
+    def _count(self, result):
+        return metrics.get('co2mpas_cache_requests_total', cache='results',
+                           result=result)
+
+    def test_cache_requests(self):
+        with tempfile.TemporaryDirectory() as d, \
+                patch.object(pln, '_process_vehicle', return_value={'a': 1}):
+            fpath = osp.join(d, 'v.xlsx')
+            open(fpath, 'w').close()
+
+            for i in range(3):
+                self.assertEqual(pln.get_results('model', fpath), {'a': 1})
+            self.assertEqual((self._count('hit'), self._count('miss')), (2, 1))
+
+            pln._results.clear()  # The results are loaded from the file.
+            with patch.object(pln, 'load_from_dill', return_value={'a': 1}):
+                self.assertEqual(pln.get_results('model', fpath), {'a': 1})
+            self.assertEqual((self._count('hit'), self._count('miss')), (3, 1))
+            self.assertEqual(pln._process_vehicle.call_count, 1)
+
+    def test_mmap(self):
+        res = {'a': np.arange(1000.0)}
+        with tempfile.TemporaryDirectory() as d, \
+                patch.object(pln, '_process_vehicle', return_value=res):
+            fpath = osp.join(d, 'v.xlsx')
+            open(fpath, 'w').close()
+            pln.get_results('model', fpath)
+
+            pln._results.clear()  # The results are loaded from the file.
+            a = pln.get_results('model', fpath)['a']
+            self.assertIsInstance(a.base, np.memmap)
+            self.assertEqual(a.base.mode, 'c')
+
+            a[:] = 0  # Copy-on-write: the file is not changed.
+            cache_fpath = pln.get_cache_fpath(fpath, ('res', 'base', 'dill'))
+            np.testing.assert_array_equal(
+                load_from_dill(cache_fpath)['a'], res['a']
+            )
+            del a
@@ -0,0 +1,46 @@
+#! python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from co2mpas.io import provenance as prv
+
+
+class TestEnvironment(unittest.TestCase):
+    def test_environment(self):
+        env = prv.get_environment()
+        self.assertIn('numpy', {k.lower() for k, v in env})
+        self.assertEqual(list(env), sorted(env, key=lambda x: x[0].lower()))
+
+    def test_cached(self):
+        prv.get_environment()
+        with patch.object(prv, '_distributions') as distributions:
+            prv.get_environment()
+            prv.get_environment_hash()
+        distributions.assert_not_called()  # Scanned once per process.
+
+    def test_hash(self):
+        env = (('a', '1.0'), ('b', '2.0'))
+        with patch.object(prv, 'get_environment', return_value=env):
+            h = prv.get_environment_hash.__wrapped__()
+            self.assertEqual(h, prv.get_environment_hash.__wrapped__())
+        with patch.object(prv, 'get_environment', return_value=env[:1]):
+            self.assertNotEqual(h, prv.get_environment_hash.__wrapped__())
+        self.assertRegex(h, '^[0-9a-f]{40}$')
+
+    def test_save_environment(self):
+        with tempfile.TemporaryDirectory() as d:
+            fpath = prv.save_environment(d)
+            self.assertEqual(os.path.basename(fpath),
+                             prv.get_environment_fname())
+            with open(fpath) as f:
+                lines = f.read().splitlines()
+            self.assertEqual(lines,
+                             ['%s==%s' % v for v in prv.get_environment()])
@@ -0,0 +1,108 @@
+#! python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import ddt
+import numpy as np
+from schema import SchemaError
+from co2mpas.io.schema import define_data_schema
+
+
+@ddt.ddt
+class DataSchema(unittest.TestCase):
+    @ddt.data(
+        ('times', np.arange(10.)), ('times', list(range(10))),
+        ('times', 'EMPTY'), ('times', np.array([np.nan])), ('times', []),
+        ('times', 'abc'), ('gears', np.array([1., 2.])), ('gears', ['a']),
+        ('on_engine', [1, 0]), ('CMV', None), ('cmv', 3), ('VERSION', '2.2'),
+        ('eco_mode', True), ('fuel_saving_at_strategy', 'False'),
+        ('unknown', 3), ('unknown', np.array([1.])), ('unknown', 'x'),
+        ('vehicle_mass', -1), ('vehicle_mass', '1500'),
+        ('fuel_type', 'Diesel'), ('Obd_velocities', [1, 2]), (3, 4)
+    )
+    def test_validate(self, case):
+        for read in (True, False):
+            schema = define_data_schema(read=read)
+            data = dict((case,))
+            try:
+                res = schema.schema.validate(data)
+            except SchemaError as ex:
+                with self.assertRaises(SchemaError) as cm:
+                    schema.validate(data)
+                self.assertEqual(str(ex), str(cm.exception))
+                continue
+
+            out = schema.validate(data)
+            self.assertEqual(set(res), set(out))
+            for k, v in res.items():
+                self.assertIs(type(v), type(out[k]))
+                self.assertEqual(repr(v), repr(out[k]))
+
+    def test_cached(self):
+        self.assertIs(define_data_schema(), define_data_schema())
+        self.assertIsNot(define_data_schema(), define_data_schema(read=False))
+
+
+class Sweeps(unittest.TestCase):
+    def setUp(self):
+        import pandas as pd
+        self.sweeps = pd.DataFrame([
+            {'id': 1, 'base': 'a.xlsx', 'defaults': '',
+             'input.prediction.nedc_h.f0': 'linspace(100, 150, 11)',
+             'input.prediction.nedc_h.vehicle_mass': '[1000, 1500]',
+             'input.prediction.nedc_h.gear_box_type': 'manual'},
+            {'id': 2, 'base': 'b.xlsx', 'defaults': '', 'sampling': 'lhs',
+             'samples': 10.0, 'seed': 0.0,
+             'input.prediction.nedc_h.f0': 'uniform(100, 150)',
+             'input.prediction.nedc_h.vehicle_mass': 'range(1000, 2000, 250)'}
+        ]).set_index(['id', 'base', 'defaults'])
+        self.schema = define_data_schema()
+
+    def test_validate_sweeps(self):
+        from co2mpas.io.schema import validate_sweeps, validate_data
+        from co2mpas.io.sweep import SimulationPlan
+        grid, lhs = validate_sweeps(self.sweeps, self.schema)
+        self.assertEqual((len(grid), len(lhs)), (22, 10))
+
+        rows = list(grid)
+        self.assertEqual(rows[0][0], ('1.1', 'a.xlsx', ''))
+        self.assertEqual(rows[-1][1], {'input.prediction.nedc_h': {
+            'f0': 150.0, 'vehicle_mass': 1500.0, 'gear_box_type': 'manual'
+        }})
+
+        rows = [p['input.prediction.nedc_h'] for i, p in lhs]
+        f0 = sorted(p['f0'] for p in rows)
+        # One sample for each stratum.
+        self.assertEqual([int((v - 100) / 5) for v in f0], list(range(10)))
+        self.assertEqual(rows, [p['input.prediction.nedc_h'] for i, p in lhs])
+
+        plan = validate_data({'sweep': self.sweeps}, True, self.schema)[1]
+        self.assertIsInstance(plan, SimulationPlan)
+        self.assertEqual(len(plan), 32)
+        self.assertEqual(len(list(plan)), 32)
+
+    def test_invalid_sweeps(self):
+        import pandas as pd
+        from co2mpas.io.schema import validate_sweeps, validate_data
+        for k, v in (('sampling', 'lhs'),
+                     ('input.prediction.nedc_h.f0', 'uniform(100, 150)'),
+                     ('input.prediction.nedc_h.vehicle_mass', '[-1, 2]')):
+            sweeps = self.sweeps.copy()
+            sweeps.loc[sweeps.index[0], k] = v
+            self.assertEqual(validate_sweeps(sweeps, self.schema), [])
+
+        # The explicit plan rows are kept.
+        plan = pd.DataFrame([
+            {'id': 1, 'base': 'a.xlsx', 'defaults': '',
+             'input.prediction.nedc_h.f0': 120.0}
+        ]).set_index(['id', 'base', 'defaults'])
+        plan = validate_data({'plan': plan, 'sweep': sweeps}, True,
+                             self.schema)[1]
+        self.assertEqual(plan, [
+            ((1, 'a.xlsx', ''), {'input.prediction.nedc_h': {'f0': 120.0}})
+        ])
@@ -0,0 +1,67 @@
+#! python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import doctest
+import os
+import tempfile
+import unittest
+from co2mpas import telemetry as tlm
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        failure_count, test_count = doctest.testmod(
+            tlm, optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS
+        )
+        self.assertGreater(test_count, 0, (failure_count, test_count))
+        self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.m = tlm.Metrics()
+
+    def test_histogram(self):
+        for v in (0.2, 3.0, 1000.0):
+            self.m.observe('co2mpas_stage_duration_seconds', v, stage='load')
+        lines = self.m.exposition(derived=False).splitlines()
+        name = 'co2mpas_stage_duration_seconds'
+        self.assertIn('# TYPE %s histogram' % name, lines)
+        self.assertIn('%s_bucket{stage="load",le="0.5"} 1' % name, lines)
+        self.assertIn('%s_bucket{stage="load",le="5.0"} 2' % name, lines)
+        self.assertIn('%s_bucket{stage="load",le="+Inf"} 3' % name, lines)
+        self.assertIn('%s_sum{stage="load"} 1003.2' % name, lines)
+        self.assertIn('%s_count{stage="load"} 3' % name, lines)
+
+    def test_derived(self):
+        for hit in (True, True, False, True):
+            self.m.inc('co2mpas_cache_requests_total', cache='input',
+                       result='hit' if hit else 'miss')
+        self.m.inc('co2mpas_vehicles_processed_total', status='ok')
+        lines = self.m.exposition().splitlines()
+        self.assertIn('co2mpas_cache_hit_ratio{cache="input"} 0.75', lines)
+        self.assertTrue(any(l.startswith('co2mpas_vehicles_per_minute ')
+                            for l in lines))
+
+    def test_write(self):
+        self.m.set('co2mpas_queue_depth', 2, queue='a"b')
+        with tempfile.TemporaryDirectory() as d:
+            self.m.fpath = fpath = os.path.join(d, 'co2mpas.prom')
+            self.m.flush(force=True)
+            self.assertEqual(os.listdir(d), ['co2mpas.prom'])
+            with open(fpath) as f:
+                self.assertIn('co2mpas_queue_depth{queue="a\\"b"} 2.0\n',
+                              f.read())
+
+    def test_flush_error(self):
+        with tempfile.TemporaryDirectory() as d:
+            self.m.fpath = os.path.join(d, 'missing', 'co2mpas.prom')
+            with self.assertLogs(tlm.log, 'WARNING'):
+                self.m.flush(force=True)
+            self.assertEqual(os.listdir(d), [])
+            self.assertRaises(OSError, self.m.write)
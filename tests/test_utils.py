@@ -0,0 +1,34 @@
+#! python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2015 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import unittest
+import co2mpas.utils as co2_utl
+
+
+class CalibrateMultiStart(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def _calibrate(self, x0):
+        self.calls.append(x0)
+        if x0 is not None:
+            return abs(x0 - 3), 'model-%s' % x0
+
+    def test_selection(self):
+        res = co2_utl.calibrate_multi_start(self._calibrate, [6, 2, None, 4])
+        self.assertEqual(res, (1, 'model-2'))  # Ties resolved by the order.
+        self.assertEqual(self.calls, [6, 2, None, 4])
+
+    def test_tol(self):
+        res = co2_utl.calibrate_multi_start(self._calibrate, [6, 3, 1], tol=0)
+        self.assertEqual(res, (0, 'model-3'))
+        self.assertEqual(self.calls, [6, 3])
+
+    def test_default(self):
+        res = co2_utl.calibrate_multi_start(self._calibrate, [None], default=1)
+        self.assertEqual(res, 1)